@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+
+
+def corporate_actions(dividends, splits):
+    """
+    Merge the frames of action_dividends and actions_split into one frame indexed by ex date (named date) with dividend_amount and split_coefficient columns, like the matching columns of time_series_daily_adjusted.
+    """
+    events = []
+    if dividends is not None and len(dividends):
+        events.append(pd.DataFrame({
+            "date": pd.to_datetime(dividends["ex_dividend_date"], errors="coerce"),
+            "dividend_amount": pd.to_numeric(dividends["amount"], errors="coerce"),
+            "split_coefficient": 1.0,
+        }))
+    if splits is not None and len(splits):
+        events.append(pd.DataFrame({
+            "date": pd.to_datetime(splits["effective_date"], errors="coerce"),
+            "dividend_amount": 0.0,
+            "split_coefficient": pd.to_numeric(splits["split_factor"], errors="coerce"),
+        }))
+    if not events:
+        return pd.DataFrame({"dividend_amount": [], "split_coefficient": []}, index=pd.DatetimeIndex([], name="date", dtype="datetime64[ns]"))
+
+    df = pd.concat(events).dropna(subset=["date"]).fillna({"dividend_amount": 0.0, "split_coefficient": 1.0})
+    df = df.groupby("date").agg({"dividend_amount": "sum", "split_coefficient": "prod"})
+    df.index = df.index.astype("datetime64[ns]")
+    return df
+
+
+def fetch_corporate_actions(client, ticker: str):
+    """
+    Fetch the dividends and splits of ticker through client (and so through its caches) and merge them with corporate_actions.
+    """
+    return corporate_actions(client.action_dividends(ticker), client.actions_split(ticker))
+
+
+def event_factors(close, actions, adjusted=False):
+    """
+    Price and volume factor of every corporate action, applied to the bars before its ex date.
+    A split of coefficient s divides the prices by s and multiplies the volumes by s, a dividend d multiplies the prices by 1 - d / c, c being the raw close of the last bar before the ex date.
+
+    ❚ Required: close (Series)
+        The daily closes the dividend factors are computed from, indexed by date.
+
+    ❚ Required: actions (DataFrame)
+        The frame of corporate_actions.
+
+    ❚ Optional: adjusted (Bool)
+        By default, adjusted=False and close holds raw closes. Set adjusted=True when close holds adjusted closes: the raw close before each ex date is then recovered from the factors of the later actions, latest first.
+    """
+    close = close.sort_index()
+    dates = close.index.values.astype("datetime64[ns]")
+    values = close.to_numpy(dtype=np.float64)
+    ex_dates = actions.index.values.astype("datetime64[ns]")
+    dividends = actions["dividend_amount"].to_numpy(dtype=np.float64)
+    splits = actions["split_coefficient"].to_numpy(dtype=np.float64)
+
+    before = np.searchsorted(dates, ex_dates, side="left") - 1
+    previous = np.where(before >= 0, values[np.maximum(before, 0)], np.nan)
+    if not adjusted:
+        price = np.where(np.isnan(previous) | (dividends == 0), 1.0, 1 - dividends / previous) / splits
+    else:
+        # the adjusted close a before an action is raw * split / later, so raw = a * split / later + dividend
+        price = np.ones(len(ex_dates))
+        later = 1.0
+        for i in range(len(ex_dates) - 1, -1, -1):
+            if not np.isnan(previous[i]) and dividends[i]:
+                raw = previous[i] * splits[i] / later + dividends[i]
+                price[i] = (1 - dividends[i] / raw) / splits[i]
+            else:
+                price[i] = 1 / splits[i]
+            later *= price[i]
+    return pd.DataFrame({"price_factor": price, "volume_factor": splits}, index=actions.index)
+
+
+def cumulative_factors(dates, factors):
+    """
+    Return the (price, volume) factors of bars at dates: the products of the event factors of every action after each bar. Intraday bars of an ex date are after the action.
+    """
+    ex_dates = factors.index.values.astype("datetime64[ns]")
+    order = np.argsort(ex_dates, kind="stable")
+    ex_dates = ex_dates[order]
+    # suffix products: entry i is the product of the factors of the actions i and after, 1 past the last action
+    price = np.r_[np.cumprod(factors["price_factor"].to_numpy(dtype=np.float64)[order][::-1])[::-1], 1.0]
+    volume = np.r_[np.cumprod(factors["volume_factor"].to_numpy(dtype=np.float64)[order][::-1])[::-1], 1.0]
+    first = np.searchsorted(ex_dates, np.asarray(dates, dtype="datetime64[ns]"), side="right")
+    return price[first], volume[first]
+
+
+def _rescale(df, price, volume):
+    df = df.copy()
+    for name in PRICE_FIELDS:
+        if name in df:
+            df[name] = (df[name].to_numpy(dtype=np.float64) * price).astype(df[name].dtype, copy=False)
+    if "volume" in df:
+        df["volume"] = np.round(df["volume"].to_numpy(dtype=np.float64) * volume).astype(df["volume"].dtype, copy=False)
+    return df
+
+
+def adjust_bars(df, actions, reference=None):
+    """
+    Adjust the raw (as-traded) bars of df for splits and dividends, like the adjusted series of AlphaVantage: the prices are multiplied by the price factors of every later action and the volumes by their split coefficients.
+    Works for daily and intraday bars, in any order.
+
+    ❚ Required: actions (DataFrame)
+        The frame of corporate_actions or fetch_corporate_actions.
+
+    ❚ Optional: reference (Series)
+        The raw daily closes used for the dividend factors, so daily and intraday bars share the same factors. By default the closes of df.
+    """
+    factors = event_factors(df["close"] if reference is None else reference, actions)
+    price, volume = cumulative_factors(df.index.values, factors)
+    return _rescale(df, price, volume)
+
+
+def unadjust_bars(df, actions, reference=None):
+    """
+    Recover the raw (as-traded) bars from the adjusted bars of df, the reverse of adjust_bars.
+
+    ❚ Optional: reference (Series)
+        The adjusted daily closes used for the dividend factors. By default the closes of df.
+    """
+    factors = event_factors(df["close"] if reference is None else reference, actions, adjusted=True)
+    price, volume = cumulative_factors(df.index.values, factors)
+    return _rescale(df, 1 / price, 1 / volume)
+
+
+def daily_adjusted(df, actions):
+    """
+    Build the frame of time_series_daily_adjusted from the raw frame of time_series_daily and the corporate actions: raw OHLC, adjusted_close, volume, dividend_amount and split_coefficient.
+    """
+    factors = event_factors(df["close"], actions)
+    price, _ = cumulative_factors(df.index.values, factors)
+    out = df[[name for name in PRICE_FIELDS if name in df]].copy()
+    out["adjusted_close"] = df["close"].to_numpy(dtype=np.float64) * price
+    if "volume" in df:
+        out["volume"] = df["volume"]
+    events = actions.reindex(df.index)
+    out["dividend_amount"] = events["dividend_amount"].fillna(0.0).to_numpy()
+    out["split_coefficient"] = events["split_coefficient"].fillna(1.0).to_numpy()
+    return out
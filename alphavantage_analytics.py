@@ -0,0 +1,424 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# periods per year used by the annualized calculations, per INTERVAL of the analytics endpoints
+PERIODS_PER_YEAR = {
+    "1MIN": 252 * 390,
+    "5MIN": 252 * 78,
+    "15MIN": 252 * 26,
+    "30MIN": 252 * 13,
+    "60MIN": 252 * 6.5,
+    "DAILY": 252,
+    "WEEKLY": 52,
+    "MONTHLY": 12,
+}
+
+_CALCULATION = re.compile(r"^\s*(\w+)\s*(?:\((.*)\))?\s*$")
+
+
+def parse_calculation(calculation: str):
+    """
+    Split a calculation written with the syntax of the analytics endpoints into its name and parameters.
+    For example: parse_calculation("CORRELATION(method=SPEARMAN)") returns ("CORRELATION", {"method": "SPEARMAN"}) and parse_calculation("STDDEV(annualized=True)") returns ("STDDEV", {"annualized": True}).
+    """
+    match = _CALCULATION.match(calculation)
+    if match is None:
+        raise ValueError(f"Invalid calculation: {calculation}")
+    name, arguments = match.group(1).upper(), match.group(2)
+
+    params = {}
+    for argument in filter(None, (part.strip() for part in (arguments or "").split(","))):
+        key, _, value = argument.partition("=")
+        value = value.strip()
+        if value.lower() in ("true", "false"):
+            value = value.lower() == "true"
+        elif value.lstrip("-").isdigit():
+            value = int(value)
+        elif value.lstrip("-").replace(".", "", 1).isdigit():
+            value = float(value)
+        else:
+            value = value.upper()
+        params[key.strip().lower()] = value
+    return name, params
+
+
+def _labels(index):
+    """
+    Keys of the dates of index in the answers: YYYY-MM-DD for daily and longer bars, YYYY-MM-DD HH:MM:SS once the index has a time of day so the intraday bars of one day stay distinct.
+    """
+    index = pd.DatetimeIndex(index)
+    daily = len(index) == 0 or (index == index.normalize()).all()
+    return np.array(list(index.strftime("%Y-%m-%d" if daily else "%Y-%m-%d %H:%M:%S")))
+
+
+def _lower_triangle(matrix):
+    return [[float(value) for value in row[:i + 1]] for i, row in enumerate(np.asarray(matrix))]
+
+
+def _ranks(values):
+    """
+    Average ranks of each column of values, the vectorized equivalent of scipy.stats.rankdata.
+    """
+    return pd.DataFrame(values).rank(method="average").to_numpy()
+
+
+def kendall_matrix(values):
+    """
+    Kendall tau-b correlation matrix of the columns of values (observations x symbols).
+    The concordance of every pair of observations is accumulated one observation at a time with a matrix product over all symbols, O(T^2 N^2) for T observations and N symbols.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = values.shape[1]
+    concordance = np.zeros((n, n))
+    for i in range(len(values) - 1):
+        signs = np.sign(values[i + 1:] - values[i])
+        concordance += signs.T @ signs
+    ties = np.sqrt(np.diag(concordance))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return concordance / np.outer(ties, ties)
+
+
+def correlation_matrix(returns, method="PEARSON"):
+    returns = np.asarray(returns, dtype=np.float64)
+    if method == "KENDALL":
+        return kendall_matrix(returns)
+    if method == "SPEARMAN":
+        returns = _ranks(returns)
+    elif method != "PEARSON":
+        raise ValueError(f"Unknown correlation method: {method}")
+    centered = returns - returns.mean(axis=0)
+    covariance = centered.T @ centered
+    scale = np.sqrt(np.diag(covariance))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return covariance / np.outer(scale, scale)
+
+
+def _max_drawdown(values, symbols, labels):
+    peaks = np.fmax.accumulate(values, axis=0)
+    drawdowns = values / peaks - 1
+    result = {}
+    for j, symbol in enumerate(symbols):
+        column = drawdowns[:, j]
+        if np.isnan(column).all():
+            result[symbol] = {"max_drawdown": None, "drawdown_range": {"start_drawdown": None, "end_drawdown": None}}
+            continue
+        end = int(np.nanargmin(column))
+        start = int(np.nanargmax(values[:end + 1, j]))
+        result[symbol] = {
+            "max_drawdown": float(column[end]),
+            "drawdown_range": {"start_drawdown": str(labels[start]), "end_drawdown": str(labels[end])},
+        }
+    return result
+
+
+def fixed_window(prices, calculations: list, interval="DAILY", ohlc="close"):
+    """
+    Compute locally the calculations of ANALYTICS_FIXED_WINDOW (see AlphaVantage.advance_analytics) for every column of prices at once, with the same calculation syntax and the same result layout as the JSON answer of the endpoint.
+
+    ❚ Required: prices (DataFrame)
+        One column of prices per symbol indexed by date, e.g. panel_frame(frames, fields="close") or the frame of bulk_time_series(tickers, layout="panel", fields="close").
+
+    ❚ Required: calculations (list)
+        MIN, MAX, MEAN, MEDIAN, CUMULATIVE_RETURN, VARIANCE, STDDEV, MAX_DRAWDOWN, HISTOGRAM, AUTOCORRELATION, COVARIANCE and CORRELATION, with their parameters. For example: calculations=["MEAN", "STDDEV(annualized=True)", "CORRELATION(method=SPEARMAN)"]
+
+    ❚ Optional: interval (str)
+        1min, 5min, 15min, 30min, 60min, DAILY, WEEKLY or MONTHLY, used to annualize.
+
+    The per-symbol calculations use every return of each symbol, the matrices (COVARIANCE, CORRELATION) use the dates where every symbol has a return.
+    """
+    prices = prices.sort_index()
+    labels = _labels(prices.index)
+    symbols = [str(symbol) for symbol in prices.columns]
+    values = prices.to_numpy(dtype=np.float64)
+    returns = values[1:] / values[:-1] - 1
+    common = returns[~np.isnan(returns).any(axis=1)]
+    periods = PERIODS_PER_YEAR[interval.upper()]
+
+    def per_symbol(array):
+        return {symbol: (None if np.isnan(value) else float(value)) for symbol, value in zip(symbols, array)}
+
+    results = {}
+    for calculation in calculations:
+        name, params = parse_calculation(calculation)
+        annualized = params.get("annualized", False)
+        key = calculation.strip().upper()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if name == "MIN":
+                results[key] = per_symbol(np.nanmin(returns, axis=0))
+            elif name == "MAX":
+                results[key] = per_symbol(np.nanmax(returns, axis=0))
+            elif name == "MEAN":
+                results[key] = per_symbol(np.nanmean(returns, axis=0))
+            elif name == "MEDIAN":
+                results[key] = per_symbol(np.nanmedian(returns, axis=0))
+            elif name == "CUMULATIVE_RETURN":
+                first = prices.bfill().to_numpy(dtype=np.float64)[0]
+                last = prices.ffill().to_numpy(dtype=np.float64)[-1]
+                results[key] = per_symbol(last / first - 1)
+            elif name in ("VARIANCE", "STDDEV"):
+                variance = np.nanvar(returns, axis=0) * (periods if annualized else 1)
+                results[key] = per_symbol(variance if name == "VARIANCE" else np.sqrt(variance))
+            elif name == "MAX_DRAWDOWN":
+                results[key] = _max_drawdown(prices.ffill().to_numpy(dtype=np.float64), symbols, labels)
+            elif name == "HISTOGRAM":
+                bins = params.get("bins", 10)
+                results[key] = {}
+                for j, symbol in enumerate(symbols):
+                    column = returns[:, j][~np.isnan(returns[:, j])]
+                    counts, edges = np.histogram(column, bins=bins)
+                    results[key][symbol] = {"bin_count": counts.tolist(), "bin_edges": edges.tolist()}
+            elif name == "AUTOCORRELATION":
+                lag = params.get("lag", 1)
+                current, previous = returns[lag:], returns[:-lag]
+                current = current - np.nanmean(current, axis=0)
+                previous = previous - np.nanmean(previous, axis=0)
+                numerator = np.nansum(current * previous, axis=0)
+                denominator = np.sqrt(np.nansum(current ** 2, axis=0) * np.nansum(previous ** 2, axis=0))
+                results[key] = per_symbol(numerator / denominator)
+            elif name == "COVARIANCE":
+                centered = common - common.mean(axis=0)
+                covariance = centered.T @ centered / len(common) * (periods if annualized else 1)
+                results[key] = {"index": symbols, "covariance": _lower_triangle(covariance)}
+            elif name == "CORRELATION":
+                method = params.get("method", "PEARSON")
+                results[key] = {"index": symbols, "correlation": _lower_triangle(correlation_matrix(common, method))}
+            else:
+                raise ValueError(f"Unknown calculation: {calculation}")
+
+    return {
+        "meta_data": {
+            "symbols": ",".join(symbols),
+            "min_dt": str(labels[0]) if len(labels) else None,
+            "max_dt": str(labels[-1]) if len(labels) else None,
+            "ohlc": ohlc.capitalize(),
+            "interval": interval.upper(),
+        },
+        "payload": {"RETURNS_CALCULATIONS": results},
+    }
+
+
+def rolling_moments(returns, window: int):
+    """
+    Running mean and population variance over the last window rows of every column of returns (observations x symbols), in O(T) for T observations whatever the window.
+    Each column is centered on its mean before the running sums so the sums stay small and the variance keeps its precision. Rows whose window is incomplete or holds a NaN are NaN.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    centered = returns - np.nanmean(returns, axis=0)
+    valid = ~np.isnan(centered)
+    centered = np.where(valid, centered, 0.0)
+
+    def window_sums(values):
+        sums = np.cumsum(values, axis=0)
+        sums[window:] -= sums[:-window].copy()
+        return sums
+
+    count = window_sums(valid.astype(np.int64))
+    sum1 = window_sums(centered)
+    sum2 = window_sums(centered ** 2)
+    complete = count == window
+    complete[:window - 1] = False
+    mean = np.where(complete, sum1 / window, np.nan)
+    variance = np.where(complete, np.maximum(sum2 / window - mean ** 2, 0.0), np.nan)
+    return mean + np.nanmean(returns, axis=0), variance
+
+
+def iter_rolling_covariance(returns, window: int):
+    """
+    Yield (row, covariance) for every complete window of returns (observations x symbols without NaN), row being the last observation of the window and covariance the population covariance matrix of the window.
+    The mean vector and the co-moment matrix are updated in place with one Welford step for the observation entering the window and one for the observation leaving it, O(N^2) per window for N symbols instead of O(window N^2).
+    The yielded matrix is reused by the next step, copy it to keep it.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if len(returns) < window:
+        return
+    mean = returns[:window].mean(axis=0)
+    centered = returns[:window] - mean
+    comoment = centered.T @ centered
+    covariance = np.empty_like(comoment)
+    np.divide(comoment, window, out=covariance)
+    yield window - 1, covariance
+
+    left = np.empty((len(mean), 2))
+    right = np.empty((2, len(mean)))
+    for row in range(window, len(returns)):
+        new, old = returns[row], returns[row - window]
+        # add the new observation (n = window + 1), then remove the old one (back to n = window), as one rank-2 update
+        left[:, 0] = new - mean
+        mean += left[:, 0] / (window + 1)
+        right[0] = new - mean
+        right[1] = old - mean
+        mean -= right[1] / window
+        left[:, 1] = mean - old
+        comoment += left @ right
+        np.divide(comoment, window, out=covariance)
+        yield row, covariance
+
+
+def rolling_covariance(returns, window: int):
+    """
+    Population covariance matrices of every complete window of returns (observations x symbols without NaN) as one (windows x symbols x symbols) array, entry i being the window ending at row window - 1 + i.
+    The matrices come from the Welford updates of iter_rolling_covariance, the array taking 8 N^2 bytes per window.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    n = returns.shape[1] if returns.ndim == 2 else 0
+    matrices = np.empty((max(len(returns) - window + 1, 0), n, n))
+    for row, covariance in iter_rolling_covariance(returns, window):
+        matrices[row - window + 1] = covariance
+    return matrices
+
+
+def _iter_window_matrices(returns, window: int, name: str, method="PEARSON", scale=1):
+    """
+    Yield (row, matrix) for every complete window of returns like iter_rolling_covariance, matrix being the covariance times scale (COVARIANCE) or the correlation of method (CORRELATION).
+    The PEARSON correlation is normalized in place in the covariance of iter_rolling_covariance, so one N x N matrix is alive at a time. The yielded matrix is reused by the next step, copy it to keep it.
+    """
+    if name == "COVARIANCE":
+        for row, covariance in iter_rolling_covariance(returns, window):
+            covariance *= scale
+            yield row, covariance
+    elif method == "PEARSON":
+        for row, covariance in iter_rolling_covariance(returns, window):
+            deviation = np.sqrt(np.diag(covariance))
+            covariance /= deviation[:, None]
+            covariance /= deviation[None, :]
+            yield row, covariance
+    else:
+        for row in range(window - 1, len(returns)):
+            yield row, correlation_matrix(returns[row - window + 1:row + 1], method)
+
+
+def sliding_window(prices, calculations: list, window_size: int, interval="DAILY", ohlc="close", layout="answer"):
+    """
+    Compute locally the calculations of ANALYTICS_SLIDING_WINDOW (see AlphaVantage.advanced_analytics_sliding_window) for every column of prices at once, each window holding window_size returns.
+
+    ❚ Required: prices (DataFrame)
+        One column of prices per symbol indexed by date, as for fixed_window.
+
+    ❚ Required: calculations (list)
+        MEAN, MEDIAN, CUMULATIVE_RETURN, VARIANCE, STDDEV, COVARIANCE and CORRELATION, with their parameters. For example: calculations=["STDDEV(annualized=True)", "CORRELATION"]
+
+    ❚ Required: window_size (int)
+        Number of returns in each window.
+
+    ❚ Optional: interval (str)
+        1min, 5min, 15min, 30min, 60min, DAILY, WEEKLY or MONTHLY, used to annualize.
+
+    ❚ Optional: layout (str)
+        By default, layout=answer and the result has the layout of the JSON answer of the endpoint: the per-symbol calculations are {"RUNNING_NAME": {symbol: {date: value}}}, the matrices {"index": symbols, "RUNNING_NAME": {date: lower triangle}}, date being the last date of each window (with its time for intraday bars). The matrices are converted one window at a time.
+        Set layout=array for many symbols: every calculation is {"index": symbols, "dates": dates, "RUNNING_NAME": array}, the array being (dates x symbols) for the per-symbol calculations, NaN where the window is incomplete, and (dates x symbols x symbols) for the matrices, dates holding the last date of each window.
+
+    MEAN, VARIANCE and STDDEV come from running sums (see rolling_moments), COVARIANCE and the PEARSON CORRELATION from Welford updates (see iter_rolling_covariance) on the dates where every symbol has a return. MEDIAN and the SPEARMAN and KENDALL correlations are computed window by window.
+    """
+    prices = prices.sort_index()
+    symbols = [str(symbol) for symbol in prices.columns]
+    values = prices.to_numpy(dtype=np.float64)
+    returns = values[1:] / values[:-1] - 1
+    labels = _labels(prices.index)
+    dates = labels[1:]
+    complete = ~np.isnan(returns).any(axis=1)
+    common, common_dates = returns[complete], dates[complete]
+    periods = PERIODS_PER_YEAR[interval.upper()]
+    moments = None
+
+    def per_symbol(running, array):
+        if layout == "array":
+            return {"index": symbols, "dates": dates, running: array}
+        return {running: {
+            symbol: {date: float(value) for date, value in zip(dates, array[:, j]) if not np.isnan(value)}
+            for j, symbol in enumerate(symbols)
+        }}
+
+    def matrices(running, windows):
+        if layout == "array":
+            stack = np.empty((max(len(common) - window_size + 1, 0), len(symbols), len(symbols)))
+            for row, matrix in windows:
+                stack[row - window_size + 1] = matrix
+            return {"index": symbols, "dates": common_dates[window_size - 1:], running: stack}
+        return {"index": symbols, running: {common_dates[row]: _lower_triangle(matrix) for row, matrix in windows}}
+
+    results = {}
+    for calculation in calculations:
+        name, params = parse_calculation(calculation)
+        scale = periods if params.get("annualized", False) else 1
+        key = calculation.strip().upper()
+        running = f"RUNNING_{name}"
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if name in ("MEAN", "VARIANCE", "STDDEV"):
+                if moments is None:
+                    moments = rolling_moments(returns, window_size)
+                mean, variance = moments
+                if name == "MEAN":
+                    array = mean
+                else:
+                    array = variance * scale if name == "VARIANCE" else np.sqrt(variance * scale)
+                results[key] = per_symbol(running, array)
+            elif name == "MEDIAN":
+                array = np.full(returns.shape, np.nan)
+                if len(returns) >= window_size:
+                    windows = np.lib.stride_tricks.sliding_window_view(returns, window_size, axis=0)
+                    array[window_size - 1:] = np.median(windows, axis=-1)
+                results[key] = per_symbol(running, array)
+            elif name == "CUMULATIVE_RETURN":
+                array = np.full(returns.shape, np.nan)
+                array[window_size - 1:] = values[window_size:] / values[:-window_size] - 1
+                results[key] = per_symbol(running, array)
+            elif name in ("COVARIANCE", "CORRELATION"):
+                windows = _iter_window_matrices(common, window_size, name, params.get("method", "PEARSON"), scale)
+                results[key] = matrices(running, windows)
+            else:
+                raise ValueError(f"Unknown calculation: {calculation}")
+
+    return {
+        "meta_data": {
+            "symbols": ",".join(symbols),
+            "window_size": window_size,
+            "min_dt": str(labels[0]) if len(labels) else None,
+            "max_dt": str(labels[-1]) if len(labels) else None,
+            "ohlc": ohlc.capitalize(),
+            "interval": interval.upper(),
+        },
+        "payload": {"RETURNS_CALCULATIONS": results},
+    }
+
+
+# time series method and its arguments fetched for each INTERVAL of the analytics endpoints
+INTERVAL_METHODS = {
+    "DAILY": ("time_series_daily", {"outputsize": "full"}),
+    "WEEKLY": ("time_series_weekly", {}),
+    "MONTHLY": ("time_series_monthly", {}),
+}
+
+
+def fetch_prices(client, symbols: list, start_date: str, end_date: str, interval: str, ohlc="close"):
+    """
+    Fetch the prices of symbols through client (and so through its caches) and return the (date x symbol) frame between start_date and end_date, input of the local analytics.
+    """
+    interval = interval.upper()
+    if interval in INTERVAL_METHODS:
+        method, kwargs = INTERVAL_METHODS[interval]
+    else:
+        method, kwargs = "time_series_intraday", {"interval": int(interval.replace("MIN", "")), "outputsize": "full"}
+    prices, failures = client.bulk_time_series(symbols, method=method, layout="panel", fields=ohlc.lower(), **kwargs)
+    if failures:
+        raise next(iter(failures.values()))
+    return prices.loc[pd.Timestamp(start_date):pd.Timestamp(end_date) + pd.Timedelta(days=1) - pd.Timedelta(1)]
+
+
+def advance_analytics(client, symbols: list, start_date: str, end_date: str, interval: str, calculation: list, HOLC="close"):
+    """
+    Offline drop-in for AlphaVantage.advance_analytics: same arguments and same answer layout, computed by fixed_window on the series fetched (or read from the caches) by client, without the symbol and calculation limits of the endpoint.
+    """
+    prices = fetch_prices(client, symbols, start_date, end_date, interval, HOLC)
+    return fixed_window(prices, calculation, interval=interval, ohlc=HOLC)
+
+
+def advanced_analytics_sliding_window(client, symbols: list, start_date: str, end_date: str, interval: str, calculation: list, window_size: int, HOLC="close", layout="answer"):
+    """
+    Offline drop-in for AlphaVantage.advanced_analytics_sliding_window: same arguments and same answer layout, computed by sliding_window on the series fetched (or read from the caches) by client.
+    Set layout=array to get numpy arrays instead, see sliding_window.
+    """
+    prices = fetch_prices(client, symbols, start_date, end_date, interval, HOLC)
+    return sliding_window(prices, calculation, window_size, interval=interval, ohlc=HOLC, layout=layout)
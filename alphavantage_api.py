@@ -1,10 +1,1012 @@
+import asyncio
+import codecs
+import contextlib
+import copy
+import datetime
+import inspect
+import io
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
-class AlphaVantage():
+# requests per minute and per day allowed for each kind of API key, see https://www.alphavantage.co/premium/
+TIERS = {
+    "free": (5, 25),
+    "premium_75": (75, None),
+    "premium_150": (150, None),
+    "premium_300": (300, None),
+    "premium_600": (600, None),
+    "premium_1200": (1200, None),
+}
+
+
+class AlphaVantageError(Exception):
+    """
+    Raised when the API answers with an "Error Message", "Note" or "Information" payload instead of data.
+    """
+
+
+class RateLimitError(AlphaVantageError):
+    """
+    Raised when the API keeps throttling the key or when the daily quota of the key is exhausted.
+    """
+
+
+class RateLimiter():
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, per_minute: int, per_day=None, burst=1):
+        """
+        Token bucket pacing the requests of one API key. Every request takes a token, tokens come back at per_minute / 60 per second and at most burst tokens can be saved.
+        Callers that find the bucket empty reserve the next token and sleep until it is available, so concurrent threads are served in arrival order at the maximum allowed rate.
+
+        ❚ Required: per_minute (int)
+            Number of requests allowed per minute.
+
+        ❚ Optional: per_day (int)
+            Number of requests allowed per day. Once it is reached acquire raises a RateLimitError until the next day.
+
+        ❚ Optional: burst (int)
+            Number of requests that can be sent back to back after an idle period. By default burst=1 and the requests are evenly spaced.
+        """
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.burst = burst
+        self.interval = 60 / per_minute
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._day = datetime.date.today()
+        self._day_count = 0
+        self.tier = None
+
+    @classmethod
+    def for_tier(cls, tier="free", **kwargs):
+        per_minute, per_day = TIERS[tier]
+        limiter = cls(per_minute, per_day, **kwargs)
+        limiter.tier = tier
+        return limiter
+
+    @classmethod
+    def shared(cls, api_key: str, tier=None, **kwargs):
+        """
+        Return the limiter registered for api_key, creating it for tier (free by default) the first time. Every client created with the same key in this process shares it.
+        A tier that differs from the one the limiter was registered with raises a ValueError instead of being ignored, a key has one plan.
+        """
+        with cls._shared_lock:
+            limiter = cls._shared.get(api_key)
+            if limiter is None:
+                limiter = cls._shared[api_key] = cls.for_tier(tier or "free", **kwargs)
+            elif tier is not None and tier != limiter.tier:
+                raise ValueError(f"The rate limiter of this API key is registered for the {limiter.tier} tier, not {tier}")
+            return limiter
+
+    def acquire(self):
+        with self._lock:
+            today = datetime.date.today()
+            if today != self._day:
+                self._day, self._day_count = today, 0
+            if self.per_day is not None and self._day_count >= self.per_day:
+                raise RateLimitError(f"Daily quota of {self.per_day} requests reached")
+            self._day_count += 1
+
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens * self.interval if self._tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def penalize(self, seconds: float):
+        """
+        Push every pending and future request back by seconds, used when the API throttled a request despite the pacing.
+        """
+        with self._lock:
+            self._tokens -= seconds / self.interval
+
+    @property
+    def remaining_today(self):
+        if self.per_day is None:
+            return None
+        return max(self.per_day - self._day_count, 0)
+
+
+DAY = 24 * 60 * 60
+
+# default freshness in seconds of the persisted answers of each function, functions missing here are never persisted
+CACHE_TTLS = {
+    "TIME_SERIES_DAILY": DAY / 2,
+    "TIME_SERIES_DAILY_ADJUSTED": DAY / 2,
+    "TIME_SERIES_WEEKLY": DAY,
+    "TIME_SERIES_WEEKLY_ADJUSTED": DAY,
+    "TIME_SERIES_MONTHLY": DAY,
+    "TIME_SERIES_MONTHLY_ADJUSTED": DAY,
+    "FX_DAILY": DAY / 2,
+    "FX_WEEKLY": DAY,
+    "FX_MONTHLY": DAY,
+    "DIGITAL_CURRENCY_DAILY": DAY / 2,
+    "DIGITAL_CURRENCY_WEEKLY": DAY,
+    "DIGITAL_CURRENCY_MONTHLY": DAY,
+    "HISTORICAL_OPTIONS": 7 * DAY,
+    "EARNINGS_CALL_TRANSCRIPT": 30 * DAY,
+    "OVERVIEW": DAY,
+    "ETF_PROFILE": DAY,
+    "DIVIDENDS": DAY,
+    "SPLITS": DAY,
+    "INCOME_STATEMENT": DAY,
+    "BALANCE_SHEET": DAY,
+    "CASH_FLOW": DAY,
+    "EARNINGS": DAY,
+    "LISTING_STATUS": DAY,
+    "EARNINGS_CALENDAR": DAY,
+    "IPO_CALENDAR": DAY,
+    "WTI": DAY,
+    "BRENT": DAY,
+    "NATURAL_GAS": DAY,
+    "COPPER": DAY,
+    "ALUMINUM": DAY,
+    "WHEAT": DAY,
+    "CORN": DAY,
+    "COTTON": DAY,
+    "SUGAR": DAY,
+    "COFFEE": DAY,
+    "ALL_COMMODITIES": DAY,
+    "REAL_GDP": DAY,
+    "REAL_GDP_PER_CAPITA": DAY,
+    "TREASURY_YIELD": DAY,
+    "FEDERAL_FUNDS_RATE": DAY,
+    "CPI": DAY,
+    "INFLATION": DAY,
+    "RETAIL_SALES": DAY,
+    "DURABLES": DAY,
+    "UNEMPLOYMENT": DAY,
+    "NONFARM_PAYROLL": DAY,
+}
+
+
+def request_key(url: str):
+    """
+    Return (function, key) identifying the request of url, the key is made of the function and its parameters without the API key.
+    """
+    params = [(k, v) for k, v in parse_qsl(urlsplit(url).query, keep_blank_values=True) if k != "apikey"]
+    params.sort(key=lambda kv: kv[0])
+    function = dict(params).get("function", "")
+    return function, "&".join(f"{k}={v}" for k, v in params)
+
+
+class DiskCache():
+    def __init__(self, path="alphavantage_cache.sqlite", ttls=None, max_size_mb=512):
+        """
+        Persistent cache of the raw answers of the API, stored in one SQLite file so it survives between runs and can be shared by several processes.
+        Entries are keyed on the function and its parameters (the API key is left out) and expire after the freshness of their function. When the file grows over max_size_mb the least recently used entries are evicted.
+
+        ❚ Optional: path (str)
+            Location of the SQLite file.
+
+        ❚ Optional: ttls (dict)
+            Freshness in seconds per function, merged over CACHE_TTLS. For example: ttls={"OVERVIEW": 7 * DAY}. Use None to never persist a function.
+
+        ❚ Optional: max_size_mb (float)
+            Maximum total size of the stored answers.
+        """
+        self.path = path
+        self.ttls = {**CACHE_TTLS, **(ttls or {})}
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, function TEXT, content BLOB, size INTEGER, created REAL, accessed REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def cacheable(self, url: str):
+        function, _ = request_key(url)
+        return self.ttls.get(function) is not None
+
+    def get(self, url: str):
+        """
+        Return the stored content of url, or None when it is missing or stale.
+        """
+        function, key = request_key(url)
+        ttl = self.ttls.get(function)
+        if ttl is None:
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT content, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > ttl:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, url: str, content: bytes):
+        function, key = request_key(url)
+        if self.ttls.get(function) is None:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, function, sqlite3.Binary(content), len(content), now, now),
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_size:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_size:
+                break
+
+    def clear(self, function=None):
+        with self._lock:
+            if function is None:
+                self._db.execute("DELETE FROM responses")
+            else:
+                self._db.execute("DELETE FROM responses WHERE function = ?", (function,))
+
+    def stats(self):
+        """
+        Return the hit and miss counts of this session with the number of entries and bytes stored.
+        """
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_mb": size / 1024 / 1024,
+        }
+
+    def close(self):
+        self._db.close()
+
+
+# number of points returned by outputsize=compact
+COMPACT_POINTS = 100
+
+# parsed dates and categorical columns of the CSV functions
+CSV_COLUMNS = {
+    "LISTING_STATUS": (["ipoDate", "delistingDate"], ["exchange", "assetType", "status"]),
+    "EARNINGS_CALENDAR": (["reportDate", "fiscalDateEnding"], ["currency"]),
+    "IPO_CALENDAR": (["ipoDate"], ["currency", "exchange", "assetType"]),
+}
+
+# bytes read at a time from the streamed answers
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# bytes of a streamed CSV answer inspected for an error payload before it is parsed
+CSV_HEAD_SIZE = 1024
+
+# number of symbols honored by one REALTIME_BULK_QUOTES request
+BULK_QUOTES_SIZE = 100
+
+# freshness in seconds of the in-memory answers, short enough for the realtime functions and enough for the fundamentals requested twice by different modules to share one request
+MEMORY_TTLS = {
+    "GLOBAL_QUOTE": 0.5,
+    "CURRENCY_EXCHANGE_RATE": 0.5,
+    "OVERVIEW": 60,
+    "INCOME_STATEMENT": 60,
+    "BALANCE_SHEET": 60,
+    "CASH_FLOW": 60,
+    "EARNINGS": 60,
+}
+
+
+class _Flight():
     def __init__(self):
-        self.api = "YOUR_API_KEY" # you can find it with this link https://www.alphavantage.co
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class MemoryCache():
+    def __init__(self, ttls=None, max_entries=1024):
+        """
+        In-process LRU cache of the decoded answers of the realtime and fundamental functions, with a short freshness per function.
+        Identical requests made at the same time are coalesced: the first caller fetches, the others wait for its answer, so a burst of callers asking for the same quote produces one upstream request.
+
+        ❚ Optional: ttls (dict)
+            Freshness in seconds per function, merged over MEMORY_TTLS. Use None to bypass the cache for a function.
+
+        ❚ Optional: max_entries (int)
+            Number of answers kept before the least recently used is dropped.
+        """
+        self.ttls = {**MEMORY_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, url: str, load):
+        """
+        Return a copy of the fresh answer of url, calling load() to fetch it when it is missing or stale.
+        """
+        function, key = request_key(url)
+        ttl = self.ttls.get(function)
+        if ttl is None:
+            return load()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] <= ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[0])
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.value)
+
+        try:
+            flight.value = load()
+        except Exception as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                self._entries[key] = (flight.value, time.monotonic())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return copy.deepcopy(flight.value)
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced, "entries": len(self._entries)}
+
+
+# output column -> (field of the API, dtype) of the time series functions
+OHLC_FIELDS = {
+    "open": ("1. open", np.float64),
+    "high": ("2. high", np.float64),
+    "low": ("3. low", np.float64),
+    "close": ("4. close", np.float64),
+}
+OHLCV_FIELDS = {**OHLC_FIELDS, "volume": ("5. volume", np.int64)}
+CRYPTO_FIELDS = {**OHLC_FIELDS, "volume": ("5. volume", np.float64)}
+DAILY_ADJUSTED_FIELDS = {
+    **OHLC_FIELDS,
+    "adjusted_close": ("5. adjusted close", np.float64),
+    "volume": ("6. volume", np.int64),
+    "dividend_amount": ("7. dividend amount", np.float64),
+    "split_coefficient": ("8. split coefficient", np.float64),
+}
+PERIOD_ADJUSTED_FIELDS = {
+    **OHLC_FIELDS,
+    "adjusted_close": ("5. adjusted close", np.float64),
+    "volume": ("6. volume", np.int64),
+    "dividend_amount": ("7. dividend amount", np.float64),
+}
+
+
+# text columns stored as pandas categories by compact_frame
+CATEGORICAL_COLUMNS = ("symbol", "currency", "market", "from_symbol", "to_symbol", "exchange", "assetType")
+
+
+def compact_frame(df):
+    """
+    Shrink df in place to its compact representation: float32 prices and values, uint32 volumes (uint64 when they do not fit) and categorical symbol/currency columns. Dates stay datetime64[ns], i.e. int64 nanosecond timestamps.
+    """
+    for name in df.columns:
+        column = df[name]
+        if column.dtype == np.float64:
+            df[name] = column.astype(np.float32)
+        elif column.dtype == np.int64:
+            fits = len(column) == 0 or (column.min() >= 0 and column.max() <= np.iinfo(np.uint32).max)
+            df[name] = column.astype(np.uint32 if fits else np.uint64)
+        elif name in CATEGORICAL_COLUMNS and not isinstance(column.dtype, pd.CategoricalDtype):
+            df[name] = column.astype("category")
+    return df
+
+
+def time_series_frame(time_series: dict, fields: dict, compact=False):
+    """
+    Convert the {date: {field: value}} mapping of a time series answer into a DataFrame with typed columns and a DatetimeIndex named date, in the order of the answer.
+    Each column is parsed straight from the answer into its numpy array, without building intermediate rows.
+    """
+    n = len(time_series)
+    rows = time_series.values()
+    index = pd.DatetimeIndex(np.array(list(time_series), dtype="datetime64[ns]"), name="date")
+    columns = {
+        name: np.fromiter((row[key] for row in rows), dtype=dtype, count=n)
+        for name, (key, dtype) in fields.items()
+    }
+    df = pd.DataFrame(columns, index=index, copy=False)
+    if compact:
+        compact_frame(df)
+    return df
+
+
+def value_frame(records: list, compact=False):
+    """
+    Convert the [{"date": ..., "value": ...}] answer of the commodity and economic functions into a date/value DataFrame.
+    In compact mode the dates are parsed and the values become float32, missing values (".") turning into NaN.
+    """
+    df = pd.DataFrame.from_dict(records)
+    df.columns = ["date", "value"]
+    if compact:
+        df["date"] = pd.to_datetime(df["date"]).astype("datetime64[ns]")
+        df["value"] = pd.to_numeric(df["value"], errors="coerce").astype(np.float32)
+    return df
+
+
+_WHITESPACE = re.compile(r"[\s,]*")
+_DECODER = json.JSONDecoder()
+_DELIMITERS = frozenset(",]} \t\r\n")
+
+
+def iter_json_members(chunks, key: str, head_size=4096):
+    """
+    Incrementally parse the JSON document arriving as chunks (bytes) and yield the members of the top-level key one at a time: (name, value) pairs when it holds an object, values when it holds an array.
+    Only the chunk being parsed is kept in memory, the consumed part of the document is dropped each time a new chunk is read.
+    If the key is missing, a KeyError carrying the first head_size characters of the document is raised, so the caller can inspect an error answer.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    opening = re.compile(re.escape(json.dumps(key)) + r"\s*:\s*([\[{])")
+    chunks = iter(chunks)
+    buffer = ""
+    head = ""
+    done = False
+
+    def more():
+        nonlocal buffer, head, done
+        for chunk in chunks:
+            if chunk:
+                text = decoder.decode(chunk)
+                buffer += text
+                if len(head) < head_size:
+                    head += text[:head_size - len(head)]
+                return True
+        buffer += decoder.decode(b"", final=True)
+        done = True
+        return False
+
+    # locate the value of the key, keeping only the tail that could hold a split match
+    while True:
+        match = opening.search(buffer)
+        if match is not None:
+            break
+        buffer = buffer[-(len(key) + 64):]
+        if not more():
+            raise KeyError(key, head)
+
+    is_object = match.group(1) == "{"
+    closing = "}" if is_object else "]"
+    pos = match.end()
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos >= len(buffer):
+            buffer, pos = "", 0
+            if not more():
+                raise ValueError(f"Truncated JSON document while reading {key}")
+            continue
+        if buffer[pos] == closing:
+            return
+
+        try:
+            if is_object:
+                name, end = _DECODER.raw_decode(buffer, pos)
+                end = buffer.index(":", end) + 1
+                end = _WHITESPACE.match(buffer, end).end()
+                value, end = _DECODER.raw_decode(buffer, end)
+            else:
+                value, end = _DECODER.raw_decode(buffer, pos)
+        except ValueError:
+            end = len(buffer)
+
+        # a value is complete once a delimiter follows it, a number cut by the end of a chunk ("12" of "12.5", "1." of "1.5e3") decodes short
+        if end < len(buffer) and buffer[end] in _DELIMITERS:
+            yield (name, value) if is_object else value
+            pos = end
+            continue
+
+        buffer = buffer[pos:]
+        pos = 0
+        if not more():
+            raise ValueError(f"Truncated or malformed JSON document while reading {key}")
+
+
+def stream_time_series_frame(members, fields: dict, compact=False, block_size=8192):
+    """
+    Same as time_series_frame but built from the (date, values) pairs yielded by iter_json_members, so the answer is never held whole in memory.
+    Rows are gathered block_size at a time and each block is converted to typed columns right away, the blocks being concatenated once at the end.
+    """
+    names = list(fields)
+    date_blocks = []
+    column_blocks = {name: [] for name in names}
+
+    def flush(rows):
+        values = [row[1] for row in rows]
+        date_blocks.append(np.array([row[0] for row in rows], dtype="datetime64[ns]"))
+        for name, (key, dtype) in fields.items():
+            column_blocks[name].append(np.fromiter((value[key] for value in values), dtype=dtype, count=len(values)))
+
+    rows = []
+    for row in members:
+        rows.append(row)
+        if len(rows) == block_size:
+            flush(rows)
+            rows = []
+    flush(rows)
+
+    index = pd.DatetimeIndex(np.concatenate(date_blocks), name="date")
+    data = {name: np.concatenate(blocks) for name, blocks in column_blocks.items()}
+    df = pd.DataFrame(data, index=index, copy=False)
+    if compact:
+        compact_frame(df)
+    return df
+
+class _PrefixedReader(io.RawIOBase):
+    def __init__(self, head: bytes, raw):
+        """
+        Raw binary stream replaying the head bytes already read from raw before the rest of raw, so an answer can be inspected without losing its start.
+        """
+        self._head = memoryview(head)
+        self._raw = raw
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if len(self._head):
+            n = min(len(b), len(self._head))
+            b[:n] = self._head[:n]
+            self._head = self._head[n:]
+            return n
+        return self._raw.readinto(b)
+
+
+def _common_dtype(dtypes):
+    if all(isinstance(dtype, np.dtype) for dtype in dtypes):
+        return np.result_type(*dtypes)
+    return np.dtype(object)
+
+
+def long_frame(frames: dict):
+    """
+    Stack {symbol: frame} time series into one long DataFrame with date and symbol columns followed by the fields, in the order of the dict.
+    Every output column is allocated once at its final size and filled slice by slice, instead of concatenating the frames.
+    A column takes the smallest dtype holding the dtypes of every frame, e.g. uint64 when the compact volumes of one symbol did not fit in uint32.
+    """
+    symbols = list(frames)
+    lengths = np.array([len(frames[symbol]) for symbol in symbols], dtype=np.int64)
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    total = int(ends[-1]) if len(ends) else 0
+    fields = list(frames[symbols[0]].columns) if symbols else []
+
+    dates = np.empty(total, dtype="datetime64[ns]")
+    columns = {name: np.empty(total, dtype=_common_dtype([frames[symbol][name].dtype for symbol in symbols])) for name in fields}
+    for symbol, start, end in zip(symbols, starts, ends):
+        frame = frames[symbol]
+        dates[start:end] = frame.index.values
+        for name in fields:
+            columns[name][start:end] = frame[name].to_numpy()
+
+    codes = np.repeat(np.arange(len(symbols), dtype=np.int32), lengths)
+    data = {"date": dates, "symbol": pd.Categorical.from_codes(codes, categories=symbols), **columns}
+    return pd.DataFrame(data, copy=False)
+
+
+def panel_frame(frames: dict, fields=None):
+    """
+    Align {symbol: frame} time series on the union of their dates into a (date x symbol) DataFrame, one block per field.
+    With a single field the columns are the symbols, otherwise they are a (field, symbol) MultiIndex. Missing dates are NaN.
+    """
+    symbols = list(frames)
+    if fields is None:
+        fields = list(frames[symbols[0]].columns) if symbols else []
+    elif isinstance(fields, str):
+        fields = [fields]
+
+    dates = np.unique(np.concatenate([frames[symbol].index.values for symbol in symbols])) if symbols else np.array([], dtype="datetime64[ns]")
+    block = np.full((len(dates), len(fields) * len(symbols)), np.nan)
+    for j, symbol in enumerate(symbols):
+        frame = frames[symbol]
+        rows = np.searchsorted(dates, frame.index.values)
+        for i, name in enumerate(fields):
+            block[rows, i * len(symbols) + j] = frame[name].to_numpy()
+
+    index = pd.DatetimeIndex(dates, name="date")
+    if len(fields) == 1:
+        columns = pd.Index(symbols, name="symbol")
+    else:
+        columns = pd.MultiIndex.from_product([fields, symbols], names=["field", "symbol"])
+    return pd.DataFrame(block, index=index, columns=columns, copy=False)
+
+
+class AlphaVantage():
+    def __init__(self, api_key="YOUR_API_KEY", tier=None, rate_limiter=None, cache=None, memory_cache=True, compact=False, streaming=True, pool_size=10, timeout=(5, 30), retries=3, backoff_factor=0.5, base_url="https://www.alphavantage.co"):
+        """
+        Every endpoint method goes through one pooled keep-alive session, so consecutive calls reuse the same TCP+TLS connection instead of opening a new one.
+
+        ❚ Optional: api_key (str)
+            Your API key, you can find it with this link https://www.alphavantage.co
+
+        ❚ Optional: tier (str)
+            The plan of the key, used to pace the requests: free, premium_75, premium_150, premium_300, premium_600 or premium_1200. Every client created with the same key shares one RateLimiter.
+            By default the tier the key is already registered with, free for a new key. A tier conflicting with the registered one raises a ValueError.
+
+        ❚ Optional: rate_limiter (RateLimiter)
+            A custom limiter to use instead of the shared one of the key. Set rate_limiter=False to disable the pacing.
+
+        ❚ Optional: cache (DiskCache or str)
+            Opt-in persistent cache of the answers, either a DiskCache or the path of its file. By default nothing is persisted.
+
+        ❚ Optional: memory_cache (MemoryCache or Bool)
+            In-memory cache with single-flight in front of the realtime quote and exchange rate functions and the fundamentals, see MEMORY_TTLS. By default a MemoryCache is created, set memory_cache=False to disable it.
+
+        ❚ Optional: compact (Bool)
+            By default, compact=False. Set compact=True to get the time series, FX, crypto, commodity and economic frames in their compact representation (float32 prices, uint32/uint64 volumes, categorical text columns), see compact_frame.
+
+        ❚ Optional: streaming (Bool)
+            By default, streaming=True and the large answers (outputsize=full time series, historical options) are parsed while they download instead of being decoded whole first, which keeps the peak memory close to the size of the returned frame. Answers the persistent cache keeps are never streamed.
+
+        ❚ Optional: pool_size (int)
+            Number of connections kept alive in the pool. Set it to at least the number of threads calling the client at the same time.
+
+        ❚ Optional: timeout (float or tuple)
+            Timeout in seconds passed to every request, either one value or a (connect, read) tuple.
+
+        ❚ Optional: retries (int)
+            Number of retries on connection errors and on 429/5xx answers, with an exponential backoff of backoff_factor seconds.
+
+        ❚ Optional: base_url (str)
+            Root of the API. By default https://www.alphavantage.co, you can point it to a local server for testing.
+        """
+        self.api = api_key # you can find it with this link https://www.alphavantage.co
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        if rate_limiter is None:
+            rate_limiter = RateLimiter.shared(api_key, tier)
+        self.rate_limiter = rate_limiter or None
+        if isinstance(cache, str):
+            cache = DiskCache(cache)
+        self.cache = cache
+        if memory_cache is True:
+            memory_cache = MemoryCache()
+        self.memory_cache = memory_cache or None
+        self.compact = compact
+        self.streaming = streaming
+        self.session = self._build_session(pool_size, retries, backoff_factor)
+
+    def _build_session(self, pool_size, retries, backoff_factor):
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _get(self, url):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        r = self.session.get(url, timeout=self.timeout)
+        r.raise_for_status()
+        return r
+
+    def _get_json(self, url):
+        """
+        Return the decoded payload of url. Throttled answers are retried after a pause instead of being returned, other "Error Message"/"Information" answers raise an AlphaVantageError.
+        """
+        if self.memory_cache is not None:
+            return self.memory_cache.get_or_load(url, partial(self._load_json, url))
+        return self._load_json(url)
+
+    def _load_json(self, url):
+        if self.cache is not None:
+            content = self.cache.get(url)
+            if content is not None:
+                return json.loads(content)
+
+        for attempt in range(self.retries + 1):
+            r = self._get(url)
+            data = r.json()
+            message = self._error_message(data)
+            if message is None:
+                if self.cache is not None:
+                    self.cache.set(url, r.content)
+                return data
+            self._handle_error(message, attempt)
+
+    def _handle_error(self, message: str, attempt: int):
+        """
+        Raise for the error answer message, or pause before the next attempt when the key was only throttled for the minute.
+        """
+        if not self._is_throttled(message):
+            raise AlphaVantageError(message)
+        if self._is_daily_limit(message) or attempt >= self.retries:
+            raise RateLimitError(message)
+        if self.rate_limiter is not None:
+            self.rate_limiter.penalize(self.rate_limiter.interval * (attempt + 1))
+        else:
+            time.sleep(2 ** attempt)
+
+    def _stream_members(self, url, key):
+        """
+        Yield the members of key in the answer of url while it downloads, see iter_json_members.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        with self.session.get(url, timeout=self.timeout, stream=True) as r:
+            r.raise_for_status()
+            yield from iter_json_members(r.iter_content(chunk_size=STREAM_CHUNK_SIZE), key)
+
+    def _iter_members(self, url, key):
+        """
+        Same as _stream_members, an error answer being classified from the head of the document carried by the KeyError: throttled requests are sent again after a pause and other errors raise, without downloading the answer a second time.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                yield from self._stream_members(url, key)
+                return
+            except KeyError as e:
+                message = self._head_message(e)
+                if message is None:
+                    raise
+                self._handle_error(message, attempt)
+
+    def _head_message(self, error):
+        """
+        Error message of the document whose head is carried by the KeyError of iter_json_members, None when it is not an error answer.
+        """
+        if len(error.args) != 2 or not isinstance(error.args[1], str):
+            return None
+        try:
+            data = json.loads(error.args[1])
+        except ValueError:
+            return None
+        return self._error_message(data)
+
+    def _streamable(self, url):
+        return self.streaming and (self.cache is None or not self.cache.cacheable(url))
+
+    def _time_series(self, url, key, fields, stream=False):
+        """
+        Return the typed frame of the time series stored under key in the answer of url.
+        Large answers (stream=True) are parsed while they download when the client streams, see _iter_members for the error answers.
+        """
+        if stream and self._streamable(url):
+            return stream_time_series_frame(self._iter_members(url, key), fields, compact=self.compact)
+        data = self._get_json(url)
+        return time_series_frame(data[key], fields, compact=self.compact)
+
+    def _records(self, url, key, stream=True):
+        """
+        Return the list of records stored under key in the answer of url as a DataFrame, streamed column by column when the client streams.
+        """
+        if stream and self._streamable(url):
+            columns = {}
+            for i, record in enumerate(self._iter_members(url, key)):
+                for name, value in record.items():
+                    columns.setdefault(name, [None] * i).append(value)
+                for name, values in columns.items():
+                    if len(values) == i:
+                        values.append(None)
+            return pd.DataFrame(columns)
+        data = self._get_json(url)
+        return pd.DataFrame.from_dict(data[key])
+
+    def _iter_records(self, url, key, batch_size):
+        """
+        Yield the records stored under key in the answer of url as DataFrames of batch_size rows, while the answer downloads when the client streams.
+        """
+        if self._streamable(url):
+            records = self._iter_members(url, key)
+        else:
+            records = iter(self._get_json(url)[key])
+
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) == batch_size:
+                yield pd.DataFrame.from_dict(batch)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_dict(batch)
+
+    def _iter_csv(self, url, batch_size):
+        """
+        Yield the rows of the CSV answer of url as DataFrames of batch_size rows named after the header, while the answer downloads.
+        """
+        import csv
+
+        if self.cache is not None and self.cache.cacheable(url):
+            lines = iter(self._get_text(url).splitlines())
+            rows = csv.reader(lines)
+            yield from self._csv_batches(rows, batch_size)
+            return
+
+        with self._csv_body(url) as body:
+            lines = io.TextIOWrapper(body, encoding="utf-8", newline="")
+            yield from self._csv_batches(csv.reader(lines), batch_size)
+
+    @contextlib.contextmanager
+    def _csv_body(self, url):
+        """
+        Stream the CSV answer of url as a binary file object. The first bytes are inspected before the body is handed over, an error answer sent as JSON being retried or raised like in _get_content.
+        """
+        for attempt in range(self.retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            with self.session.get(url, timeout=self.timeout, stream=True) as r:
+                r.raise_for_status()
+                r.raw.decode_content = True
+                head = r.raw.read(CSV_HEAD_SIZE)
+                if head.lstrip()[:1] != b"{":
+                    yield io.BufferedReader(_PrefixedReader(head, r.raw), STREAM_CHUNK_SIZE)
+                    return
+                content = head + r.raw.read()
+            message = self._body_error(content)
+            if message is None:
+                yield io.BytesIO(content)
+                return
+            self._handle_error(message, attempt)
+
+    @staticmethod
+    def _csv_batches(rows, batch_size):
+        header = next(rows, None)
+        if header is None:
+            return
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+
+    def _get_content(self, url):
+        if self.cache is not None:
+            content = self.cache.get(url)
+            if content is not None:
+                return content
+
+        for attempt in range(self.retries + 1):
+            content = self._get(url).content
+            message = self._body_error(content)
+            if message is None:
+                if self.cache is not None:
+                    self.cache.set(url, content)
+                return content
+            self._handle_error(message, attempt)
+
+    def _body_error(self, content: bytes):
+        """
+        Error message of a CSV answer that came back as a JSON payload ("Error Message", "Note", "Information" or anything else), None for a CSV body.
+        """
+        if content.lstrip()[:1] != b"{":
+            return None
+        try:
+            data = json.loads(content)
+        except ValueError:
+            return None
+        return self._error_message(data) or f"Unexpected JSON answer: {content[:200].decode('utf-8', 'replace')}"
+
+    def _get_text(self, url):
+        return self._get_content(url).decode('utf-8')
+
+    def _read_csv(self, url):
+        """
+        Parse the CSV answer of url straight into a typed DataFrame: the dates of CSV_COLUMNS are parsed, its categorical columns are stored as categories by the parser and "null" becomes missing.
+        The body is fed to the parser while it downloads, unless the persistent cache keeps the function.
+        """
+        function, _ = request_key(url)
+        dates, categories = CSV_COLUMNS.get(function, ([], []))
+        options = {
+            "keep_default_na": False,
+            "na_values": ["null", ""],
+            "dtype": {"symbol": str, "name": str, **{name: "category" for name in categories}},
+        }
+
+        if self.cache is not None and self.cache.cacheable(url):
+            df = pd.read_csv(io.BytesIO(self._get_content(url)), **options)
+        else:
+            with self._csv_body(url) as body:
+                df = pd.read_csv(body, **options)
+
+        # parse_dates of read_csv is slower here and leaves a column with an unparsable date as text
+        for name in dates:
+            if name in df:
+                df[name] = pd.to_datetime(df[name], format="%Y-%m-%d", errors="coerce").astype("datetime64[ns]")
+        return df
+
+    @staticmethod
+    def _error_message(data):
+        if not isinstance(data, dict) or len(data) > 2:
+            return None
+        for key in ("Error Message", "Note", "Information"):
+            if key in data:
+                return data[key]
+        return None
+
+    @staticmethod
+    def _is_throttled(message: str):
+        message = message.lower()
+        return "rate limit" in message or "call frequency" in message or "requests per" in message
+
+    @staticmethod
+    def _is_daily_limit(message: str):
+        """
+        True when message reports the exhausted daily quota of the key. The per-minute notes of the free plan also quote the daily allowance ("5 calls per minute and 500 calls per day"), they are only throttling.
+        """
+        message = message.lower()
+        return "per day" in message and "per minute" not in message and "per second" not in message
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
     def time_series_intraday(self, ticker: str, interval: int, adjusted=True, extended_hours=True, month=None, outputsize="compact"):
         """
@@ -34,24 +1036,8 @@ class AlphaVantage():
         else:
             my_month = f"&month={month}"
 
-        url = f'https://www.alphavantage.co/query?function=TIME_SERIES_INTRADAY&symbol={ticker}&interval={interval}min&extended_hours={extended_hours}&adjusted={adjusted}{my_month}&outputsize={outputsize}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data[f"Time Series ({interval}min)"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"],
-                "volume": values["5. volume"],
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=TIME_SERIES_INTRADAY&symbol={ticker}&interval={interval}min&extended_hours={extended_hours}&adjusted={adjusted}{my_month}&outputsize={outputsize}&apikey={self.api}'
+        return self._time_series(url, f"Time Series ({interval}min)", OHLCV_FIELDS, stream=outputsize == "full")
     
     def time_series_daily(self, ticker: str, outputsize="compact"):
         """
@@ -63,24 +1049,8 @@ class AlphaVantage():
         ❚ Optional: outputsize (str)
             By default, outputsize=compact. Strings compact and full are accepted with the following specifications: compact returns only the latest 100 data points; full returns the full-length time series of 20+ years of historical data. The "compact" option is recommended if you would like to reduce the data size of each API call.
         """
-        url = f'https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol={ticker}&outputsize={outputsize}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data["Time Series (Daily)"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"],
-                "volume": values["5. volume"],
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=TIME_SERIES_DAILY&symbol={ticker}&outputsize={outputsize}&apikey={self.api}'
+        return self._time_series(url, "Time Series (Daily)", OHLCV_FIELDS, stream=outputsize == "full")
   
     def time_series_daily_adjusted(self, ticker: str, outputsize="compact"):
         """
@@ -92,27 +1062,8 @@ class AlphaVantage():
         ❚ Optional: outputsize (str)
             By default, outputsize=compact. Strings compact and full are accepted with the following specifications: compact returns only the latest 100 data points; full returns the full-length time series of 20+ years of historical data. The "compact" option is recommended if you would like to reduce the data size of each API call.
         """
-        url = f'https://www.alphavantage.co/query?function=TIME_SERIES_DAILY_ADJUSTED&symbol={ticker}&outputsize={outputsize}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data["Time Series (Daily)"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"],
-                "adjusted_close": values["5. adjusted close"],
-                "volume": values["6. volume"],
-                "dividend_amount": values["7. dividend amount"],
-                "split_coefficient": values["8. split coefficient"]
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=TIME_SERIES_DAILY_ADJUSTED&symbol={ticker}&outputsize={outputsize}&apikey={self.api}'
+        return self._time_series(url, "Time Series (Daily)", DAILY_ADJUSTED_FIELDS, stream=outputsize == "full")
     
     def time_series_weekly(self, ticker: str):
         """
@@ -124,24 +1075,8 @@ class AlphaVantage():
         ❚ Optional: outputsize (str)
             By default, outputsize=compact. Strings compact and full are accepted with the following specifications: compact returns only the latest 100 data points; full returns the full-length time series of 20+ years of historical data. The "compact" option is recommended if you would like to reduce the data size of each API call.
         """
-        url = f'https://www.alphavantage.co/query?function=TIME_SERIES_WEEKLY&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data["Weekly Time Series"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"],
-                "volume": values["5. volume"]
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=TIME_SERIES_WEEKLY&symbol={ticker}&apikey={self.api}'
+        return self._time_series(url, "Weekly Time Series", OHLCV_FIELDS)
 
     def time_series_weekly_adjusted(self, ticker: str):
         """
@@ -150,26 +1085,8 @@ class AlphaVantage():
         ❚ Required: ticker (str)
             The name of the equity of your choice. For example: ticker=IBM
         """
-        url = f'https://www.alphavantage.co/query?function=TIME_SERIES_WEEKLY_ADJUSTED&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data["Weekly Adjusted Time Series"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"],
-                "adjusted_close": values["5. adjusted close"],
-                "volume": values["6. volume"],
-                "dividend_amount": values["7. dividend amount"]
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=TIME_SERIES_WEEKLY_ADJUSTED&symbol={ticker}&apikey={self.api}'
+        return self._time_series(url, "Weekly Adjusted Time Series", PERIOD_ADJUSTED_FIELDS)
 
     def time_series_monthly(self, ticker: str):
         """
@@ -178,24 +1095,8 @@ class AlphaVantage():
         ❚ Required: ticker (str)
             The name of the equity of your choice. For example: ticker=IBM
         """
-        url = f'https://www.alphavantage.co/query?function=TIME_SERIES_MONTHLY&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data["Monthly Time Series"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"],
-                "volume": values["5. volume"]
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=TIME_SERIES_MONTHLY&symbol={ticker}&apikey={self.api}'
+        return self._time_series(url, "Monthly Time Series", OHLCV_FIELDS)
 
     def time_series_monthly_adjusted(self, ticker: str):
         """
@@ -206,26 +1107,8 @@ class AlphaVantage():
 
         return a json file
         """
-        url = f'https://www.alphavantage.co/query?function=TIME_SERIES_MONTHLY_ADJUSTED&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data["Monthly Adjusted Time Series"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"],
-                "adjusted_close": values["5. adjusted close"],
-                "volume": values["6. volume"],
-                "dividend_amount": values["7. dividend amount"]
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=TIME_SERIES_MONTHLY_ADJUSTED&symbol={ticker}&apikey={self.api}'
+        return self._time_series(url, "Monthly Adjusted Time Series", PERIOD_ADJUSTED_FIELDS)
 
     def quote_endpoint(self, ticker: str):
         """
@@ -237,30 +1120,55 @@ class AlphaVantage():
         
         return a json file
         """
-        url = f'https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        return r.json()
+        url = f'{self.base_url}/query?function=GLOBAL_QUOTE&symbol={ticker}&apikey={self.api}'
+        return self._get_json(url)
 
-    def realtime_bulk_quotes(self, tickers: list):
+    def realtime_bulk_quotes(self, tickers: list, max_workers=8):
         """
         Premium function
         This API returns realtime quotes for US-traded symbols in bulk, accepting up to 100 symbols per API request and covering both regular and extended (pre-market and post-market) trading hours. You can use this endpoint as a high-throughput alternative to the Global Quote API, which accepts one symbol per API request.
         (Premium)
 
         ❚ Required: tickers (list)
-            Up to 100 symbols separated by comma. For example: symbol=MSFT,AAPL,IBM. If more than 100 symbols are provided, only the first 100 symbols will be honored as part of the API input.
+            The symbols of your choice, any number of them. For example: tickers=["MSFT", "AAPL", "IBM"]. They are split into requests of 100 symbols sent in parallel, and the rows come back in the order of tickers.
+
+        ❚ Optional: max_workers (int)
+            Number of requests in flight at the same time.
+
+        The metadata of the answers is in df.attrs: "messages" (the message of each request), "requested", "returned" and "missing" (the symbols without a quote).
         """
 
-        new_tickets = ",".join(tickers)
-        url = f'https://www.alphavantage.co/query?function=REALTIME_BULK_QUOTES&symbol={new_tickets}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        tickers = list(dict.fromkeys(tickers))
+        answers = self._bulk_quotes(tickers, max_workers)
 
-        time_series = data["data"]
-        df = pd.DataFrame.from_dict(time_series)
-        print(data["message"])
+        df = pd.DataFrame.from_dict([row for answer in answers for row in answer.get("data", [])])
+        if len(df):
+            position = {ticker: i for i, ticker in enumerate(tickers)}
+            order = df["symbol"].map(position).fillna(len(tickers)).to_numpy()
+            df = df.iloc[np.argsort(order, kind="stable")].reset_index(drop=True)
+
+        returned = set(df["symbol"]) if len(df) else set()
+        df.attrs["messages"] = [answer.get("message") for answer in answers]
+        df.attrs["requested"] = len(tickers)
+        df.attrs["returned"] = len(df)
+        df.attrs["missing"] = [ticker for ticker in tickers if ticker not in returned]
         return df
 
+    def _bulk_quotes(self, tickers: list, max_workers=8):
+        """
+        Return the JSON answers of REALTIME_BULK_QUOTES for tickers, one request per chunk of BULK_QUOTES_SIZE symbols sent in parallel.
+        """
+        chunks = [tickers[i:i + BULK_QUOTES_SIZE] for i in range(0, len(tickers), BULK_QUOTES_SIZE)]
+
+        def fetch(chunk):
+            url = f'{self.base_url}/query?function=REALTIME_BULK_QUOTES&symbol={",".join(chunk)}&apikey={self.api}'
+            return self._get_json(url)
+
+        if not chunks:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            return list(executor.map(fetch, chunks))
+
     def search_endpoint(self, keywords: str):
         """
         We've got you covered! The Search Endpoint returns the best-matching symbols and market information based on keywords of your choice. The search results also contain match scores that provide you with the full flexibility to develop your own search and filtering logic.
@@ -269,9 +1177,8 @@ class AlphaVantage():
             A text string of your choice. For example: keywords=microsoft.
         """
 
-        url = f'https://www.alphavantage.co/query?function=SYMBOL_SEARCH&keywords={keywords}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=SYMBOL_SEARCH&keywords={keywords}&apikey={self.api}'
+        data = self._get_json(url)
 
         time_series = data["bestMatches"]
         df = pd.DataFrame.from_dict(time_series)
@@ -282,9 +1189,8 @@ class AlphaVantage():
         This endpoint returns the current market status (open vs. closed) of major trading venues for equities, forex, and cryptocurrencies around the world.
         """
     
-        url = f'https://www.alphavantage.co/query?function=MARKET_STATUS&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=MARKET_STATUS&apikey={self.api}'
+        data = self._get_json(url)
 
         time_series = data["markets"]
         df = pd.DataFrame.from_dict(time_series)
@@ -309,9 +1215,8 @@ class AlphaVantage():
         if contract != "":
             contract = f"&contract={contract}"
 
-        url = f'https://www.alphavantage.co/query?function=REALTIME_OPTIONS&symbol={ticker}&require_greeks={require_greeks}{contract}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=REALTIME_OPTIONS&symbol={ticker}&require_greeks={require_greeks}{contract}&apikey={self.api}'
+        data = self._get_json(url)
 
         time_series = data["data"]
         df = pd.DataFrame.from_dict(time_series)
@@ -334,17 +1239,32 @@ class AlphaVantage():
         if date != "":
             date = "&date=" + date
 
-        url = f'https://www.alphavantage.co/query?function=HISTORICAL_OPTIONS&symbol={ticker}{date}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data["data"]
-        df = pd.DataFrame.from_dict(time_series)
-        return df
+        url = f'{self.base_url}/query?function=HISTORICAL_OPTIONS&symbol={ticker}{date}&apikey={self.api}'
+        return self._records(url, "data")
     
 
 
 
+    def iter_historical_options(self, ticker: str, date="", batch_size=1000):
+        """
+        Same as historical_options but yields the chain as DataFrames of batch_size contracts while it downloads, so processing starts before the end of the download and the whole chain is never held in memory.
+
+        ❚ Required: ticker (str)
+            The name of the equity of your choice. For example: ticker=IBM
+
+        ❚ Optional: date (str)
+            By default, the date parameter is not set and the API will return data for the previous trading session. For example, date=2017-11-15.
+
+        ❚ Optional: batch_size (int)
+            Number of contracts per yielded DataFrame.
+        """
+
+        if date != "":
+            date = "&date=" + date
+
+        url = f'{self.base_url}/query?function=HISTORICAL_OPTIONS&symbol={ticker}{date}&apikey={self.api}'
+        yield from self._iter_records(url, "data", batch_size)
+
     def market_sentiment(self, ticker="", topics="", sort="LATEST", limit=50,  time_from="", time_to=""):
         """
         Looking for market news data to train your LLM models or to augment your trading strategy? You have just found it. This API returns live and historical market news & sentiment data from a large & growing selection of premier news outlets around the world, covering stocks, cryptocurrencies, forex, and a wide range of topics such as fiscal policy, mergers & acquisitions, IPOs, etc. This API, combined with our core stock API, fundamental data, and technical indicator APIs, can provide you with a 360-degree view of the financial market and the broader economy.
@@ -391,10 +1311,45 @@ class AlphaVantage():
         if topics != "":
             topics = f"&topics={topics}"
 
-        url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&tickers={ticker}{topics}&sort={sort}{time_from}{time_to}&limit={limit}&apikey={self.api}"
-        r = requests.get(url)
-        return r.json()
+        url = f"{self.base_url}/query?function=NEWS_SENTIMENT&tickers={ticker}{topics}&sort={sort}{time_from}{time_to}&limit={limit}&apikey={self.api}"
+        return self._get_json(url)
     
+    def iter_market_sentiment(self, time_from: str, time_to="", ticker="", topics="", limit=1000):
+        """
+        Walk the news & sentiment feed from time_from to time_to and yield the articles page by page (a list of up to limit articles each), going past the 1000 articles cap of a single request.
+        Each page is requested with sort=EARLIEST and the next one starts at the publication time of the last article received, the articles already yielded at that minute being skipped.
+
+        ❚ Required: time_from (str)
+            The start of the walk, in YYYYMMDDTHHMM format. For example: time_from=20220410T0130.
+
+        ❚ Optional: time_to (str)
+            The end of the walk, in YYYYMMDDTHHMM format. By default the walk goes up to the current time.
+
+        ❚ Optional: ticker and topics (str)
+            Same filters as market_sentiment.
+
+        ❚ Optional: limit (int)
+            Number of articles per request, up to 1000.
+        """
+        seen = set()
+        while True:
+            data = self.market_sentiment(ticker=ticker, topics=topics, sort="EARLIEST", limit=limit, time_from=time_from, time_to=time_to)
+            feed = data.get("feed", [])
+            page = [article for article in feed if article.get("url") not in seen]
+            if page:
+                yield page
+            if len(feed) < limit:
+                return
+
+            next_from = feed[-1]["time_published"][:13]
+            if next_from <= time_from:
+                minute = datetime.datetime.strptime(time_from, "%Y%m%dT%H%M") + datetime.timedelta(minutes=1)
+                next_from = minute.strftime("%Y%m%dT%H%M")
+            seen = {article.get("url") for article in feed if article["time_published"][:13] == next_from}
+            time_from = next_from
+            if time_to and time_from > time_to:
+                return
+
     def earnings_call_transcript(self, ticker: str, quarter:str):
         """
         This API returns the earnings call transcript for a given company in a specific quarter, covering over 15 years of history and enriched with LLM-based sentiment signals.
@@ -412,9 +1367,8 @@ class AlphaVantage():
 
         my_quater = f"&quarter={quarter}"
 
-        url = f'https://www.alphavantage.co/query?function=INSIDER_TRANSACTIONS&symbol={ticker}{my_quater}&apikey={self.api}'
-        r = requests.get(url)
-        return r.json()
+        url = f'{self.base_url}/query?function=INSIDER_TRANSACTIONS&symbol={ticker}{my_quater}&apikey={self.api}'
+        return self._get_json(url)
     
     def top_gainers_losers(self):
         """
@@ -425,9 +1379,8 @@ class AlphaVantage():
         top_gainers_losers()[2] for most actively traded
         """
 
-        url = f'https://www.alphavantage.co/query?function=TOP_GAINERS_LOSERS&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=TOP_GAINERS_LOSERS&apikey={self.api}'
+        data = self._get_json(url)
 
         first = data["top_gainers"]
         second = data["top_losers"]
@@ -447,9 +1400,8 @@ class AlphaVantage():
             The symbol of the ticker of your choice. For example: ticker=IBM.
         """
 
-        url = f'https://www.alphavantage.co/query?function=INSIDER_TRANSACTIONS&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=INSIDER_TRANSACTIONS&symbol={ticker}&apikey={self.api}'
+        data = self._get_json(url)
 
         df = pd.DataFrame.from_dict(data["data"])
         return df
@@ -491,9 +1443,8 @@ class AlphaVantage():
         my_symbols = ",".join(symbols)
         my_calculation = ",".join(calculation)
 
-        url = f'https://www.alphavantage.co/query?function=ANALYTICS_FIXED_WINDOW&SYMBOLS={my_symbols}&RANGE={start_date}&RANGE={end_date}&INTERVAL={interval}&OHLC={HOLC}&CALCULATIONS={my_calculation}&apikey={self.api}'
-        r = requests.get(url)
-        return r.json()
+        url = f'{self.base_url}/query?function=ANALYTICS_FIXED_WINDOW&SYMBOLS={my_symbols}&RANGE={start_date}&RANGE={end_date}&INTERVAL={interval}&OHLC={HOLC}&CALCULATIONS={my_calculation}&apikey={self.api}'
+        return self._get_json(url)
 
     def advanced_analytics_sliding_window(self, symbols: list, start_date: str, end_date: str, interval: str, calculation: list, window_size: int, HOLC="close"):
         """
@@ -529,9 +1480,8 @@ class AlphaVantage():
         my_calculation = ",".join(calculation)
         my_windowsize = f"&WINDOW_SIZE={window_size}"
 
-        url = f'https://www.alphavantage.co/query?function=ANALYTICS_SLIDING_WINDOW&SYMBOLS={my_symbols}&RANGE={start_date}&RANGE={end_date}&INTERVAL={interval}&OHLC={HOLC}{my_windowsize}&CALCULATIONS={my_calculation.upper()}&apikey={self.api}'
-        r = requests.get(url)
-        return r.json()
+        url = f'{self.base_url}/query?function=ANALYTICS_SLIDING_WINDOW&SYMBOLS={my_symbols}&RANGE={start_date}&RANGE={end_date}&INTERVAL={interval}&OHLC={HOLC}{my_windowsize}&CALCULATIONS={my_calculation.upper()}&apikey={self.api}'
+        return self._get_json(url)
     
     def company_overview(self, ticker: str):
         """
@@ -543,9 +1493,8 @@ class AlphaVantage():
         return a json file
         """
 
-        url = f'https://www.alphavantage.co/query?function=OVERVIEW&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        return r.json()
+        url = f'{self.base_url}/query?function=OVERVIEW&symbol={ticker}&apikey={self.api}'
+        return self._get_json(url)
     
     def ETF_profil(self, ticker: str):
         """
@@ -558,9 +1507,8 @@ class AlphaVantage():
         ETF_profil("QQQ")[1] for holdings weight
         """
 
-        url = f'https://www.alphavantage.co/query?function=ETF_PROFILE&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=ETF_PROFILE&symbol={ticker}&apikey={self.api}'
+        data = self._get_json(url)
 
         df1 = pd.DataFrame.from_dict(data["sectors"])
         df2 = pd.DataFrame.from_dict(data[ "holdings"])
@@ -574,9 +1522,8 @@ class AlphaVantage():
             The symbol of the ticker of your choice. For example: ticker=IBM.
         """
 
-        url = f'https://www.alphavantage.co/query?function=DIVIDENDS&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=DIVIDENDS&symbol={ticker}&apikey={self.api}'
+        data = self._get_json(url)
 
         df = pd.DataFrame.from_dict(data["data"])
         return df
@@ -589,9 +1536,8 @@ class AlphaVantage():
             The symbol of the ticker of your choice. For example: ticker=IBM.
         """
 
-        url = f'https://www.alphavantage.co/query?function=SPLITS&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=SPLITS&symbol={ticker}&apikey={self.api}'
+        data = self._get_json(url)
 
         df = pd.DataFrame.from_dict(data["data"])
         return df
@@ -604,9 +1550,8 @@ class AlphaVantage():
             The symbol of the ticker of your choice. For example: ticker=IBM.
         """
 
-        url = f'https://www.alphavantage.co/query?function=INCOME_STATEMENT&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=INCOME_STATEMENT&symbol={ticker}&apikey={self.api}'
+        data = self._get_json(url)
 
         df = pd.DataFrame.from_dict(data["annualReports"])
         df.set_index("fiscalDateEnding", inplace=True)
@@ -620,9 +1565,8 @@ class AlphaVantage():
             The symbol of the ticker of your choice. For example: ticker=IBM.
         """
 
-        url = f'https://www.alphavantage.co/query?function=BALANCE_SHEET&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=BALANCE_SHEET&symbol={ticker}&apikey={self.api}'
+        data = self._get_json(url)
 
         df = pd.DataFrame.from_dict(data["annualReports"])
         df.set_index("fiscalDateEnding", inplace=True)
@@ -636,9 +1580,8 @@ class AlphaVantage():
             The symbol of the ticker of your choice. For example: ticker=IBM.
         """
 
-        url = f'https://www.alphavantage.co/query?function=CASH_FLOW&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=CASH_FLOW&symbol={ticker}&apikey={self.api}'
+        data = self._get_json(url)
 
         df = pd.DataFrame.from_dict(data["annualReports"])
         return df
@@ -654,9 +1597,8 @@ class AlphaVantage():
         earnings("IBM)[1] for quaterly earnings
         """
 
-        url = f'https://www.alphavantage.co/query?function=EARNINGS&symbol={ticker}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=EARNINGS&symbol={ticker}&apikey={self.api}'
+        data = self._get_json(url)
         
         df1 = pd.DataFrame.from_dict(data["annualEarnings"])
         df2 = pd.DataFrame.from_dict(data["quarterlyEarnings"])
@@ -673,30 +1615,33 @@ class AlphaVantage():
         ❚ Optional: state (str)
             By default, state=active and the API will return a list of actively traded stocks and ETFs. Set state=delisted to query a list of delisted assets.
         """
-        import csv
-        date = f"&date={date}"
-        state = f"&state={state}"
-
-        if date == "" and state == "":
-            CSV_URL = f"https://www.alphavantage.co/query?function=LISTING_STATUS&apikey={self.api}"
-        elif date != "" and state == "":
-            CSV_URL = f"https://www.alphavantage.co/query?function=LISTING_STATUS{date}&apikey={self.api}"
-        elif date == "" and state != "":
-            CSV_URL = f"https://www.alphavantage.co/query?function=LISTING_STATUS{state}&apikey={self.api}"
-        else:
-            CSV_URL = f'https://www.alphavantage.co/query?function=LISTING_STATUS{date}{state}&apikey={self.api}'
-
-        with requests.Session() as s:
-            download = s.get(CSV_URL)
-            decoded_content = download.content.decode('utf-8')
-            cr = csv.reader(decoded_content.splitlines(), delimiter=',')
-            my_list = list(cr)
-            df = pd.DataFrame(my_list)
-            df.columns = df.iloc[0]
-            df = df[1:].reset_index(drop=True)
-            return df
+        date = f"&date={date}" if date != "" else ""
+        state = f"&state={state}" if state != "" else ""
+
+        CSV_URL = f'{self.base_url}/query?function=LISTING_STATUS{date}{state}&apikey={self.api}'
+
+        return self._read_csv(CSV_URL)
+
+    def iter_listening_delisting_status(self, date="", state="", batch_size=1000):
+        """
+        Same as listening_delisting_status but yields the list as DataFrames of batch_size rows while the CSV downloads.
+
+        ❚ Optional: date (str)
+            A YYYY-MM-DD date later than 2010-01-01 to "travel back" in time. For example, date=2013-08-03
+
+        ❚ Optional: state (str)
+            By default, state=active. Set state=delisted to query a list of delisted assets.
 
-    def earnings_calendar(self, ticker: str, horizon="3month"):
+        ❚ Optional: batch_size (int)
+            Number of rows per yielded DataFrame.
+        """
+        date = f"&date={date}" if date != "" else ""
+        state = f"&state={state}" if state != "" else ""
+
+        CSV_URL = f'{self.base_url}/query?function=LISTING_STATUS{date}{state}&apikey={self.api}'
+        yield from self._iter_csv(CSV_URL, batch_size)
+
+    def earnings_calendar(self, ticker="", horizon="3month"):
         """
         This API returns a list of company earnings expected in the next 3, 6, or 12 months.
 
@@ -706,36 +1651,21 @@ class AlphaVantage():
         ❚ Optional: horizon (int)
             By default, horizon=3month and the API will return a list of expected company earnings in the next 3 months. You may set horizon=6month or horizon=12month to query the earnings scheduled for the next 6 months or 12 months, respectively.
         """
-        import csv
-        CSV_URL = f'https://www.alphavantage.co/query?function=EARNINGS_CALENDAR&symbol={ticker}&horizon={horizon}month&apikey={self.api}'
-
-        with requests.Session() as s:
-            download = s.get(CSV_URL)
-            decoded_content = download.content.decode('utf-8')
-            cr = csv.reader(decoded_content.splitlines(), delimiter=',')
-            my_list = list(cr)
-            df = pd.DataFrame(my_list)
-            df.columns = df.iloc[0]
-            df = df[1:].reset_index(drop=True)
-            return df
+        if str(horizon).isdigit():
+            horizon = f"{horizon}month"
+
+        CSV_URL = f'{self.base_url}/query?function=EARNINGS_CALENDAR&symbol={ticker}&horizon={horizon}&apikey={self.api}'
+
+        return self._read_csv(CSV_URL)
 
     def IPO_calendar(self):
         """
         This API returns a list of IPOs expected in the next 3 months.
         """
 
-        import csv
-        CSV_URL = f'https://www.alphavantage.co/query?function=IPO_CALENDAR&apikey={self.api}'
-
-        with requests.Session() as s:
-            download = s.get(CSV_URL)
-            decoded_content = download.content.decode('utf-8')
-            cr = csv.reader(decoded_content.splitlines(), delimiter=',')
-            my_list = list(cr)
-            df = pd.DataFrame(my_list)
-            df.columns = df.iloc[0]
-            df = df[1:].reset_index(drop=True)
-            return df
+        CSV_URL = f'{self.base_url}/query?function=IPO_CALENDAR&apikey={self.api}'
+
+        return self._read_csv(CSV_URL)
 
     def exchange_rate(self, from_currency: str, to_currency: str):
         """
@@ -750,9 +1680,8 @@ class AlphaVantage():
         return a json file
         """
 
-        url = f'https://www.alphavantage.co/query?function=CURRENCY_EXCHANGE_RATE&from_currency={from_currency}&to_currency={to_currency}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=CURRENCY_EXCHANGE_RATE&from_currency={from_currency}&to_currency={to_currency}&apikey={self.api}'
+        data = self._get_json(url)
         return data["Realtime Currency Exchange Rate"]
     
     def FX_intraday(self, from_symbol: str, to_symbol: str, interval: int, outputsize="compact"):
@@ -774,23 +1703,8 @@ class AlphaVantage():
         """
         new_outputsize = f"outputsize={outputsize}"
 
-        url = f'https://www.alphavantage.co/query?function=FX_INTRADAY&from_symbol={from_symbol}&to_symbol={to_symbol}&interval={interval}min{new_outputsize}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data[f"Time Series FX ({interval}min)"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"]
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=FX_INTRADAY&from_symbol={from_symbol}&to_symbol={to_symbol}&interval={interval}min{new_outputsize}&apikey={self.api}'
+        return self._time_series(url, f"Time Series FX ({interval}min)", OHLC_FIELDS, stream=outputsize == "full")
     
     def FX_daily(self, from_symbol: str, to_symbol: str, outputsize="compact"):
         """
@@ -806,23 +1720,8 @@ class AlphaVantage():
             By default, outputsize=compact. Strings compact and full are accepted with the following specifications: compact returns only the latest 100 data points in the daily time series; full returns the full-length daily time series. The "compact" option is recommended if you would like to reduce the data size of each API call.
         """
 
-        url = f'https://www.alphavantage.co/query?function=FX_DAILY&from_symbol={from_symbol}&to_symbol={to_symbol}&outputsize={outputsize}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data["Time Series FX (Daily)"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"]
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=FX_DAILY&from_symbol={from_symbol}&to_symbol={to_symbol}&outputsize={outputsize}&apikey={self.api}'
+        return self._time_series(url, "Time Series FX (Daily)", OHLC_FIELDS, stream=outputsize == "full")
     
     def FX_weekly(self, from_symbol: str, to_symbol: str):
         """
@@ -836,23 +1735,8 @@ class AlphaVantage():
             A three-letter symbol from the forex currency list. For example: to_symbol=USD
         """
 
-        url = f'https://www.alphavantage.co/query?function=FX_WEEKLY&from_symbol={from_symbol}&to_symbol={to_symbol}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data["Time Series FX (Weekly)"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"]
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=FX_WEEKLY&from_symbol={from_symbol}&to_symbol={to_symbol}&apikey={self.api}'
+        return self._time_series(url, "Time Series FX (Weekly)", OHLC_FIELDS)
     
     def FX_monthly(self, from_symbol: str, to_symbol: str):
         """
@@ -867,23 +1751,8 @@ class AlphaVantage():
             A three-letter symbol from the forex currency list. For example: to_symbol=USD
         """
 
-        url = f'https://www.alphavantage.co/query?function=FX_MONTHLY&from_symbol={from_symbol}&to_symbol={to_symbol}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data["Time Series FX (Monthly)"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"]
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=FX_MONTHLY&from_symbol={from_symbol}&to_symbol={to_symbol}&apikey={self.api}'
+        return self._time_series(url, "Time Series FX (Monthly)", OHLC_FIELDS)
 
 
 
@@ -900,9 +1769,8 @@ class AlphaVantage():
         return a json file
         """
 
-        url = f'https://www.alphavantage.co/query?function=CURRENCY_EXCHANGE_RATE&from_currency={from_symbol}&to_currency={to_symbol}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=CURRENCY_EXCHANGE_RATE&from_currency={from_symbol}&to_currency={to_symbol}&apikey={self.api}'
+        data = self._get_json(url)
         return data["Realtime Currency Exchange Rate"]
     
     def crypto_intraday(self, ticker: str, market: str, interval: int, outputsize="compact"):
@@ -923,24 +1791,8 @@ class AlphaVantage():
             By default, outputsize=compact. Strings compact and full are accepted with the following specifications: compact returns only the latest 100 data points in the intraday time series; full returns the full-length intraday time series. The "compact" option is recommended if you would like to reduce the data size of each API call.
         """
 
-        url = f'https://www.alphavantage.co/query?function=CRYPTO_INTRADAY&symbol={ticker}&market={market}&interval={interval}min&outputsize={outputsize}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data[f"Time Series Crypto ({interval}min)"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"],
-                "volume": values["5. volume"]
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=CRYPTO_INTRADAY&symbol={ticker}&market={market}&interval={interval}min&outputsize={outputsize}&apikey={self.api}'
+        return self._time_series(url, f"Time Series Crypto ({interval}min)", CRYPTO_FIELDS, stream=outputsize == "full")
     
     def digital_currency_daily(self, ticker: str, market: str):
         """
@@ -953,24 +1805,8 @@ class AlphaVantage():
             The exchange market of your choice. It can be any of the market in the market list. For example: market=EUR.
         """
 
-        url = f'https://www.alphavantage.co/query?function=DIGITAL_CURRENCY_DAILY&symbol={ticker}&market={market}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data["Time Series (Digital Currency Daily)"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"],
-                "volume": values["5. volume"]
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=DIGITAL_CURRENCY_DAILY&symbol={ticker}&market={market}&apikey={self.api}'
+        return self._time_series(url, "Time Series (Digital Currency Daily)", CRYPTO_FIELDS)
     
     def digital_currency_weekly(self, ticker: str, market: str):
         """
@@ -983,24 +1819,8 @@ class AlphaVantage():
             The exchange market of your choice. It can be any of the market in the market list. For example: market=EUR.
         """
 
-        url = f'https://www.alphavantage.co/query?function=DIGITAL_CURRENCY_WEEKLY&symbol={ticker}&market={market}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data["Time Series (Digital Currency Weekly)"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"],
-                "volume": values["5. volume"]
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=DIGITAL_CURRENCY_WEEKLY&symbol={ticker}&market={market}&apikey={self.api}'
+        return self._time_series(url, "Time Series (Digital Currency Weekly)", CRYPTO_FIELDS)
     
     def digital_currency_monthly(self, ticker: str, market: str):
         """
@@ -1012,24 +1832,8 @@ class AlphaVantage():
         ❚ Required: market (str)
             The exchange market of your choice. It can be any of the market in the market list. For example: market=EUR.
         """
-        url = f'https://www.alphavantage.co/query?function=DIGITAL_CURRENCY_WEEKLY&symbol={ticker}&market={market}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
-
-        time_series = data["Time Series (Digital Currency Monthly)"]
-        normalized_data = []
-        for date, values in time_series.items():
-            normalized_data.append({
-                "date": date,
-                "open": values["1. open"],
-                "high": values["2. high"],
-                "low": values["3. low"],
-                "close": values["4. close"],
-                "volume": values["5. volume"]
-            })
-
-        df = pd.DataFrame.from_dict(normalized_data)
-        return df
+        url = f'{self.base_url}/query?function=DIGITAL_CURRENCY_WEEKLY&symbol={ticker}&market={market}&apikey={self.api}'
+        return self._time_series(url, "Time Series (Digital Currency Monthly)", CRYPTO_FIELDS)
 
 
 
@@ -1042,13 +1846,10 @@ class AlphaVantage():
             By default, interval=monthly. Strings daily, weekly, and monthly are accepted.
         """
 
-        url = f'https://www.alphavantage.co/query?function=WTI&interval={interval}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=WTI&interval={interval}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def BRENT(self, interval="monthly"):
         """
@@ -1059,13 +1860,10 @@ class AlphaVantage():
             By default, interval=monthly. Strings daily, weekly, and monthly are accepted.
         """
 
-        url = f'https://www.alphavantage.co/query?function=BRENT&interval={interval}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=BRENT&interval={interval}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def Natural_Gas(self, interval="monthly"):
         """
@@ -1076,13 +1874,10 @@ class AlphaVantage():
             By default, interval=monthly. Strings daily, weekly, and monthly are accepted.
         """
 
-        url = f'https://www.alphavantage.co/query?function=NATURAL_GAS&interval={interval}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=NATURAL_GAS&interval={interval}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def Copper(self, interval="monthly"):
         """
@@ -1093,13 +1888,10 @@ class AlphaVantage():
             By default, interval=monthly. Strings daily, weekly, and monthly are accepted.
         """
 
-        url = f'https://www.alphavantage.co/query?function=COPPER&interval={interval}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=COPPER&interval={interval}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def Aluminium(self, interval="monthly"):
         """
@@ -1110,13 +1902,10 @@ class AlphaVantage():
             By default, interval=monthly. Strings daily, weekly, and monthly are accepted.
         """
 
-        url = f'https://www.alphavantage.co/query?function=ALUMINUM&interval={interval}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=ALUMINUM&interval={interval}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def Wheat(self, interval="monthly"):
         """
@@ -1127,13 +1916,10 @@ class AlphaVantage():
             By default, interval=monthly. Strings daily, weekly, and monthly are accepted.
         """
 
-        url = f'https://www.alphavantage.co/query?function=WHEAT&interval={interval}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=WHEAT&interval={interval}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def Corn(self, interval="monthly"):
         """
@@ -1144,13 +1930,10 @@ class AlphaVantage():
             By default, interval=monthly. Strings daily, weekly, and monthly are accepted.
         """
 
-        url = f'https://www.alphavantage.co/query?function=CORN&interval={interval}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=CORN&interval={interval}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def Cotton(self, interval="monthly"):
         """
@@ -1161,13 +1944,10 @@ class AlphaVantage():
             By default, interval=monthly. Strings daily, weekly, and monthly are accepted.
         """
 
-        url = f'https://www.alphavantage.co/query?function=COTTON&interval={interval}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=COTTON&interval={interval}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def Sugar(self, interval="monthly"):
         """
@@ -1178,13 +1958,10 @@ class AlphaVantage():
             By default, interval=monthly. Strings daily, weekly, and monthly are accepted.
         """
 
-        url = f'https://www.alphavantage.co/query?function=SUGAR&interval={interval}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=SUGAR&interval={interval}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def Coffee(self, interval="monthly"):
         """
@@ -1195,13 +1972,10 @@ class AlphaVantage():
             By default, interval=monthly. Strings daily, weekly, and monthly are accepted.
         """
 
-        url = f'https://www.alphavantage.co/query?function=WTI&interval={interval}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=WTI&interval={interval}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
 
     def Price_index_all_commodities(self, interval="monthly"):
         """
@@ -1212,13 +1986,10 @@ class AlphaVantage():
             By default, interval=monthly. Strings daily, weekly, and monthly are accepted.
         """
 
-        url = f'https://www.alphavantage.co/query?function=ALL_COMMODITIES&interval={interval}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=ALL_COMMODITIES&interval={interval}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
 
 
 
@@ -1230,13 +2001,10 @@ class AlphaVantage():
         ❚ Optional: interval (str)
             By default, interval=annual. Strings quarterly and annual are accepted.
         """
-        url = f'https://www.alphavantage.co/query?function=REAL_GDP&interval={internal}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=REAL_GDP&interval={internal}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def real_gdp_per_capita(self):
         """
@@ -1244,13 +2012,10 @@ class AlphaVantage():
         Source: U.S. Bureau of Economic Analysis, Real gross domestic product per capita, retrieved from FRED, Federal Reserve Bank of St. Louis. This data feed uses the FRED® API but is not endorsed or certified by the Federal Reserve Bank of St. Louis. By using this data feed, you agree to be bound by the FRED® API Terms of Use.
         """
 
-        url = f'https://www.alphavantage.co/query?function=REAL_GDP_PER_CAPITA&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=REAL_GDP_PER_CAPITA&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["data", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
 
     def treasury_yield(self, interval="monthly", maturity="10year"):
         """
@@ -1263,13 +2028,10 @@ class AlphaVantage():
         ❚ Optional: maturity (str)
             By default, maturity=10year. Strings 3month, 2year, 5year, 7year, 10year, and 30year are accepted.
         """
-        url = f'https://www.alphavantage.co/query?function=TREASURY_YIELD&interval={interval}&maturity={maturity}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=TREASURY_YIELD&interval={interval}&maturity={maturity}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
   
     def federal_funds_rate(self, interval="monthly"):
         """
@@ -1280,13 +2042,10 @@ class AlphaVantage():
             By default, interval=monthly. Strings daily, weekly, and monthly are accepted.
         """
 
-        url = f'https://www.alphavantage.co/query?function=FEDERAL_FUNDS_RATE&interval={interval}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=FEDERAL_FUNDS_RATE&interval={interval}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
 
     def consumer_price_index(self, interval="monthly"):
         """
@@ -1297,26 +2056,20 @@ class AlphaVantage():
             By default, interval=monthly. Strings monthly and semiannual are accepted.
         """
 
-        url = f'https://www.alphavantage.co/query?function=CPI&interval={interval}&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=CPI&interval={interval}&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def inflation(self):
         """
         This API returns the annual inflation rates (consumer prices) of the United States
         Source: World Bank, Inflation, consumer prices for the United States, retrieved from FRED, Federal Reserve Bank of St. Louis. This data feed uses the FRED® API but is not endorsed or certified by the Federal Reserve Bank of St. Louis. By using this data feed, you agree to be bound by the FRED® API Terms of Use.
         """
-        url = f'https://www.alphavantage.co/query?function=INFLATION&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=INFLATION&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def retail_sales(self):
         """
@@ -1324,13 +2077,10 @@ class AlphaVantage():
         Source: U.S. Census Bureau, Advance Retail Sales: Retail Trade, retrieved from FRED, Federal Reserve Bank of St. Louis (https://fred.stlouisfed.org/series/RSXFSN). This data feed uses the FRED® API but is not endorsed or certified by the Federal Reserve Bank of St. Louis. By using this data feed, you agree to be bound by the FRED® API Terms of Use.
         """
 
-        url = f'https://www.alphavantage.co/query?function=RETAIL_SALES&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=RETAIL_SALES&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
 
     def durables(self):
         """
@@ -1338,13 +2088,10 @@ class AlphaVantage():
         Source: U.S. Census Bureau, Manufacturers' New Orders: Durable Goods, retrieved from FRED, Federal Reserve Bank of St. Louis (https://fred.stlouisfed.org/series/UMDMNO). This data feed uses the FRED® API but is not endorsed or certified by the Federal Reserve Bank of St. Louis. By using this data feed, you agree to be bound by the FRED® API Terms of Use.
         """
 
-        url = f'https://www.alphavantage.co/query?function=DURABLES&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=DURABLES&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def unemployment(self):
         """
@@ -1352,13 +2099,10 @@ class AlphaVantage():
         Source: U.S. Bureau of Labor Statistics, Unemployment Rate, retrieved from FRED, Federal Reserve Bank of St. Louis. This data feed uses the FRED® API but is not endorsed or certified by the Federal Reserve Bank of St. Louis. By using this data feed, you agree to be bound by the FRED® API Terms of Use.
         """
 
-        url = f'https://www.alphavantage.co/query?function=UNEMPLOYMENT&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=UNEMPLOYMENT&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
-        return df
+        return value_frame(data["data"], compact=self.compact)
     
     def nonfarm_payroll(self):
         """
@@ -1366,10 +2110,365 @@ class AlphaVantage():
 
         Source: U.S. Bureau of Labor Statistics, All Employees, Total Nonfarm, retrieved from FRED, Federal Reserve Bank of St. Louis. This data feed uses the FRED® API but is not endorsed or certified by the Federal Reserve Bank of St. Louis. By using this data feed, you agree to be bound by the FRED® API Terms of Use.
         """
-        url = f'https://www.alphavantage.co/query?function=NONFARM_PAYROLL&apikey={self.api}'
-        r = requests.get(url)
-        data = r.json()
+        url = f'{self.base_url}/query?function=NONFARM_PAYROLL&apikey={self.api}'
+        data = self._get_json(url)
 
-        df = pd.DataFrame.from_dict(data["data"])
-        df.columns = ["date", "value"]
+        return value_frame(data["data"], compact=self.compact)
+
+
+    def bulk_time_series(self, tickers: list, method="time_series_daily_adjusted", layout="long", fields=None, max_workers=8, **kwargs):
+        """
+        Fetch one time series function for many tickers concurrently, within the rate limit of the key, and assemble them into a single frame.
+
+        ❚ Required: tickers (list)
+            The symbols to fetch. For example: tickers=["IBM", "AAPL", "MSFT"]
+
+        ❚ Optional: method (str)
+            The time series method called for every ticker. By default method="time_series_daily_adjusted".
+
+        ❚ Optional: layout (str)
+            By default, layout=long and the result has one row per (date, symbol) with date and symbol columns, see long_frame. Set layout=panel to get a (date x symbol) frame, see panel_frame.
+
+        ❚ Optional: fields (str or list)
+            The fields kept in the panel layout. For example: fields="adjusted_close". By default every field is kept.
+
+        ❚ Optional: max_workers (int)
+            Number of requests in flight at the same time.
+
+        The other keyword arguments are passed to the method, for example outputsize="full".
+
+        bulk_time_series(tickers)[0] for the frame
+        bulk_time_series(tickers)[1] for the {ticker: exception} of the tickers that failed
+        """
+        func = getattr(self, method)
+        frames = {}
+        failures = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(func, ticker, **kwargs): ticker for ticker in dict.fromkeys(tickers)}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    frames[ticker] = future.result()
+                except Exception as e:
+                    failures[ticker] = e
+
+        frames = {ticker: frames[ticker] for ticker in tickers if ticker in frames}
+        if layout == "panel":
+            df = panel_frame(frames, fields)
+        else:
+            df = long_frame(frames)
+        return df, failures
+
+    def sync_time_series(self, ticker: str, store, method="time_series_daily_adjusted", **kwargs):
+        """
+        Bring the stored series of ticker up to date and return it, downloading only what is missing.
+        The first sync downloads outputsize=full. The next ones request outputsize=compact when the bars missing since the last stored date fit in its 100 points, append them and drop the duplicated dates, and fall back to outputsize=full otherwise, merged into the stored bars the same way.
+        For the adjusted series a new split or dividend, or adjusted prices that moved on the dates already stored, rewrite the whole history so it is downloaded again in full and replaces the stored series.
+
+        ❚ Required: ticker (str)
+            The name of the equity of your choice. For example: ticker=IBM
+
+        ❚ Required: store (SeriesStore)
+            The local store keeping the series, see alphavantage_storage.SeriesStore.
+
+        ❚ Optional: method (str)
+            A time series method accepting outputsize: time_series_daily, time_series_daily_adjusted or time_series_intraday. By default method="time_series_daily_adjusted".
+
+        The other keyword arguments are passed to the method, for example interval=5 for time_series_intraday.
+        """
+        func = getattr(self, method)
+        key = "_".join([method] + [f"{name}={value}" for name, value in sorted(kwargs.items())])
+
+        stored = store.load(key, ticker)
+        if stored is None or not len(stored):
+            df = func(ticker, outputsize="full", **kwargs).sort_index()
+            store.save(key, ticker, df)
+            return df
+
+        last = stored.index[-1]
+        points = np.busday_count(last.date(), datetime.date.today() + datetime.timedelta(days=1))
+        if "interval" in kwargs:
+            points *= 16 * 60 // int(kwargs["interval"])
+
+        df = None
+        changed = False
+        if points < COMPACT_POINTS:
+            new = func(ticker, outputsize="compact", **kwargs).sort_index()
+            if len(new) and new.index[0] <= last:
+                changed = self._history_changed(stored, new)
+                if not changed:
+                    df = pd.concat([stored, new[new.index > last]])
+        if df is None:
+            new = func(ticker, outputsize="full", **kwargs).sort_index()
+            # full intraday answers only cover the trailing month, so they are merged into the stored bars unless the history was rewritten
+            if changed or (len(new) and self._history_changed(stored, new)):
+                df = new
+            else:
+                df = pd.concat([stored, new]).sort_index(kind="stable")
+
+        df = df[~df.index.duplicated(keep="last")]
+        store.save(key, ticker, df)
         return df
+
+    @staticmethod
+    def _history_changed(stored, new):
+        """
+        Tell if the bars of new invalidate the adjusted history of stored: a split or a dividend after the last stored date, or adjusted prices that differ on the common dates.
+        """
+        last = stored.index[-1]
+        added = new[new.index > last]
+        if "split_coefficient" in added and (added["split_coefficient"] != 1).any():
+            return True
+        if "dividend_amount" in added and (added["dividend_amount"] != 0).any():
+            return True
+
+        column = "adjusted_close" if "adjusted_close" in new else "close"
+        common = new.index.intersection(stored.index)
+        before = stored.loc[common, column].to_numpy(dtype=np.float64)
+        after = new.loc[common, column].to_numpy(dtype=np.float64)
+        return not np.allclose(before, after, rtol=1e-6)
+
+    def backfill_intraday(self, tickers: list, start_month: str, end_month: str, interval: int, store, max_workers=8, **kwargs):
+        """
+        Download the intraday history of tickers month by month between start_month and end_month, with the months fetched concurrently within the rate limit of the key.
+        Each month is written to its own partition of store as soon as it arrives and is not kept in memory, so memory stays flat whatever the length of the history.
+        Months already in the store are skipped, so running the same backfill again after a failure resumes where it stopped. The current month is still filling up, it is downloaded again on every run.
+
+        ❚ Required: tickers (list or str)
+            The equities of your choice. For example: tickers=["IBM", "AAPL"]
+
+        ❚ Required: start_month and end_month (str)
+            The first and last months to download, in YYYY-MM format. For example: start_month=2015-01, end_month=2024-12
+
+        ❚ Required: interval (int)
+            Time interval between two consecutive data points: 1, 5, 15, 30 or 60 (minutes).
+
+        ❚ Required: store (PartitionedStore)
+            The partitioned store receiving the months, see alphavantage_storage.PartitionedStore. The function name of the partitions is time_series_intraday_{interval}min.
+
+        The other keyword arguments are passed to time_series_intraday, for example adjusted=False.
+
+        return the {(ticker, month): exception} of the months that failed
+        """
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        function = f"time_series_intraday_{interval}min"
+        months = pd.period_range(start_month, end_month, freq="M").strftime("%Y-%m")
+        current = datetime.date.today().strftime("%Y-%m")
+        jobs = [
+            (ticker, month)
+            for ticker in dict.fromkeys(tickers)
+            for month in months
+            if month >= current or not store.exists(function, ticker, month)
+        ]
+
+        def fetch(ticker, month):
+            df = self.time_series_intraday(ticker, interval, month=month, outputsize="full", **kwargs)
+            store.save(function, ticker, month, df.sort_index())
+
+        failures = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(fetch, ticker, month): (ticker, month) for ticker, month in jobs}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    failures[futures[future]] = e
+        return failures
+
+    def job_key(self, method: str, params=()):
+        """
+        Return the key of a (method, params) job in the results of run_jobs: the method and its bound arguments, defaults included, so the same call written with positional or keyword arguments has the same key.
+        params is the first positional argument, a tuple of positional arguments or a dict of keyword arguments, as in AsyncAlphaVantage.gather.
+        """
+        args, kwargs = self._job_arguments(params)
+        bound = inspect.signature(getattr(self, method)).bind(*args, **kwargs)
+        bound.apply_defaults()
+        return method, tuple((name, self._hashable(value)) for name, value in bound.arguments.items())
+
+    @staticmethod
+    def _job_arguments(params):
+        if isinstance(params, dict):
+            return (), params
+        if isinstance(params, tuple):
+            return params, {}
+        return (params,), {}
+
+    @staticmethod
+    def _hashable(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(AlphaVantage._hashable(item) for item in value)
+        if isinstance(value, dict):
+            return tuple(sorted((name, AlphaVantage._hashable(item)) for name, item in value.items()))
+        return value
+
+    def run_jobs(self, jobs: list, max_workers=8):
+        """
+        Run a declarative list of calls concurrently, within the rate limit of the key, and return their results by job.
+        Identical jobs are sent once. The jobs are sent in the order of the list, except that the jobs of the same symbol are grouped after its first one, so a run cut short by the daily quota leaves whole symbols done instead of a part of each.
+
+        ❚ Required: jobs (list)
+            (method, params) pairs, params being the first positional argument, a tuple of positional arguments or a dict of keyword arguments.
+            For example: jobs=[("company_overview", "IBM"), ("income_statement", "IBM"), ("time_series_daily", {"ticker": "AAPL", "outputsize": "full"})]
+
+        ❚ Optional: max_workers (int)
+            Number of requests in flight at the same time.
+
+        run_jobs(jobs)[0] for the {job key: result}, see job_key. For example: results[client.job_key("company_overview", "IBM")]
+        run_jobs(jobs)[1] for the {job key: exception} of the jobs that failed. A job naming an unknown method or with arguments its method does not accept fails alone, under the key (method, params) since it has no job key.
+        """
+        calls = {}
+        failures = {}
+        for method, params in jobs:
+            try:
+                key = self.job_key(method, params)
+            except (AttributeError, TypeError) as e:
+                failures[(method, self._hashable(params))] = e
+                continue
+            calls.setdefault(key, (method, params))
+
+        groups = {}
+        for key in calls:
+            arguments = dict(key[1])
+            symbol = arguments.get("ticker", arguments.get("symbol"))
+            groups.setdefault(symbol if isinstance(symbol, str) else key, []).append(key)
+        ordered = [key for group in groups.values() for key in group]
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for key in ordered:
+                method, params = calls[key]
+                args, kwargs = self._job_arguments(params)
+                futures[executor.submit(getattr(self, method), *args, **kwargs)] = key
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    failures[key] = e
+        return {key: results[key] for key in ordered if key in results}, failures
+
+
+class AsyncAlphaVantage():
+    def __init__(self, client=None, max_concurrency=8, **kwargs):
+        """
+        asyncio counterpart of AlphaVantage. Every endpoint method of AlphaVantage is available as a coroutine with the same name and arguments, e.g. await client.time_series_daily("IBM"), and every iter_* method as an async generator, e.g. async for df in client.iter_historical_options("IBM").
+        The calls run on a thread pool sharing the pooled session of the synchronous client, and at most max_concurrency requests are in flight at the same time.
+
+        ❚ Optional: client (AlphaVantage)
+            An existing synchronous client to wrap. By default a new one is created with the remaining keyword arguments.
+
+        ❚ Optional: max_concurrency (int)
+            Maximum number of requests in flight at the same time.
+        """
+        if client is None:
+            kwargs.setdefault("pool_size", max_concurrency)
+            client = AlphaVantage(**kwargs)
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="alphavantage")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name) if not name.startswith("_") else None
+        if not callable(method):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        if inspect.isgeneratorfunction(method):
+            call = self._iterate(method)
+        else:
+            async def call(*args, **kwargs):
+                return await self._run(method, *args, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = method.__doc__
+        return call
+
+    def __dir__(self):
+        endpoints = [name for name in dir(self.client) if not name.startswith("_") and callable(getattr(self.client, name))]
+        return sorted(set(super().__dir__()) | set(endpoints))
+
+    def _iterate(self, method):
+        """
+        Async generator counterpart of an iter_* method: every step of the generator, requests included, runs on the thread pool so the event loop is never blocked.
+        """
+        done = object()
+
+        async def iterate(*args, **kwargs):
+            iterator = method(*args, **kwargs)
+            try:
+                while True:
+                    item = await self._run(next, iterator, done)
+                    if item is done:
+                        return
+                    yield item
+            finally:
+                await self._run(iterator.close)
+
+        return iterate
+
+    async def _run(self, method, *args, **kwargs):
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(method, *args, **kwargs))
+
+    def _calls(self, method, calls):
+        """
+        Normalize the calls of the batch helpers: a single value is used as the first positional argument, a tuple as the positional arguments and a dict as the keyword arguments.
+        """
+        func = getattr(self.client, method)
+        for call in calls:
+            if isinstance(call, dict):
+                yield call, partial(func, **call)
+            elif isinstance(call, tuple):
+                yield call, partial(func, *call)
+            else:
+                yield call, partial(func, call)
+
+    async def gather(self, method: str, calls: list, return_exceptions=False):
+        """
+        Run one endpoint for many inputs concurrently and return the results in the order of the inputs.
+
+        ❚ Required: method (str)
+            The name of the endpoint method. For example: method="time_series_daily"
+
+        ❚ Required: calls (list)
+            The inputs of each call. A str is used as the ticker, a tuple as the positional arguments and a dict as the keyword arguments. For example: calls=["IBM", "AAPL"] or calls=[{"ticker": "IBM", "outputsize": "full"}]
+
+        ❚ Optional: return_exceptions (Bool)
+            By default, the first failing call raises. Set return_exceptions=True to get the exception in place of the result instead.
+        """
+        tasks = [self._run(func) for _, func in self._calls(method, calls)]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    async def as_completed(self, method: str, calls: list):
+        """
+        Same as gather but yields (input, result) as soon as each call finishes, so a whole universe can be processed while it is downloading.
+        A failing call yields its exception as the result instead of stopping the stream.
+
+        example : async for ticker, df in client.as_completed("time_series_daily", tickers): ...
+        """
+        async def run(call, func):
+            try:
+                return call, await self._run(func)
+            except Exception as e:
+                return call, e
+
+        tasks = [asyncio.ensure_future(run(call, func)) for call, func in self._calls(method, calls)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def close(self):
+        self._executor.shutdown(wait=False)
+        self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+
+from alphavantage_analytics import parse_calculation, rolling_moments
+
+
+# Every kernel takes (observations x symbols) float64 arrays and the state returned by its previous call, and returns (outputs, state).
+# With state=None the series starts from scratch, with the state of a previous call the new rows extend it in O(new rows).
+# NaN rows (missing bars, symbols listed later) are skipped: they output NaN and leave the state unchanged.
+
+
+def _smooth(values, alpha: float, period: int, state=None):
+    """
+    Exponential smoothing seeded with the simple average of the first period values, like the EMA of the technical indicator endpoints (alpha=2/(period+1)) and the Wilder smoothing of RSI and ATR (alpha=1/period).
+    """
+    n = values.shape[1]
+    if state is None:
+        state = {"count": np.zeros(n, dtype=np.int64), "total": np.zeros(n), "value": np.full(n, np.nan)}
+    count, total, value = state["count"].copy(), state["total"].copy(), state["value"].copy()
+    out = np.full(values.shape, np.nan)
+    for t, row in enumerate(values):
+        valid = ~np.isnan(row)
+        count += valid
+        total += np.where(valid & (count <= period), row, 0.0)
+        smoothed = np.where(count == period, total / period, alpha * row + (1 - alpha) * value)
+        value = np.where(valid & (count >= period), smoothed, value)
+        out[t] = np.where(valid, value, np.nan)
+    return out, {"count": count, "total": total, "value": value}
+
+
+def _windowed(values, period: int, state=None):
+    """
+    Prepend the last period - 1 rows kept in state to values, so the rolling windows of the new rows are complete.
+    """
+    tail = np.empty((0, values.shape[1])) if state is None else state["tail"]
+    values = np.concatenate([tail, values])
+    return values, len(tail), {"tail": values[len(values) - min(len(values), period - 1):]}
+
+
+def _previous(values, state=None):
+    """
+    Last valid value before each row, carried over the NaN rows, and the last valid value of the block.
+    """
+    last = np.full(values.shape[1], np.nan) if state is None else state
+    carried = pd.DataFrame(np.vstack([last, values])).ffill().to_numpy()
+    return carried[:-1], carried[-1]
+
+
+def sma(values, time_period=20, state=None):
+    values, skip, state = _windowed(values, time_period, state)
+    mean, _ = rolling_moments(values, time_period)
+    return {"SMA": mean[skip:]}, state
+
+
+def ema(values, time_period=20, state=None):
+    out, state = _smooth(values, 2 / (time_period + 1), time_period, state)
+    return {"EMA": out}, state
+
+
+def rsi(values, time_period=14, state=None):
+    state = state or {"close": None, "gain": None, "loss": None}
+    previous, close = _previous(values, state["close"])
+    change = np.where(np.isnan(values), np.nan, values - previous)
+    gain, gain_state = _smooth(np.where(change > 0, change, np.where(np.isnan(change), np.nan, 0.0)), 1 / time_period, time_period, state["gain"])
+    loss, loss_state = _smooth(np.where(change < 0, -change, np.where(np.isnan(change), np.nan, 0.0)), 1 / time_period, time_period, state["loss"])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = np.where(loss == 0, 100.0, 100 - 100 / (1 + gain / loss))
+    out[np.isnan(gain)] = np.nan
+    return {"RSI": out}, {"close": close, "gain": gain_state, "loss": loss_state}
+
+
+def macd(values, fastperiod=12, slowperiod=26, signalperiod=9, state=None):
+    state = state or {"fast": None, "slow": None, "signal": None}
+    fast, fast_state = _smooth(values, 2 / (fastperiod + 1), fastperiod, state["fast"])
+    slow, slow_state = _smooth(values, 2 / (slowperiod + 1), slowperiod, state["slow"])
+    line = fast - slow
+    signal, signal_state = _smooth(line, 2 / (signalperiod + 1), signalperiod, state["signal"])
+    outputs = {"MACD": line, "MACD_Signal": signal, "MACD_Hist": line - signal}
+    return outputs, {"fast": fast_state, "slow": slow_state, "signal": signal_state}
+
+
+def bbands(values, time_period=20, nbdevup=2, nbdevdn=2, state=None):
+    values, skip, state = _windowed(values, time_period, state)
+    mean, variance = rolling_moments(values, time_period)
+    mean, deviation = mean[skip:], np.sqrt(variance[skip:])
+    outputs = {"Real Upper Band": mean + nbdevup * deviation, "Real Middle Band": mean, "Real Lower Band": mean - nbdevdn * deviation}
+    return outputs, state
+
+
+def atr(high, low, close, time_period=14, state=None):
+    state = state or {"close": None, "range": None}
+    previous, last = _previous(close, state["close"])
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+    true_range[np.isnan(previous) | np.isnan(close)] = np.nan
+    out, range_state = _smooth(true_range, 1 / time_period, time_period, state["range"])
+    return {"ATR": out}, {"close": last, "range": range_state}
+
+
+# kernel and input fields of each indicator, the fields named series_type being replaced by the series_type parameter
+INDICATORS = {
+    "SMA": (sma, ("series_type",)),
+    "EMA": (ema, ("series_type",)),
+    "RSI": (rsi, ("series_type",)),
+    "MACD": (macd, ("series_type",)),
+    "BBANDS": (bbands, ("series_type",)),
+    "ATR": (atr, ("high", "low", "close")),
+}
+
+
+def _stack_states(states: list):
+    if isinstance(states[0], dict):
+        return {name: _stack_states([state[name] for state in states]) for name in states[0]}
+    return np.concatenate(states, axis=-1)
+
+
+def _column_state(state, j: int):
+    if isinstance(state, dict):
+        return {name: _column_state(value, j) for name, value in state.items()}
+    if state is None:
+        return None
+    return state[..., j:j + 1].copy()
+
+
+class IndicatorEngine():
+    def __init__(self, indicators: list):
+        """
+        Compute technical indicators locally on the bars returned by the time series methods, for many symbols at once, and keep them up to date as new bars arrive.
+        Results and kernel states are cached per (symbol, indicator, parameters): an update only runs the kernels on the bars after the last cached date.
+
+        ❚ Required: indicators (list)
+            SMA, EMA, RSI, MACD, BBANDS and ATR with the parameters of the technical indicator endpoints: time_period, series_type (close by default), fastperiod, slowperiod, signalperiod, nbdevup and nbdevdn.
+            For example: indicators=["SMA(time_period=50)", "EMA(time_period=20, series_type=adjusted_close)", "RSI", "MACD", "BBANDS(nbdevup=2.5)", "ATR"]
+        """
+        self.indicators = {}
+        for indicator in indicators:
+            name, params = parse_calculation(indicator)
+            if name not in INDICATORS:
+                raise ValueError(f"Unknown indicator: {indicator}")
+            series_type = str(params.pop("series_type", "close")).lower()
+            self.indicators[indicator.strip().upper()] = (name, series_type, params)
+        self._cache = {}
+
+    def update(self, frames: dict):
+        """
+        Compute or extend the indicators of every {symbol: frame} and return {symbol: DataFrame} indexed by date with one (indicator, output) column per output.
+        The frames are the typed frames of the time series methods (or of sync_time_series). The symbols whose new bars share the same dates are computed together, one column per symbol.
+        """
+        batches = {}
+        for symbol, frame in frames.items():
+            frame = frame.sort_index()
+            last = self._last_date(symbol)
+            new = frame if last is None else frame[frame.index > last]
+            if len(new):
+                batches.setdefault((new.index.values.tobytes(), last is None), []).append((symbol, new))
+        for batch in batches.values():
+            self._extend(batch)
+        return {symbol: self.frame(symbol) for symbol in frames}
+
+    def _last_date(self, symbol: str):
+        entries = [self._cache.get((symbol, key)) for key in self.indicators]
+        if any(entry is None for entry in entries):
+            return None
+        return entries[0]["dates"][-1] if entries else None
+
+    def _extend(self, batch: list):
+        symbols = [symbol for symbol, _ in batch]
+        dates = batch[0][1].index.values.astype("datetime64[ns]")
+        for key, (name, series_type, params) in self.indicators.items():
+            kernel, fields = INDICATORS[name]
+            fields = [series_type if field == "series_type" else field for field in fields]
+            inputs = [np.column_stack([new[field].to_numpy(dtype=np.float64) for _, new in batch]) for field in fields]
+            entries = [self._cache.get((symbol, key)) for symbol in symbols]
+            state = None if entries[0] is None else _stack_states([entry["state"] for entry in entries])
+            outputs, state = kernel(*inputs, state=state, **params)
+            for j, symbol in enumerate(symbols):
+                entry = self._cache.get((symbol, key))
+                values = {output: array[:, j] for output, array in outputs.items()}
+                if entry is not None:
+                    values = {output: np.concatenate([entry["values"][output], array]) for output, array in values.items()}
+                    dates_j = np.concatenate([entry["dates"], dates])
+                else:
+                    dates_j = dates
+                self._cache[(symbol, key)] = {"dates": dates_j, "values": values, "state": _column_state(state, j)}
+
+    def frame(self, symbol: str):
+        """
+        Return the cached indicators of symbol as a DataFrame indexed by date, with one (indicator, output) column per output.
+        """
+        entries = {key: self._cache[(symbol, key)] for key in self.indicators if (symbol, key) in self._cache}
+        if not entries:
+            return pd.DataFrame()
+        dates = next(iter(entries.values()))["dates"]
+        columns = {(key, output): values for key, entry in entries.items() for output, values in entry["values"].items()}
+        df = pd.DataFrame(columns, index=pd.DatetimeIndex(dates, name="date"))
+        df.columns.names = ["indicator", "output"]
+        return df
+
+    def reset(self, symbol=None):
+        """
+        Drop the cache of symbol, or of every symbol, e.g. after a split rewrote the adjusted history.
+        """
+        for key in [key for key in self._cache if symbol is None or key[0] == symbol]:
+            del self._cache[key]
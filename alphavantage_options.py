@@ -0,0 +1,169 @@
+import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+
+# fields of the options answers converted to float64 and int64 arrays
+FLOAT_FIELDS = ("strike", "last", "mark", "bid", "ask", "implied_volatility", "delta", "gamma", "theta", "vega", "rho")
+INT_FIELDS = ("bid_size", "ask_size", "volume", "open_interest")
+
+CALL, PUT = 0, 1
+
+
+class OptionsChain():
+    def __init__(self, columns: dict):
+        """
+        Options chain stored as typed numpy arrays sorted by (expiration, strike, type), built from the frames of realtime_options and historical_options with OptionsChain.from_frame.
+        expiration is datetime64[ns], strike and the prices/greeks float64, the sizes int64 and type an int8 (CALL=0, PUT=1). Every query is a vectorized mask over these arrays and returns a new OptionsChain.
+        """
+        self.columns = columns
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Build the chain from the object-dtype frame returned by realtime_options or historical_options.
+        """
+        n = len(df)
+        columns = {
+            "contractID": df["contractID"].to_numpy(dtype=object) if "contractID" in df else np.empty(n, dtype=object),
+            "expiration": pd.to_datetime(df["expiration"]).to_numpy(dtype="datetime64[ns]") if n else np.empty(0, dtype="datetime64[ns]"),
+            "type": (df["type"].astype(str).str.lower() == "put").to_numpy(dtype=np.int8) if n else np.empty(0, dtype=np.int8),
+        }
+        for name in FLOAT_FIELDS:
+            columns[name] = pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64) if name in df else np.full(n, np.nan)
+        for name in INT_FIELDS:
+            if name in df:
+                columns[name] = pd.to_numeric(df[name], errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+        if "date" in df and n:
+            columns["date"] = pd.to_datetime(df["date"]).to_numpy(dtype="datetime64[ns]")
+
+        order = np.lexsort((columns["type"], columns["strike"], columns["expiration"]))
+        return cls({name: values[order] for name, values in columns.items()})
+
+    def __len__(self):
+        return len(self.columns["strike"])
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    def _take(self, selection):
+        return OptionsChain({name: values[selection] for name, values in self.columns.items()})
+
+    def expirations(self):
+        return np.unique(self.columns["expiration"])
+
+    def expiration(self, date):
+        """
+        Return the contracts expiring on date.
+        """
+        expiration = np.datetime64(pd.Timestamp(date), "ns")
+        first = np.searchsorted(self.columns["expiration"], expiration, side="left")
+        last = np.searchsorted(self.columns["expiration"], expiration, side="right")
+        return self._take(slice(int(first), int(last)))
+
+    def nearest_expiration(self, date):
+        """
+        Return the contracts of the first expiration on or after date.
+        """
+        expirations = self.expirations()
+        i = np.searchsorted(expirations, np.datetime64(pd.Timestamp(date), "ns"))
+        if i == len(expirations):
+            return self._take(slice(0, 0))
+        return self.expiration(expirations[i])
+
+    def calls(self):
+        return self._take(self.columns["type"] == CALL)
+
+    def puts(self):
+        return self._take(self.columns["type"] == PUT)
+
+    def strike_range(self, low=-np.inf, high=np.inf):
+        strike = self.columns["strike"]
+        return self._take((strike >= low) & (strike <= high))
+
+    def delta_range(self, low=-1.0, high=1.0):
+        """
+        Return the contracts whose delta is between low and high, e.g. delta_range(0.25, 0.5) for the out of the money calls up to at the money.
+        """
+        delta = self.columns["delta"]
+        return self._take((delta >= low) & (delta <= high))
+
+    def nearest_atm(self, spot: float, n=1):
+        """
+        Return, for every expiration, the calls and puts of the n strikes closest to spot.
+        """
+        if len(self) == 0:
+            return self._take(slice(0, 0))
+        expiration = self.columns["expiration"]
+        strike = self.columns["strike"]
+        # one entry per distinct (expiration, strike), ranked by distance to spot within its expiration
+        new_expiration = np.r_[True, expiration[1:] != expiration[:-1]]
+        new_strike = new_expiration | np.r_[True, strike[1:] != strike[:-1]]
+        distinct = np.flatnonzero(new_strike)
+        group = np.cumsum(new_expiration)[distinct]
+        order = np.lexsort((np.abs(strike[distinct] - spot), group))
+        rank = np.empty(len(distinct), dtype=np.int64)
+        rank[order] = np.arange(len(order)) - np.searchsorted(group[order], group[order])
+        keep = rank[np.cumsum(new_strike) - 1] < n
+        return self._take(keep)
+
+    def frame(self):
+        """
+        Return the chain as a DataFrame indexed by (expiration, strike, type), type being "call" or "put".
+        """
+        columns = dict(self.columns)
+        index = pd.MultiIndex.from_arrays(
+            [columns.pop("expiration"), columns.pop("strike"), np.where(columns.pop("type") == PUT, "put", "call")],
+            names=["expiration", "strike", "type"],
+        )
+        return pd.DataFrame(columns, index=index)
+
+
+def historical_chains(client, ticker: str, start_date: str, end_date: str, store=None, max_workers=8):
+    """
+    Fetch the historical options chains of ticker for every business day between start_date and end_date concurrently, within the rate limit of the client.
+    Chains are immutable once the session is over, so with a store each past session that returned contracts is written once as a typed frame and never fetched again. Today, later dates and empty answers (holidays, dates not published yet) are fetched again on every call.
+
+    ❚ Required: client (AlphaVantage)
+        The client used to call historical_options.
+
+    ❚ Required: start_date and end_date (str)
+        The first and last dates, in YYYY-MM-DD format.
+
+    ❚ Optional: store (PartitionedStore)
+        The on-disk cache of the chains, one partition per date, see alphavantage_storage.PartitionedStore.
+
+    ❚ Optional: max_workers (int)
+        Number of requests in flight at the same time.
+
+    historical_chains(...)[0] for the {date: OptionsChain} of the dates fetched or cached, empty chains (holidays) included
+    historical_chains(...)[1] for the {date: exception} of the dates that failed
+    """
+    dates = pd.bdate_range(start_date, end_date).strftime("%Y-%m-%d")
+    chains = {}
+    missing = []
+    for date in dates:
+        if store is not None and store.exists("historical_options", ticker, date):
+            chains[date] = OptionsChain.from_frame(store.load("historical_options", ticker, [date]).reset_index())
+        else:
+            missing.append(date)
+
+    today = datetime.date.today().isoformat()
+
+    def fetch(date):
+        chain = OptionsChain.from_frame(client.historical_options(ticker, date))
+        if store is not None and date < today and len(chain):
+            store.save("historical_options", ticker, date, chain.frame())
+        return chain
+
+    failures = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch, date): date for date in missing}
+        for future in as_completed(futures):
+            try:
+                chains[futures[future]] = future.result()
+            except Exception as e:
+                failures[futures[future]] = e
+    return {date: chains[date] for date in dates if date in chains}, failures
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from alphavantage_api import CRYPTO_FIELDS, OHLC_FIELDS, OHLCV_FIELDS, PERIOD_ADJUSTED_FIELDS
+
+
+# how each field of the time series frames is aggregated over a period, the other fields keep their last value
+FIELD_AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "adjusted_close": "last",
+    "volume": "sum",
+    "dividend_amount": "sum",
+    "split_coefficient": "prod",
+}
+
+# pandas period of the calendar periods, weeks running from Monday to Sunday
+PERIODS = {"weekly": "W-SUN", "monthly": "M", "quarterly": "Q", "yearly": "Y"}
+
+# weekly and monthly methods derived from a daily method: (daily method and its arguments, period, fields of the answer)
+DERIVED_SERIES = {
+    "time_series_weekly": ("time_series_daily", {"outputsize": "full"}, "weekly", OHLCV_FIELDS),
+    "time_series_weekly_adjusted": ("time_series_daily_adjusted", {"outputsize": "full"}, "weekly", PERIOD_ADJUSTED_FIELDS),
+    "time_series_monthly": ("time_series_daily", {"outputsize": "full"}, "monthly", OHLCV_FIELDS),
+    "time_series_monthly_adjusted": ("time_series_daily_adjusted", {"outputsize": "full"}, "monthly", PERIOD_ADJUSTED_FIELDS),
+    "FX_weekly": ("FX_daily", {"outputsize": "full"}, "weekly", OHLC_FIELDS),
+    "FX_monthly": ("FX_daily", {"outputsize": "full"}, "monthly", OHLC_FIELDS),
+    "digital_currency_weekly": ("digital_currency_daily", {}, "weekly", CRYPTO_FIELDS),
+    "digital_currency_monthly": ("digital_currency_daily", {}, "monthly", CRYPTO_FIELDS),
+}
+
+
+def _fixed_step(period: str):
+    """
+    Length in nanoseconds of a fixed period such as 5min or 2h, or None for a calendar period.
+    """
+    if period in PERIODS:
+        return None
+    try:
+        return pd.Timedelta(period).value
+    except ValueError:
+        return None
+
+
+def _accumulate(how: str, values, starts):
+    """
+    Sum or product of values over the periods beginning at starts, accumulated in 64 bits so the compact uint32 volumes cannot wrap around.
+    Integer results go back to the dtype of values when they fit in it, float32 results stay float32.
+    """
+    if values.dtype.kind == "u":
+        wide = np.uint64
+    elif values.dtype.kind in "ib":
+        wide = np.int64
+    else:
+        wide = np.float64
+    reduce = np.add if how == "sum" else np.multiply
+    result = reduce.reduceat(values.astype(wide, copy=False), starts)
+    if values.dtype.kind in "ui":
+        limits = np.iinfo(values.dtype)
+        if len(result) == 0 or (result.min() >= limits.min and result.max() <= limits.max):
+            return result.astype(values.dtype)
+        return result
+    return result.astype(values.dtype, copy=False)
+
+
+def resample_bars(df, period: str):
+    """
+    Aggregate the bars of a time series frame (indexed by date, sorted or not) into longer bars, following the conventions of the AlphaVantage series.
+
+    ❚ Required: period (str)
+        weekly, monthly, quarterly or yearly: each bar is labeled with the last date it contains, i.e. the last trading day of the week or month like time_series_weekly and time_series_monthly, the current period being a partial bar.
+        A fixed length such as 5min, 15min, 30min, 60min or 2h: intraday bars aligned on midnight, each labeled with the start of its interval like time_series_intraday.
+        Any other pandas period, e.g. W-WED for weeks ending on Wednesday, labeled like the calendar periods.
+
+    open is the first open, high the highest high, low the lowest low, close and adjusted_close the last values, volume and dividend_amount the sums and split_coefficient the product over the period (see FIELD_AGGREGATIONS).
+    """
+    df = df.sort_index()
+    if not len(df):
+        return df
+    step = _fixed_step(period)
+    if step is not None:
+        codes = df.index.values.astype("datetime64[ns]").view(np.int64) // step
+    else:
+        codes = df.index.to_period(PERIODS.get(period, period)).asi8
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)]
+    if step is not None:
+        labels = (codes[starts] * step).astype("datetime64[ns]")
+    else:
+        labels = df.index.values[ends - 1]
+
+    columns = {}
+    for name in df.columns:
+        how = FIELD_AGGREGATIONS.get(name, "last")
+        column = df[name]
+        if how == "first":
+            columns[name] = column.take(starts).to_numpy()
+        elif how == "last":
+            columns[name] = column.take(ends - 1).to_numpy()
+        elif how in ("sum", "prod"):
+            columns[name] = _accumulate(how, column.to_numpy(), starts)
+        else:
+            reduce = {"max": np.fmax, "min": np.fmin}[how]
+            columns[name] = reduce.reduceat(column.to_numpy(), starts)
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(labels, name=df.index.name or "date"), copy=False)
+
+
+def derived_series(client, method: str, *args, **kwargs):
+    """
+    Build locally the answer of a weekly or monthly method from the daily series of client (and so from its caches), one daily download serving the daily, weekly and monthly views.
+    For example: derived_series(client, "time_series_weekly_adjusted", "IBM") or derived_series(client, "FX_monthly", "EUR", "USD")
+    The bars are returned latest first like the answers. The methods and their daily sources are listed in DERIVED_SERIES, the other keyword arguments are passed to the daily method.
+    """
+    source, source_kwargs, period, fields = DERIVED_SERIES[method]
+    df = getattr(client, source)(*args, **{**source_kwargs, **kwargs})
+    bars = resample_bars(df, period)
+    return bars[[name for name in fields if name in bars.columns]].iloc[::-1]
@@ -0,0 +1,338 @@
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+def write_pickle(df, path: str):
+    """
+    Write df to path through a temporary file renamed at the end, so a crash never leaves a truncated file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        df.to_pickle(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+class SeriesStore():
+    def __init__(self, directory="alphavantage_store"):
+        """
+        Local store of the time series already downloaded, one pickle file per (function, symbol) under directory/function/symbol.pkl.
+        The frames are kept sorted by date, so the last stored date of a series is its last row.
+
+        ❚ Optional: directory (str)
+            Root directory of the store, created if it does not exist.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, function: str, symbol: str):
+        return os.path.join(self.directory, function, f"{symbol}.pkl")
+
+    def load(self, function: str, symbol: str):
+        """
+        Return the stored frame of (function, symbol), or None if nothing is stored yet.
+        """
+        path = self.path(function, symbol)
+        if not os.path.exists(path):
+            return None
+        return pd.read_pickle(path)
+
+    def save(self, function: str, symbol: str, df):
+        """
+        Replace the stored frame of (function, symbol).
+        """
+        write_pickle(df, self.path(function, symbol))
+
+    def last_date(self, function: str, symbol: str):
+        df = self.load(function, symbol)
+        if df is None or not len(df):
+            return None
+        return df.index[-1]
+
+    def symbols(self, function: str):
+        directory = os.path.join(self.directory, function)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith(".pkl"))
+
+
+class PartitionedStore():
+    def __init__(self, directory="alphavantage_partitions"):
+        """
+        Local store of series split in partitions, one pickle file per (function, symbol, partition) under directory/function/symbol=SYMBOL/partition.pkl.
+        Used by the intraday backfill with one partition per month, an existing partition doubles as the checkpoint of a resumed backfill.
+
+        ❚ Optional: directory (str)
+            Root directory of the store, created if it does not exist.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, function: str, symbol: str, partition: str):
+        return os.path.join(self.directory, function, f"symbol={symbol}", f"{partition}.pkl")
+
+    def exists(self, function: str, symbol: str, partition: str):
+        return os.path.exists(self.path(function, symbol, partition))
+
+    def save(self, function: str, symbol: str, partition: str, df):
+        write_pickle(df, self.path(function, symbol, partition))
+
+    def partitions(self, function: str, symbol: str):
+        directory = os.path.join(self.directory, function, f"symbol={symbol}")
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith(".pkl"))
+
+    def iter_partitions(self, function: str, symbol: str, partitions=None):
+        """
+        Yield (partition, frame) one partition at a time, so a long history can be processed without loading it whole.
+        """
+        for partition in partitions or self.partitions(function, symbol):
+            yield partition, pd.read_pickle(self.path(function, symbol, partition))
+
+    def load(self, function: str, symbol: str, partitions=None):
+        """
+        Return the stored partitions of (function, symbol) concatenated and sorted by date, or None if nothing is stored.
+        """
+        frames = [df for _, df in self.iter_partitions(function, symbol, partitions)]
+        if not frames:
+            return None
+        return pd.concat(frames).sort_index()
+
+
+class DataLake():
+    def __init__(self, root="alphavantage_lake"):
+        """
+        Columnar store of the frames returned by the time series, FX, crypto, commodity and economic functions, written as a Parquet dataset partitioned by function, symbol and year:
+        root/function=FUNCTION/symbol=SYMBOL/year=YEAR/part-0.parquet
+        Reads push the date range and the column subset down to Arrow, so only the matching partitions, row groups and columns are read.
+        Requires pyarrow.
+
+        ❚ Optional: root (str)
+            Root directory of the dataset, created if it does not exist.
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _directory(self, function: str):
+        return os.path.join(self.root, f"function={function}")
+
+    def _partitioning(self):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        return ds.partitioning(pa.schema([("symbol", pa.string()), ("year", pa.int32())]), flavor="hive")
+
+    def write(self, df, function: str, symbol: str, merge=True):
+        """
+        Store df as the (function, symbol) series. df is indexed by date, like the time series frames, or has a date column, like the commodity and economic frames.
+
+        ❚ Required: function (str)
+            The name of the series, usually the method that produced it. For example: function=time_series_daily
+
+        ❚ Required: symbol (str)
+            The symbol of the series. For example: symbol=IBM, symbol=EURUSD or symbol=US for an economic indicator.
+
+        ❚ Optional: merge (Bool)
+            By default, merge=True and the rows of df are merged with the rows already stored for the years it covers, the new rows winning on duplicated dates. Set merge=False to replace those years with df.
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        if "date" in df.columns:
+            df = df.set_index("date")
+        df = df.drop(columns=[name for name in ("symbol", "year") if name in df.columns])
+        df.index = pd.DatetimeIndex(pd.to_datetime(df.index), name="date").astype("datetime64[ns]")
+        if "value" in df.columns and not pd.api.types.is_numeric_dtype(df["value"]):
+            df["value"] = pd.to_numeric(df["value"], errors="coerce")
+
+        years = sorted(set(df.index.year))
+        if merge and years:
+            stored = self.read(function, symbol, start=f"{years[0]}-01-01", end=f"{years[-1]}-12-31 23:59:59")
+            if stored is not None and len(stored):
+                stored = stored.set_index("date").drop(columns="symbol")
+                stored = stored[stored.index.year.isin(years)]
+                df = pd.concat([stored, df])
+                df = df[~df.index.duplicated(keep="last")]
+
+        df = df.sort_index().reset_index()
+        df["symbol"] = symbol
+        df["year"] = df["date"].dt.year.astype("int32")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        ds.write_dataset(
+            table,
+            self._directory(function),
+            format="parquet",
+            partitioning=self._partitioning(),
+            basename_template="part-{i}.parquet",
+            existing_data_behavior="delete_matching",
+        )
+
+    def read(self, function: str, symbols=None, start=None, end=None, columns=None):
+        """
+        Read the stored rows of function as a long frame with date and symbol columns, or None if nothing is stored.
+
+        ❚ Optional: symbols (str or list)
+            The symbols to read. By default every stored symbol is read.
+
+        ❚ Optional: start and end (str)
+            The first and last dates to read, inclusive. For example: start=2020-01-01, end=2020-12-31
+
+        ❚ Optional: columns (list)
+            The fields to read. For example: columns=["close", "volume"]. By default every field is read.
+        """
+        import pyarrow.dataset as ds
+
+        directory = self._directory(function)
+        if not os.path.isdir(directory):
+            return None
+        dataset = ds.dataset(directory, format="parquet", partitioning=self._partitioning())
+
+        condition = None
+        if symbols is not None:
+            symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+            condition = ds.field("symbol").isin(symbols)
+        if start is not None:
+            start = pd.Timestamp(start)
+            condition = self._and(condition, (ds.field("year") >= start.year) & (ds.field("date") >= start.to_datetime64()))
+        if end is not None:
+            end = pd.Timestamp(end)
+            condition = self._and(condition, (ds.field("year") <= end.year) & (ds.field("date") <= end.to_datetime64()))
+        if columns is not None:
+            columns = ["date", "symbol"] + [name for name in columns if name not in ("date", "symbol")]
+
+        df = dataset.to_table(columns=columns, filter=condition).to_pandas()
+        df = df[["date", "symbol"] + [name for name in df.columns if name not in ("date", "symbol", "year")]]
+        return df.sort_values(["symbol", "date"], kind="stable").reset_index(drop=True)
+
+    @staticmethod
+    def _and(condition, other):
+        return other if condition is None else condition & other
+
+    def symbols(self, function: str):
+        directory = self._directory(function)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name.split("=", 1)[1] for name in os.listdir(directory) if name.startswith("symbol="))
+
+
+class MmapBars():
+    def __init__(self, dates, values, fields):
+        """
+        Read-only bars of one symbol backed by memory-mapped files. Every accessor returns numpy views of the mapped pages, nothing is copied, and processes opening the same files share them through the OS cache.
+        Bars are sorted by date: bars.dates[i] and bars["close"][i] are O(1) accesses by offset, bars.offset(date) finds the offset of a date by binary search.
+        """
+        self.dates = dates
+        self.values = values
+        self.fields = fields
+        self._rows = {name: i for i, name in enumerate(fields)}
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __getitem__(self, field: str):
+        return self.values[self._rows[field]]
+
+    def offset(self, date):
+        """
+        Return the offset of the first bar at or after date.
+        """
+        return int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(date), "ns")))
+
+    def window(self, start=None, end=None):
+        """
+        Return the bars between start and end (inclusive) as a new MmapBars made of views.
+        """
+        first = 0 if start is None else self.offset(start)
+        last = len(self) if end is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end), "ns"), side="right"))
+        return MmapBars(self.dates[first:last], self.values[:, first:last], self.fields)
+
+    def to_frame(self):
+        """
+        Copy the bars into a DataFrame indexed by date.
+        """
+        index = pd.DatetimeIndex(np.asarray(self.dates), name="date")
+        return pd.DataFrame(np.asarray(self.values).T, index=index, columns=self.fields)
+
+
+class BarStore():
+    def __init__(self, directory="alphavantage_bars"):
+        """
+        Fixed-width on-disk format for the OHLCV bars of time_series_daily, time_series_intraday and the other time series functions, read back through memory maps.
+        Each (function, symbol) is stored under directory/function/ as a version directory SYMBOL.XXXX.bars holding dates.npy (int64 nanosecond timestamps) and values.npy (a float64 array with one contiguous row per field), and SYMBOL.json naming the current version and its fields.
+        A write creates a new version and swaps SYMBOL.json atomically, so a reader always maps the dates and values of the same version, and the bars already mapped by another process stay valid.
+
+        ❚ Optional: directory (str)
+            Root directory of the store, created if it does not exist.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, function: str, symbol: str, suffix: str):
+        return os.path.join(self.directory, function, f"{symbol}.{suffix}")
+
+    def write(self, df, function: str, symbol: str):
+        """
+        Store the bars of df, a frame indexed by date with numeric columns, sorted by date.
+        """
+        df = df.sort_index()
+        fields = [str(name) for name in df.columns]
+        dates = np.asarray(df.index.values, dtype="datetime64[ns]")
+        values = np.ascontiguousarray(df.to_numpy(dtype=np.float64).T)
+
+        directory = os.path.join(self.directory, function)
+        os.makedirs(directory, exist_ok=True)
+        previous = self._version(function, symbol)
+        version = tempfile.mkdtemp(dir=directory, prefix=f"{symbol}.", suffix=".bars")
+        try:
+            np.save(os.path.join(version, "dates.npy"), dates)
+            np.save(os.path.join(version, "values.npy"), values)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"fields": fields, "version": os.path.basename(version)}, f)
+            os.replace(tmp, self._path(function, symbol, "json"))
+        except BaseException:
+            shutil.rmtree(version, ignore_errors=True)
+            raise
+        if previous is not None:
+            shutil.rmtree(os.path.join(directory, previous), ignore_errors=True)
+
+    def _version(self, function: str, symbol: str):
+        try:
+            with open(self._path(function, symbol, "json")) as f:
+                return json.load(f).get("version")
+        except FileNotFoundError:
+            return None
+
+    def open(self, function: str, symbol: str):
+        """
+        Memory-map the stored bars of (function, symbol) and return them as MmapBars.
+        """
+        for attempt in range(3):
+            with open(self._path(function, symbol, "json")) as f:
+                meta = json.load(f)
+            version = os.path.join(self.directory, function, meta["version"])
+            try:
+                dates = np.load(os.path.join(version, "dates.npy"), mmap_mode="r")
+                values = np.load(os.path.join(version, "values.npy"), mmap_mode="r")
+            except FileNotFoundError:
+                # a writer replaced this version between the two reads, the pointer now names the new one
+                if attempt == 2:
+                    raise
+                continue
+            return MmapBars(dates, values, meta["fields"])
+
+    def symbols(self, function: str):
+        directory = os.path.join(self.directory, function)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-5] for name in os.listdir(directory) if name.endswith(".json"))
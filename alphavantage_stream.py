@@ -0,0 +1,340 @@
+import asyncio
+import math
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from alphavantage_api import BULK_QUOTES_SIZE, RateLimitError
+
+
+_NUMBERED_KEY = re.compile(r"^\d+\.\s*")
+
+
+def _quote_record(quote: dict):
+    """
+    Normalize a quote of GLOBAL_QUOTE ({"01. symbol": ..., "05. price": ...}) or REALTIME_BULK_QUOTES to plain snake_case keys.
+    """
+    return {_NUMBERED_KEY.sub("", key).replace(" ", "_"): value for key, value in quote.items()}
+
+
+def _value(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+class QuoteStream():
+    def __init__(self, client, tickers: list, interval=None, bulk=True, fields=None, max_workers=8, history=1000):
+        """
+        Poll the quotes of tickers at a fixed cadence and emit only the quotes that changed since the previous cycle, through a callback (run) or an async iterator (async for records in stream).
+
+        ❚ Required: client (AlphaVantage)
+            The client used to poll, its rate limiter paces the requests.
+
+        ❚ Required: tickers (list)
+            The symbols to follow.
+
+        ❚ Optional: interval (float)
+            Seconds between the start of two cycles. It is raised to min_interval, the shortest cadence the rate limit of the key sustains. By default the stream runs at min_interval.
+
+        ❚ Optional: bulk (Bool)
+            By default, bulk=True and every cycle sends one REALTIME_BULK_QUOTES request per 100 symbols (premium). Set bulk=False to poll quote_endpoint once per symbol instead.
+
+        ❚ Optional: fields (list)
+            The fields compared between cycles. For example: fields=["close", "volume"]. By default every field is compared.
+
+        A record is a dict with the symbol and the fields that changed, numbers converted to float, e.g. {"symbol": "IBM", "close": 187.3, "timestamp": "2024-01-02 15:59:00"}. The first cycle emits every quote.
+        The metrics of the last cycles are in stream.metrics: start time, fetch and diff latencies, number of requests, quotes received and quotes changed, the missing symbols and the {symbol: exception} of the failed requests (bulk=False, a failed bulk request raises).
+        """
+        self.client = client
+        self.tickers = list(dict.fromkeys(tickers))
+        self.bulk = bulk
+        self.fields = fields
+        self.max_workers = max_workers
+        self.interval = max(interval or 0, self.min_interval)
+        self.metrics = deque(maxlen=history)
+        self._snapshot = {}
+        self._stop = threading.Event()
+
+    @property
+    def requests_per_cycle(self):
+        return math.ceil(len(self.tickers) / BULK_QUOTES_SIZE) if self.bulk else len(self.tickers)
+
+    @property
+    def min_interval(self):
+        limiter = self.client.rate_limiter
+        return 0.0 if limiter is None else self.requests_per_cycle * limiter.interval
+
+    def _fetch(self):
+        """
+        Return the rows of the cycle and the {symbol: exception} of the symbols whose quote_endpoint call failed (bulk=False).
+        A RateLimitError is raised instead of being recorded, the key cannot serve the next cycles either.
+        """
+        if self.bulk:
+            answers = self.client._bulk_quotes(self.tickers, self.max_workers)
+            return [row for answer in answers for row in answer.get("data", [])], {}
+
+        quotes = {}
+        errors = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.client.quote_endpoint, ticker): ticker for ticker in self.tickers}
+            for future in as_completed(futures):
+                try:
+                    quotes[futures[future]] = future.result().get("Global Quote")
+                except RateLimitError:
+                    raise
+                except Exception as e:
+                    errors[futures[future]] = e
+        return [_quote_record(quotes[ticker]) for ticker in self.tickers if quotes.get(ticker)], errors
+
+    def poll(self):
+        """
+        Run one cycle: fetch the quotes, compare them with the previous snapshot and return the records of the quotes that changed.
+        """
+        started = time.time()
+        start = time.perf_counter()
+        rows, errors = self._fetch()
+        fetched = time.perf_counter()
+
+        records = []
+        seen = set()
+        for row in rows:
+            symbol = row.get("symbol")
+            seen.add(symbol)
+            current = row if self.fields is None else {name: row.get(name) for name in self.fields}
+            previous = self._snapshot.get(symbol)
+            if previous == current:
+                continue
+            self._snapshot[symbol] = current
+            changed = current if previous is None else {name: value for name, value in current.items() if previous.get(name) != value}
+            record = {"symbol": symbol}
+            record.update((name, _value(value)) for name, value in changed.items() if name != "symbol")
+            records.append(record)
+
+        self.metrics.append({
+            "started": started,
+            "fetch": fetched - start,
+            "diff": time.perf_counter() - fetched,
+            "requests": self.requests_per_cycle,
+            "received": len(rows),
+            "changed": len(records),
+            "missing": [ticker for ticker in self.tickers if ticker not in seen],
+            "errors": errors,
+        })
+        return records
+
+    def run(self, callback, cycles=None):
+        """
+        Poll until stop is called (or for cycles cycles) and call callback(records) after every cycle with changes.
+        Cycles start every interval seconds, a slow cycle delays the next one instead of overlapping it.
+        """
+        self._stop.clear()
+        count = 0
+        while not self._stop.is_set() and (cycles is None or count < cycles):
+            start = time.monotonic()
+            records = self.poll()
+            count += 1
+            if records:
+                callback(records)
+            if cycles is None or count < cycles:
+                self._stop.wait(max(self.interval - (time.monotonic() - start), 0))
+
+    def stop(self):
+        self._stop.set()
+
+    async def stream(self, cycles=None):
+        """
+        Same as run as an async generator yielding the records of every cycle with changes, the requests running on a thread.
+
+        example : async for records in QuoteStream(client, tickers): ...
+        """
+        self._stop.clear()
+        loop = asyncio.get_running_loop()
+        count = 0
+        while not self._stop.is_set() and (cycles is None or count < cycles):
+            start = time.monotonic()
+            records = await loop.run_in_executor(None, self.poll)
+            count += 1
+            if records:
+                yield records
+            if cycles is None or count < cycles:
+                await asyncio.sleep(max(self.interval - (time.monotonic() - start), 0))
+
+    def __aiter__(self):
+        return self.stream()
+
+
+class BarRing():
+    def __init__(self, fields: list, capacity=1000):
+        """
+        Fixed-size ring buffer of the last capacity bars of one symbol: a datetime64[ns] array of times and a float64 (field x bar) array of values.
+        Every bar is written twice, at its position and capacity further, so the last n bars are always contiguous and last(n) returns views without copying.
+        """
+        self.fields = list(fields)
+        self.capacity = capacity
+        self.times = np.zeros(2 * capacity, dtype="datetime64[ns]")
+        self.values = np.full((len(self.fields), 2 * capacity), np.nan)
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    @property
+    def last_time(self):
+        return self.times[(self.count - 1) % self.capacity] if self.count else None
+
+    def append(self, times, rows):
+        """
+        Append bars, times sorted and rows a (bar x field) array, the oldest bars being overwritten once the buffer is full.
+        """
+        times, rows = times[-self.capacity:], rows[-self.capacity:]
+        positions = (self.count + np.arange(len(times))) % self.capacity
+        for offset in (0, self.capacity):
+            self.times[positions + offset] = times
+            self.values[:, positions + offset] = rows.T
+        self.count += len(times)
+
+    def replace_last(self, row):
+        position = (self.count - 1) % self.capacity
+        self.values[:, position] = self.values[:, position + self.capacity] = row
+
+    def last(self, n=None):
+        """
+        Return (times, values) views of the last n bars (all of them by default), values being (field x bar). The views are read-only and change when bars are added.
+        """
+        n = len(self) if n is None else min(n, len(self))
+        end = (self.count - 1) % self.capacity + self.capacity + 1 if self.count else 0
+        times, values = self.times[end - n:end], self.values[:, end - n:end]
+        times.flags.writeable = values.flags.writeable = False
+        return times, values
+
+
+class LiveBars():
+    def __init__(self, client, interval=1, capacity=1000, fields=("open", "high", "low", "close", "volume"), store=None, on_close=None, max_workers=8, **kwargs):
+        """
+        Keep the latest intraday bars of many symbols up to date in memory from the compact answers of time_series_intraday, one BarRing per symbol.
+        Each refresh only writes what changed: the bars after the last one held are appended and the last bar, which may still be forming, is overwritten.
+
+        ❚ Required: client (AlphaVantage)
+            The client used to call time_series_intraday.
+
+        ❚ Optional: interval (int)
+            1, 5, 15, 30 or 60 minutes.
+
+        ❚ Optional: capacity (int)
+            Number of bars kept per symbol.
+
+        ❚ Optional: store (PartitionedStore)
+            Where the closed bars are persisted, one partition per (symbol, day) under the function time_series_intraday_{interval}min.
+
+        ❚ Optional: on_close (function)
+            Called as on_close(symbol, df) with the frame of the bars that closed during a refresh. A bar is closed once a later bar exists.
+
+        The other keyword arguments are passed to time_series_intraday, for example extended_hours=False.
+        """
+        self.client = client
+        self.interval = interval
+        self.capacity = capacity
+        self.fields = list(fields)
+        self.store = store
+        self.on_close = on_close
+        self.max_workers = max_workers
+        self.kwargs = kwargs
+        self.rings = {}
+        self.gaps = {}
+        self._closed = {}
+
+    def merge(self, symbol: str, df):
+        """
+        Merge the bars of df (a time series frame in any order) into the ring of symbol and return the number of new bars.
+        When the oldest bar of df is already after the last bar held, the bars in between are missing and gaps[symbol] is incremented.
+        """
+        ring = self.rings.get(symbol)
+        if ring is None:
+            ring = self.rings[symbol] = BarRing(self.fields, self.capacity)
+        times = df.index.values.astype("datetime64[ns]")
+        order = np.argsort(times, kind="stable")
+        times = times[order]
+        rows = df[self.fields].to_numpy(dtype=np.float64)[order]
+
+        first = 0
+        last = ring.last_time
+        if last is not None:
+            first = int(np.searchsorted(times, last))
+            if first < len(times) and times[first] == last:
+                ring.replace_last(rows[first])
+                first += 1
+            elif first == 0 and len(times):
+                self.gaps[symbol] = self.gaps.get(symbol, 0) + 1
+        ring.append(times[first:], rows[first:])
+        self._emit_closed(symbol, ring)
+        return len(times) - first
+
+    def _emit_closed(self, symbol: str, ring):
+        if self.store is None and self.on_close is None:
+            return
+        times, values = ring.last()
+        closed = self._closed.get(symbol)
+        start = 0 if closed is None else int(np.searchsorted(times, closed, side="right"))
+        end = len(times) - 1
+        if end <= start:
+            return
+        self._closed[symbol] = times[end - 1]
+        df = pd.DataFrame(values[:, start:end].T, index=pd.DatetimeIndex(times[start:end], name="date"), columns=self.fields)
+        if self.on_close is not None:
+            self.on_close(symbol, df)
+        if self.store is not None:
+            function = f"time_series_intraday_{self.interval}min"
+            for day, bars in df.groupby(df.index.normalize()):
+                partition = str(day.date())
+                stored = self.store.load(function, symbol, [partition]) if self.store.exists(function, symbol, partition) else None
+                if stored is not None:
+                    bars = pd.concat([stored, bars])
+                    bars = bars[~bars.index.duplicated(keep="last")].sort_index()
+                self.store.save(function, symbol, partition, bars)
+
+    def refresh(self, symbols=None):
+        """
+        Fetch the compact intraday answer of every symbol (by default the symbols already followed) concurrently and merge it.
+
+        refresh(...)[0] for the {symbol: number of new bars}
+        refresh(...)[1] for the {symbol: exception} of the symbols that failed
+        """
+        symbols = list(self.rings) if symbols is None else list(dict.fromkeys(symbols))
+        added = {}
+        failures = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.client.time_series_intraday, symbol, self.interval, outputsize="compact", **self.kwargs): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    added[symbol] = self.merge(symbol, future.result())
+                except Exception as e:
+                    failures[symbol] = e
+        return added, failures
+
+    def last(self, symbol: str, n=None, field=None):
+        """
+        Return the views (times, values) of the last n bars of symbol, values being (field x bar), or only the view of field.
+        For example: times, values = bars.last("IBM", 30) or closes = bars.last("IBM", 30, "close")
+        """
+        times, values = self.rings[symbol].last(n)
+        if field is not None:
+            return values[self.fields.index(field)]
+        return times, values
+
+    def frame(self, symbol: str, n=None):
+        """
+        Copy the last n bars of symbol into a DataFrame indexed by date.
+        """
+        times, values = self.rings[symbol].last(n)
+        return pd.DataFrame(values.T.copy(), index=pd.DatetimeIndex(times.copy(), name="date"), columns=self.fields)
@@ -0,0 +1,94 @@
+"""
+Memory of the frames of a full intraday month at 1min, as the plain string rows of the original client, as the typed frames of compact=False and as the compact frames of compact=True.
+
+usage: python bench/bench_compact_memory.py [--tickers 50] [--days 21]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alphavantage_api import OHLCV_FIELDS, long_frame, time_series_frame  # noqa: E402
+
+
+def intraday_month(days, seed):
+    """
+    {time: values} of a month of 1min bars over the extended hours (4:00 to 20:00), latest first like the answers.
+    """
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2024-01-02T04:00")
+    minutes = np.arange(16 * 60)
+    times = np.concatenate([start + np.timedelta64(day, "D") + minutes.astype("timedelta64[m]") for day in range(days)])
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, len(times))))
+    volume = rng.integers(100, 50000, len(times))
+    series = {}
+    for i in range(len(times) - 1, -1, -1):
+        series[str(times[i]).replace("T", " ") + ":00"] = {
+            "1. open": f"{close[i - 1] if i else close[i]:.4f}",
+            "2. high": f"{close[i] * 1.001:.4f}",
+            "3. low": f"{close[i] * 0.999:.4f}",
+            "4. close": f"{close[i]:.4f}",
+            "5. volume": str(volume[i]),
+        }
+    return series
+
+
+def string_rows(series, ticker):
+    """
+    The frame of the original client: one dict of strings per bar, held as Python str objects (pandas 3 would otherwise store them as arrow strings).
+    """
+    rows = [{"date": date, "open": v["1. open"], "high": v["2. high"], "low": v["3. low"], "close": v["4. close"], "volume": v["5. volume"], "symbol": ticker} for date, v in series.items()]
+    return pd.DataFrame(rows, dtype=object)
+
+
+def typed(series, ticker, compact):
+    return time_series_frame(series, OHLCV_FIELDS, compact=compact)
+
+
+def measure(build, answers):
+    tracemalloc.start()
+    start = time.perf_counter()
+    frames = [build(series, ticker) for ticker, series in answers.items()]
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = sum(int(df.memory_usage(deep=True).sum()) for df in frames)
+    return frames, size, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=50)
+    parser.add_argument("--days", type=int, default=21)
+    args = parser.parse_args()
+
+    answers = {f"T{i:03d}": intraday_month(args.days, i) for i in range(args.tickers)}
+    bars = sum(len(series) for series in answers.values())
+    print(f"{args.tickers} tickers, {bars:,} bars of 1min")
+
+    results = {
+        "strings (original)": measure(string_rows, answers),
+        "compact=False": measure(lambda series, ticker: typed(series, ticker, False), answers),
+        "compact=True": measure(lambda series, ticker: typed(series, ticker, True), answers),
+    }
+
+    plain, compact = results["compact=False"][0], results["compact=True"][0]
+    for a, b in zip(plain, compact):
+        np.testing.assert_allclose(b["close"].to_numpy(np.float64), a["close"].to_numpy(), rtol=1e-6)
+        assert (b["volume"].to_numpy(np.int64) == a["volume"].to_numpy()).all()
+    results["compact=True, long"] = measure(lambda frames, _: long_frame(frames), {None: dict(zip(answers, compact))})
+
+    base = results["strings (original)"][1]
+    print(f"{'layout':<22}{'frames MB':>12}{'peak MB':>12}{'seconds':>10}{'ratio':>8}")
+    for name, (_, size, peak, elapsed) in results.items():
+        print(f"{name:<22}{size / 2**20:>12.1f}{peak / 2**20:>12.1f}{elapsed:>10.2f}{size / base:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
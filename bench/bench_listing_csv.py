@@ -0,0 +1,112 @@
+"""
+Time and peak memory of the LISTING_STATUS ingestion: the original decode / splitlines / list(csv.reader) path against listening_delisting_status and iter_listening_delisting_status, the fixture being served by the local stand-in server of the tests.
+
+usage: python bench/bench_listing_csv.py [--fixture listing_status.csv] [--rows 12000] [--repeat 5]
+Pass a captured answer of https://www.alphavantage.co/query?function=LISTING_STATUS&apikey=... with --fixture, otherwise a fixture of the same format is generated.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from alphavantage_api import AlphaVantage  # noqa: E402
+from conftest import FakeServer  # noqa: E402
+
+
+EXCHANGES = ["NASDAQ", "NYSE", "NYSE ARCA", "NYSE MKT", "BATS"]
+
+
+def generated_fixture(rows, seed=0):
+    """
+    A LISTING_STATUS answer of rows active listings: symbol,name,exchange,assetType,ipoDate,delistingDate,status with "null" delisting dates.
+    """
+    rng = np.random.default_rng(seed)
+    ipo = np.datetime64("1970-01-01") + rng.integers(0, 20000, rows).astype("timedelta64[D]")
+    lines = ["symbol,name,exchange,assetType,ipoDate,delistingDate,status"]
+    for i in range(rows):
+        asset = "ETF" if rng.random() < 0.3 else "Stock"
+        name = f"Company {i} Holdings Inc" if asset == "Stock" else f"Fund {i} Index ETF"
+        lines.append(f"S{i:05d},{name},{EXCHANGES[rng.integers(len(EXCHANGES))]},{asset},{ipo[i]},null,Active")
+    return ("\r\n".join(lines) + "\r\n").encode()
+
+
+def original(url):
+    """
+    The ingestion of the original client.
+    """
+    with requests.Session() as s:
+        download = s.get(url)
+        decoded_content = download.content.decode('utf-8')
+        cr = csv.reader(decoded_content.splitlines(), delimiter=',')
+        my_list = list(cr)
+        df = pd.DataFrame(my_list)
+        df.columns = df.iloc[0]
+        df = df[1:].reset_index(drop=True)
+        return df
+
+
+def measure(run, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    result = run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, min(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixture")
+    parser.add_argument("--rows", type=int, default=12000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.fixture:
+        with open(args.fixture, "rb") as f:
+            body = f.read()
+    else:
+        body = generated_fixture(args.rows)
+
+    server = FakeServer()
+    server.routes["LISTING_STATUS"] = lambda query: (body, "text/csv")
+    client = AlphaVantage(api_key="bench", rate_limiter=False, base_url=server.url)
+    url = f"{server.url}/query?function=LISTING_STATUS&apikey=bench"
+    try:
+        runs = {
+            "original": lambda: original(url),
+            "listening_delisting_status": client.listening_delisting_status,
+            "iter (1000 rows)": lambda: sum(len(batch) for batch in client.iter_listening_delisting_status(batch_size=1000)),
+        }
+        results = {name: measure(run, args.repeat) for name, run in runs.items()}
+    finally:
+        client.close()
+        server.close()
+
+    reference, typed = results["original"][0], results["listening_delisting_status"][0]
+    assert len(typed) == len(reference) == results["iter (1000 rows)"][0]
+    assert list(typed["symbol"]) == list(reference["symbol"])
+    assert (typed["ipoDate"].dt.strftime("%Y-%m-%d") == reference["ipoDate"]).all()
+
+    print(f"{len(body) / 2**20:.1f} MB, {len(typed):,} listings")
+    print(f"{'path':<30}{'ms':>10}{'peak MB':>10}{'frame MB':>10}")
+    for name, (result, elapsed, peak) in results.items():
+        size = result.memory_usage(deep=True).sum() / 2**20 if isinstance(result, pd.DataFrame) else float("nan")
+        print(f"{name:<30}{elapsed * 1000:>10.1f}{peak / 2**20:>10.1f}{size:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
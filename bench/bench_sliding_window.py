@@ -0,0 +1,115 @@
+"""
+Time of the local sliding-window analytics against a naive implementation recomputing every window, with a check that both agree.
+The default reproduces the target of the request: a 100-point window over 20 years of daily prices of 500 tickers.
+At 500 tickers the matrices of every window hold 8 N^2 = 2 MB each, about 10 GB for the whole history, so they are consumed one window at a time as the answer layout does, every --check-every window being compared with the naive matrix.
+The array and answer layouts, which keep every matrix, are timed on --layout-tickers tickers.
+
+usage: python bench/bench_sliding_window.py [--tickers 500] [--layout-tickers 50] [--years 20] [--window 100] [--check-every 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alphavantage_analytics import _iter_window_matrices, sliding_window  # noqa: E402
+
+
+def prices(tickers, years, seed=0):
+    rng = np.random.default_rng(seed)
+    n = 252 * years
+    returns = rng.normal(0.0003, 0.015, (n, tickers)) + rng.normal(0, 0.01, (n, 1))
+    return pd.DataFrame(100 * np.exp(np.cumsum(returns, axis=0)), index=pd.bdate_range("2004-01-01", periods=n), columns=[f"T{i:03d}" for i in range(tickers)])
+
+
+def returns_of(df):
+    values = df.to_numpy(dtype=np.float64)
+    return values[1:] / values[:-1] - 1
+
+
+def naive_variance(returns, window):
+    out = np.full(returns.shape, np.nan)
+    for row in range(window - 1, len(returns)):
+        out[row] = returns[row - window + 1:row + 1].var(axis=0)
+    return out
+
+
+def naive_matrix(name, window):
+    if name == "COVARIANCE":
+        return np.cov(window, rowvar=False, bias=True)
+    return np.corrcoef(window, rowvar=False)
+
+
+def naive_matrices(name, returns, window):
+    for row in range(window - 1, len(returns)):
+        yield row, naive_matrix(name, returns[row - window + 1:row + 1])
+
+
+def streamed(name, returns, window, check_every):
+    """
+    Walk the matrices of every window without keeping them, comparing every check_every window with the naive matrix.
+    """
+    count = 0
+    for row, matrix in _iter_window_matrices(returns, window, name):
+        if count % check_every == 0:
+            np.testing.assert_allclose(matrix, naive_matrix(name, returns[row - window + 1:row + 1]), rtol=1e-6, atol=1e-12)
+        count += 1
+    return count
+
+
+def consume(windows):
+    return sum(1 for _ in windows)
+
+
+def timed(run):
+    start = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--layout-tickers", type=int, default=50)
+    parser.add_argument("--check-every", type=int, default=50)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--window", type=int, default=100)
+    args = parser.parse_args()
+    window = args.window
+    rows = []
+
+    df = prices(args.tickers, args.years)
+    returns = returns_of(df)
+    local, local_time = timed(lambda: sliding_window(df, ["VARIANCE", "STDDEV"], window, layout="array"))
+    naive, naive_time = timed(lambda: naive_variance(returns, window))
+    variance = local["payload"]["RETURNS_CALCULATIONS"]["VARIANCE"]["RUNNING_VARIANCE"]
+    np.testing.assert_allclose(variance, naive, rtol=1e-6, atol=1e-12)
+    rows.append((f"VARIANCE+STDDEV, {args.tickers} tickers", local_time, naive_time))
+
+    for name in ("COVARIANCE", "CORRELATION"):
+        _, local_time = timed(lambda: streamed(name, returns, window, args.check_every))
+        _, naive_time = timed(lambda: consume(naive_matrices(name, returns, window)))
+        rows.append((f"{name}, {args.tickers} tickers, streamed", local_time, naive_time))
+
+    df = df.iloc[:, :args.layout_tickers]
+    returns = returns_of(df)
+    for name in ("COVARIANCE", "CORRELATION"):
+        local, local_time = timed(lambda: sliding_window(df, [name], window, layout="array"))
+        naive, naive_time = timed(lambda: np.stack([matrix for _, matrix in naive_matrices(name, returns, window)]))
+        np.testing.assert_allclose(local["payload"]["RETURNS_CALCULATIONS"][name][f"RUNNING_{name}"], naive, rtol=1e-6, atol=1e-12)
+        rows.append((f"{name}, {df.shape[1]} tickers, layout=array", local_time, naive_time))
+        _, answer_time = timed(lambda: sliding_window(df, [name], window))
+        rows.append((f"{name}, {df.shape[1]} tickers, layout=answer", answer_time, float("nan")))
+
+    print(f"{len(returns):,} daily returns, window of {window}")
+    print(f"{'calculation':<44}{'local s':>10}{'naive s':>10}{'speedup':>9}")
+    for name, local_time, naive_time in rows:
+        print(f"{name:<44}{local_time:>10.2f}{naive_time:>10.2f}{naive_time / local_time:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
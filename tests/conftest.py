@@ -0,0 +1,158 @@
+import datetime
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alphavantage_api import AlphaVantage, RateLimiter  # noqa: E402
+
+
+def daily_series(n, adjusted=False, start=datetime.date(2000, 1, 3)):
+    """
+    {date: values} of n business days from start, latest first like the answers.
+    """
+    days = []
+    day = start
+    while len(days) < n:
+        if day.weekday() < 5:
+            days.append(day)
+        day += datetime.timedelta(days=1)
+    series = {}
+    for i, day in enumerate(reversed(days)):
+        price = 100 + i % 17
+        values = {"1. open": f"{price:.4f}", "2. high": f"{price + 1:.4f}", "3. low": f"{price - 1:.4f}", "4. close": f"{price + 0.5:.4f}"}
+        if adjusted:
+            values.update({"5. adjusted close": f"{price + 0.5:.4f}", "6. volume": str(1000 + i), "7. dividend amount": "0.0000", "8. split coefficient": "1.0"})
+        else:
+            values["5. volume"] = str(1000 + i)
+        series[day.isoformat()] = values
+    return series
+
+
+def intraday_series(times):
+    return {
+        time.strftime("%Y-%m-%d %H:%M:%S"): {"1. open": "1.0", "2. high": "2.0", "3. low": "0.5", "4. close": "1.5", "5. volume": "10"}
+        for time in sorted(times, reverse=True)
+    }
+
+
+def listing_csv(n=50):
+    rows = ["symbol,name,exchange,assetType,ipoDate,delistingDate,status"]
+    rows += [f"S{i},Name {i},{'NYSE' if i % 2 else 'NASDAQ'},Stock,2000-01-0{1 + i % 9},null,Active" for i in range(n)]
+    return "\r\n".join(rows) + "\r\n"
+
+
+def default_answer(function, query):
+    if function == "TIME_SERIES_DAILY":
+        return {"Meta Data": {}, "Time Series (Daily)": daily_series(1000 if query.get("outputsize") == "full" else 100)}
+    if function == "TIME_SERIES_DAILY_ADJUSTED":
+        return {"Meta Data": {}, "Time Series (Daily)": daily_series(1000 if query.get("outputsize") == "full" else 100, adjusted=True)}
+    if function == "GLOBAL_QUOTE":
+        return {"Global Quote": {"01. symbol": query["symbol"], "05. price": "100.0"}}
+    if function == "REALTIME_BULK_QUOTES":
+        symbols = query["symbol"].split(",")[:100]
+        return {"message": "ok", "data": [{"symbol": symbol, "close": "1.0", "timestamp": "2024-01-01 16:00:00"} for symbol in symbols]}
+    if function == "OVERVIEW":
+        return {"Symbol": query["symbol"], "Name": "x"}
+    if function in ("LISTING_STATUS", "EARNINGS_CALENDAR", "IPO_CALENDAR"):
+        return listing_csv(), "text/csv"
+    return {"data": [{"date": "2024-01-01", "value": "1.5"}, {"date": "2023-12-01", "value": "."}]}
+
+
+class FakeServer():
+    def __init__(self):
+        """
+        Local stand-in for www.alphavantage.co speaking HTTP/1.1 with keep-alive.
+        routes maps a function to answer(query), queued answers of a function are served first, one per request.
+        """
+        self.routes = {}
+        self.queued = {}
+        self.functions = []
+        self.connections = 0
+        self.chunk_size = None
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                query = {name: values[-1] for name, values in parse_qs(urlparse(self.path).query).items()}
+                function = query.get("function")
+                with server._lock:
+                    server.functions.append(function)
+                    queue = server.queued.get(function)
+                    answer = queue.pop(0) if queue else None
+                if answer is None:
+                    answer = server.routes.get(function, lambda query: default_answer(function, query))(query)
+                body, content_type = answer if isinstance(answer, tuple) else (answer, "application/json")
+                if isinstance(body, (dict, list)):
+                    body = json.dumps(body)
+                if isinstance(body, str):
+                    body = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                if server.chunk_size is None:
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for i in range(0, len(body), server.chunk_size):
+                    chunk = body[i:i + server.chunk_size]
+                    self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def queue(self, function, *answers):
+        with self._lock:
+            self.queued.setdefault(function, []).extend(answers)
+
+    def count(self, function):
+        return self.functions.count(function)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = FakeServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def client(server):
+    # a fast private limiter: throttled answers are retried after a few milliseconds instead of seconds
+    client = AlphaVantage(api_key="test", rate_limiter=RateLimiter(60000, burst=100), base_url=server.url, retries=2)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def cached_client(server, tmp_path):
+    client = AlphaVantage(api_key="test", rate_limiter=RateLimiter(60000, burst=100), base_url=server.url, retries=2, cache=str(tmp_path / "cache.sqlite"))
+    yield client
+    client.close()
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from alphavantage_adjustments import adjust_bars, corporate_actions, unadjust_bars
+
+
+def raw_bars(rows=60):
+    close = np.linspace(100, 130, rows)
+    # the 2:1 split of 2020-02-03 halves the traded prices and doubles the volumes
+    split = pd.bdate_range("2020-01-01", periods=rows) >= "2020-02-03"
+    close = np.where(split, close / 2, close)
+    return pd.DataFrame(
+        {"open": close - 0.5, "high": close + 1, "low": close - 1, "close": close, "volume": np.where(split, 2000, 1000).astype(np.int64)},
+        index=pd.DatetimeIndex(pd.bdate_range("2020-01-01", periods=rows), name="date").astype("datetime64[ns]"),
+    )
+
+
+def actions():
+    dividends = pd.DataFrame({"ex_dividend_date": ["2020-01-15", "2020-03-02"], "amount": ["1.00", "0.50"]})
+    splits = pd.DataFrame({"effective_date": ["2020-02-03"], "split_factor": ["2.0"]})
+    return corporate_actions(dividends, splits)
+
+
+def test_unadjust_reverses_adjust_with_a_split_and_dividends():
+    raw = raw_bars()
+
+    adjusted = adjust_bars(raw, actions())
+    restored = unadjust_bars(adjusted, actions())
+
+    pd.testing.assert_frame_equal(restored, raw, rtol=1e-12)
+    # the bars before the split are halved and get both dividend factors, the bars after the last dividend are untouched
+    before = raw.loc[:"2020-01-14"]
+    dividends = (1 - 1.0 / raw.loc["2020-01-14", "close"]) * (1 - 0.5 / raw.loc["2020-02-28", "close"])
+    np.testing.assert_allclose(adjusted.loc[:"2020-01-14", "close"], before["close"] / 2 * dividends, rtol=1e-12)
+    assert (adjusted.loc[:"2020-01-14", "volume"] == 2000).all()
+    pd.testing.assert_frame_equal(adjusted.loc["2020-03-02":], raw.loc["2020-03-02":])
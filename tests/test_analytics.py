@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from alphavantage_analytics import fixed_window, rolling_covariance, rolling_moments, sliding_window
+
+
+def prices(rows=120, tickers=4, seed=0):
+    rng = np.random.default_rng(seed)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (rows, tickers)), axis=0))
+    return pd.DataFrame(values, index=pd.bdate_range("2020-01-01", periods=rows), columns=[f"T{i}" for i in range(tickers)])
+
+
+def returns_of(df):
+    values = df.to_numpy()
+    return values[1:] / values[:-1] - 1
+
+
+def test_rolling_moments_match_each_window():
+    returns = returns_of(prices())
+    mean, variance = rolling_moments(returns, 20)
+
+    for row in (19, 50, len(returns) - 1):
+        window = returns[row - 19:row + 1]
+        np.testing.assert_allclose(mean[row], window.mean(axis=0))
+        np.testing.assert_allclose(variance[row], window.var(axis=0))
+    assert np.isnan(variance[:19]).all()
+
+
+def test_rolling_covariance_matches_each_window():
+    returns = returns_of(prices())
+    stack = rolling_covariance(returns, 30)
+
+    assert stack.shape == (len(returns) - 29, 4, 4)
+    for i in (0, 40, len(stack) - 1):
+        np.testing.assert_allclose(stack[i], np.cov(returns[i:i + 30], rowvar=False, bias=True), atol=1e-15)
+
+
+def test_array_layout_matches_the_answer_layout():
+    df = prices()
+    calculations = ["STDDEV(annualized=True)", "COVARIANCE", "CORRELATION(method=SPEARMAN)"]
+    answer = sliding_window(df, calculations, 20)["payload"]["RETURNS_CALCULATIONS"]
+    arrays = sliding_window(df, calculations, 20, layout="array")["payload"]["RETURNS_CALCULATIONS"]
+
+    stddev = arrays["STDDEV(ANNUALIZED=TRUE)"]
+    assert stddev["RUNNING_STDDEV"].shape == (len(df) - 1, 4)
+    date = stddev["dates"][-1]
+    assert answer["STDDEV(ANNUALIZED=TRUE)"]["RUNNING_STDDEV"]["T2"][date] == stddev["RUNNING_STDDEV"][-1, 2]
+
+    for key, running in (("COVARIANCE", "RUNNING_COVARIANCE"), ("CORRELATION(METHOD=SPEARMAN)", "RUNNING_CORRELATION")):
+        stack = arrays[key][running]
+        assert list(answer[key][running]) == list(arrays[key]["dates"])
+        triangle = answer[key][running][arrays[key]["dates"][5]]
+        assert triangle == [[float(value) for value in row[:i + 1]] for i, row in enumerate(stack[5])]
+
+
+def test_intraday_windows_keep_their_time():
+    df = prices(rows=300, tickers=3)
+    df.index = pd.date_range("2024-01-02 09:30", periods=300, freq="1min")
+
+    result = sliding_window(df, ["VARIANCE", "CORRELATION"], 20, interval="1min")
+    calculations = result["payload"]["RETURNS_CALCULATIONS"]
+
+    assert len(calculations["VARIANCE"]["RUNNING_VARIANCE"]["T0"]) == 280
+    assert len(calculations["CORRELATION"]["RUNNING_CORRELATION"]) == 280
+    assert "2024-01-02 14:29:00" in calculations["CORRELATION"]["RUNNING_CORRELATION"]
+    assert result["meta_data"]["min_dt"] == "2024-01-02 09:30:00"
+    assert result["meta_data"]["max_dt"] == "2024-01-02 14:29:00"
+
+
+def test_daily_windows_are_keyed_by_date():
+    result = sliding_window(prices(rows=30), ["MEAN"], 10)
+
+    assert result["meta_data"]["min_dt"] == "2020-01-01"
+    assert "2020-02-11" in result["payload"]["RETURNS_CALCULATIONS"]["MEAN"]["RUNNING_MEAN"]["T0"]
+
+
+def test_pearson_correlation_matches_each_window():
+    df = prices()
+    returns = returns_of(df)
+    correlation = sliding_window(df, ["CORRELATION"], 25, layout="array")["payload"]["RETURNS_CALCULATIONS"]["CORRELATION"]["RUNNING_CORRELATION"]
+
+    for i in (0, 30, len(correlation) - 1):
+        np.testing.assert_allclose(correlation[i], np.corrcoef(returns[i:i + 25], rowvar=False), atol=1e-12)
+
+
+def test_fixed_window_matches_pandas():
+    df = prices(tickers=3)
+    df.iloc[:10, 2] = np.nan
+    returns = df.pct_change(fill_method=None)
+    calculations = [
+        "MIN", "MAX", "MEAN", "MEDIAN", "CUMULATIVE_RETURN", "VARIANCE", "STDDEV(annualized=True)", "MAX_DRAWDOWN",
+        "AUTOCORRELATION(lag=2)", "COVARIANCE(annualized=True)", "CORRELATION", "CORRELATION(method=SPEARMAN)", "CORRELATION(method=KENDALL)",
+    ]
+
+    result = fixed_window(df, calculations)
+    answer = result["payload"]["RETURNS_CALCULATIONS"]
+
+    expected = {
+        "MIN": returns.min(),
+        "MAX": returns.max(),
+        "MEAN": returns.mean(),
+        "MEDIAN": returns.median(),
+        "CUMULATIVE_RETURN": df.ffill().iloc[-1] / df.bfill().iloc[0] - 1,
+        "VARIANCE": returns.var(ddof=0),
+        "STDDEV(ANNUALIZED=TRUE)": np.sqrt(returns.var(ddof=0) * 252),
+    }
+    for key, series in expected.items():
+        np.testing.assert_allclose(pd.Series(answer[key]), series, rtol=1e-10, err_msg=key)
+
+    drawdowns = df / df.cummax() - 1
+    for symbol in df:
+        assert answer["MAX_DRAWDOWN"][symbol]["max_drawdown"] == pytest.approx(drawdowns[symbol].min())
+        assert answer["MAX_DRAWDOWN"][symbol]["drawdown_range"]["end_drawdown"] == drawdowns[symbol].idxmin().strftime("%Y-%m-%d")
+    # pandas centers the autocorrelation on the complete pairs only, which differs for the symbol listed later
+    for symbol in ("T0", "T1"):
+        assert answer["AUTOCORRELATION(LAG=2)"][symbol] == pytest.approx(returns[symbol].autocorr(2))
+
+    common = returns.dropna()
+    for key, name, matrix in (
+        ("COVARIANCE(ANNUALIZED=TRUE)", "covariance", common.cov(ddof=0) * 252),
+        ("CORRELATION", "correlation", common.corr()),
+        ("CORRELATION(METHOD=SPEARMAN)", "correlation", common.corr(method="spearman")),
+        ("CORRELATION(METHOD=KENDALL)", "correlation", common.corr(method="kendall")),
+    ):
+        assert answer[key]["index"] == list(df.columns)
+        triangle = answer[key][name]
+        for i in range(3):
+            np.testing.assert_allclose(triangle[i], matrix.to_numpy()[i, :i + 1], rtol=1e-10, atol=1e-15, err_msg=key)
+    assert result["meta_data"]["min_dt"] == "2020-01-01"
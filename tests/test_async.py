@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+import pytest
+
+from test_errors import INVALID
+from alphavantage_api import AlphaVantageError, AsyncAlphaVantage
+
+
+@pytest.fixture
+def async_client(client):
+    return AsyncAlphaVantage(client, max_concurrency=4)
+
+
+def test_gather_keeps_the_order_of_the_inputs(server, async_client):
+    async def main():
+        return await async_client.gather("company_overview", ["IBM", "AAPL", {"ticker": "MSFT"}, ("GOOG",)])
+
+    results = asyncio.run(main())
+
+    assert [result["Symbol"] for result in results] == ["IBM", "AAPL", "MSFT", "GOOG"]
+    assert server.count("OVERVIEW") == 4
+
+
+def test_gather_returns_exceptions(server, async_client):
+    server.routes["OVERVIEW"] = lambda query: INVALID if query["symbol"] == "BAD" else {"Symbol": query["symbol"]}
+
+    async def main():
+        return await async_client.gather("company_overview", ["IBM", "BAD"], return_exceptions=True)
+
+    ibm, bad = asyncio.run(main())
+
+    assert ibm["Symbol"] == "IBM"
+    assert isinstance(bad, AlphaVantageError)
+
+
+def test_as_completed_yields_every_input(server, async_client):
+    server.routes["OVERVIEW"] = lambda query: INVALID if query["symbol"] == "BAD" else {"Symbol": query["symbol"]}
+
+    async def main():
+        return [pair async for pair in async_client.as_completed("company_overview", ["IBM", "BAD", "AAPL"])]
+
+    pairs = dict(asyncio.run(main()))
+
+    assert pairs["IBM"]["Symbol"] == "IBM" and pairs["AAPL"]["Symbol"] == "AAPL"
+    assert isinstance(pairs["BAD"], AlphaVantageError)
+
+
+def test_iter_methods_run_off_the_event_loop(server, async_client, monkeypatch):
+    threads = set()
+    stream_members = async_client.client._stream_members
+
+    def record(url, key):
+        threads.add(threading.current_thread().name)
+        yield from stream_members(url, key)
+
+    monkeypatch.setattr(async_client.client, "_stream_members", record)
+
+    async def main():
+        return [batch async for batch in async_client.iter_historical_options("IBM", batch_size=1)]
+
+    batches = asyncio.run(main())
+
+    assert [len(batch) for batch in batches] == [1, 1]
+    assert threads and all(name.startswith("alphavantage") for name in threads)
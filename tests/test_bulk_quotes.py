@@ -0,0 +1,24 @@
+from alphavantage_api import BULK_QUOTES_SIZE
+
+
+def test_bulk_quotes_are_chunked_and_merged_in_order(server, client):
+    requested = []
+
+    def answer(query):
+        symbols = query["symbol"].split(",")
+        requested.append(symbols)
+        return {"message": f"{len(symbols)} symbols", "data": [{"symbol": symbol, "close": "1.0"} for symbol in symbols if symbol != "S7"]}
+
+    server.routes["REALTIME_BULK_QUOTES"] = answer
+    tickers = [f"S{i}" for i in range(250)]
+
+    df = client.realtime_bulk_quotes(tickers + ["S3"])
+
+    assert server.count("REALTIME_BULK_QUOTES") == 3
+    assert sorted(len(symbols) for symbols in requested) == [50, BULK_QUOTES_SIZE, BULK_QUOTES_SIZE]
+    assert sorted(symbol for symbols in requested for symbol in symbols) == sorted(tickers)
+    assert list(df["symbol"]) == [ticker for ticker in tickers if ticker != "S7"]
+    assert df.attrs["requested"] == 250
+    assert df.attrs["returned"] == 249
+    assert df.attrs["missing"] == ["S7"]
+    assert sorted(df.attrs["messages"]) == ["100 symbols", "100 symbols", "50 symbols"]
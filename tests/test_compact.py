@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import daily_series, intraday_series
+from alphavantage_api import OHLCV_FIELDS, time_series_frame
+
+
+def test_compact_frame_dtypes_and_memory():
+    series = daily_series(500)
+    plain = time_series_frame(series, OHLCV_FIELDS)
+    compact = time_series_frame(series, OHLCV_FIELDS, compact=True)
+
+    assert compact["close"].dtype == np.float32
+    assert compact["volume"].dtype == np.uint32
+    assert compact.index.dtype == "datetime64[ns]"
+    assert compact.memory_usage(deep=True).sum() < 0.7 * plain.memory_usage(deep=True).sum()
+    np.testing.assert_allclose(compact["close"].to_numpy(np.float64), plain["close"].to_numpy(), rtol=1e-6)
+
+
+def test_compact_client_output(server, client):
+    client.compact = True
+
+    df = client.time_series_daily("IBM", outputsize="full")
+
+    assert len(df) == 1000
+    assert df["open"].dtype == np.float32
+    assert df["volume"].dtype == np.uint32
+
+
+@pytest.mark.parametrize("outputsize, streaming", [("compact", True), ("full", False), ("full", True)])
+def test_compact_client_keeps_the_index_and_values(server, client, outputsize, streaming):
+    plain = client.time_series_daily("IBM", outputsize=outputsize)
+    client.compact, client.streaming = True, streaming
+
+    df = client.time_series_daily("IBM", outputsize=outputsize)
+
+    assert isinstance(df.index, pd.DatetimeIndex)
+    assert df.index.dtype == "datetime64[ns]" and df.index.name == "date"
+    assert df.index.equals(plain.index)
+    assert dict(df.dtypes.astype(str)) == {"open": "float32", "high": "float32", "low": "float32", "close": "float32", "volume": "uint32"}
+    np.testing.assert_allclose(df["close"].to_numpy(np.float64), plain["close"].to_numpy(), rtol=1e-6)
+    np.testing.assert_array_equal(df["volume"], plain["volume"])
+
+
+def test_compact_client_intraday_and_economic_frames(server, client):
+    times = [pd.Timestamp("2024-01-02 09:30") + pd.Timedelta(minutes=i) for i in range(30)]
+    server.routes["TIME_SERIES_INTRADAY"] = lambda query: {"Meta Data": {}, "Time Series (1min)": intraday_series(times)}
+    client.compact = True
+
+    bars = client.time_series_intraday("IBM", 1)
+    gdp = client.real_gdp()
+
+    assert bars.index.dtype == "datetime64[ns]"
+    assert bars.index[0] == pd.Timestamp("2024-01-02 09:59") and bars.index[-1] == pd.Timestamp("2024-01-02 09:30")
+    assert bars["close"].dtype == np.float32 and bars["volume"].dtype == np.uint32
+    assert gdp["date"].dtype == "datetime64[ns]" and gdp["value"].dtype == np.float32
+    assert np.isnan(gdp["value"].iloc[1])
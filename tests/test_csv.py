@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from conftest import listing_csv
+from test_errors import INVALID, PER_MINUTE
+from alphavantage_api import AlphaVantageError
+
+
+@pytest.mark.parametrize("chunk_size", [None, 5])
+def test_listing_is_typed(server, client, chunk_size):
+    server.chunk_size = chunk_size
+
+    df = client.listening_delisting_status()
+
+    assert len(df) == 50
+    assert df["ipoDate"].dtype == "datetime64[ns]"
+    assert isinstance(df["exchange"].dtype, pd.CategoricalDtype)
+    assert df["delistingDate"].isna().all()
+
+
+def test_iter_listing_matches_the_frame(server, client):
+    server.chunk_size = 7
+    batches = list(client.iter_listening_delisting_status(batch_size=20))
+
+    assert [len(batch) for batch in batches] == [20, 20, 10]
+    assert list(pd.concat(batches)["symbol"]) == [f"S{i}" for i in range(50)]
+
+
+def test_streamed_csv_error_answer_raises(server, client):
+    server.queue("LISTING_STATUS", INVALID, INVALID)
+
+    with pytest.raises(AlphaVantageError):
+        client.listening_delisting_status()
+    with pytest.raises(AlphaVantageError):
+        list(client.iter_listening_delisting_status())
+    assert server.count("LISTING_STATUS") == 2
+
+
+def test_streamed_csv_throttled_answer_is_retried(server, client):
+    server.queue("LISTING_STATUS", PER_MINUTE)
+    df = client.listening_delisting_status()
+    server.queue("LISTING_STATUS", PER_MINUTE)
+    batches = list(client.iter_listening_delisting_status())
+
+    assert len(df) == 50
+    assert sum(len(batch) for batch in batches) == 50
+    assert server.count("LISTING_STATUS") == 4
+
+
+def test_long_listing_crosses_the_head(server, client):
+    server.routes["LISTING_STATUS"] = lambda query: (listing_csv(5000), "text/csv")
+
+    df = client.listening_delisting_status()
+
+    assert len(df) == 5000
+    assert df["symbol"].iloc[-1] == "S4999"
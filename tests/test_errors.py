@@ -0,0 +1,62 @@
+import pytest
+
+from alphavantage_api import AlphaVantageError, RateLimitError
+
+
+PER_MINUTE = {"Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute and 500 calls per day. Please visit https://www.alphavantage.co/premium/ if you would like to target a higher API call frequency."}
+PER_DAY = {"Information": "Thank you for using Alpha Vantage! Our standard API rate limit is 25 requests per day. Please subscribe to any of the premium plans at https://www.alphavantage.co/premium/ to instantly remove all daily rate limits."}
+INVALID = {"Error Message": "Invalid API call. Please retry or visit the documentation (https://www.alphavantage.co/documentation/) for TIME_SERIES_DAILY."}
+
+
+def test_per_minute_note_is_retried(server, client):
+    server.queue("TIME_SERIES_DAILY", PER_MINUTE)
+
+    df = client.time_series_daily("IBM")
+
+    assert len(df) == 100
+    assert server.count("TIME_SERIES_DAILY") == 2
+
+
+def test_per_day_note_raises_at_once(server, client):
+    server.queue("TIME_SERIES_DAILY", PER_DAY)
+
+    with pytest.raises(RateLimitError):
+        client.time_series_daily("IBM")
+    assert server.count("TIME_SERIES_DAILY") == 1
+
+
+def test_throttling_past_the_retries_raises(server, client):
+    server.queue("TIME_SERIES_DAILY", *[PER_MINUTE] * (client.retries + 1))
+
+    with pytest.raises(RateLimitError):
+        client.time_series_daily("IBM")
+    assert server.count("TIME_SERIES_DAILY") == client.retries + 1
+
+
+def test_error_message_raises(server, client):
+    server.queue("TIME_SERIES_DAILY", INVALID)
+
+    with pytest.raises(AlphaVantageError) as e:
+        client.time_series_daily("IBM")
+    assert not isinstance(e.value, RateLimitError)
+
+
+def test_csv_error_answer_is_not_cached(server, cached_client):
+    server.queue("LISTING_STATUS", INVALID)
+
+    with pytest.raises(AlphaVantageError):
+        cached_client.listening_delisting_status()
+    df = cached_client.listening_delisting_status()
+
+    assert len(df) == 50
+    assert server.count("LISTING_STATUS") == 2
+
+
+def test_throttled_csv_answer_is_retried_before_caching(server, cached_client):
+    server.queue("LISTING_STATUS", PER_MINUTE)
+
+    first = cached_client.listening_delisting_status()
+    second = cached_client.listening_delisting_status()
+
+    assert len(first) == len(second) == 50
+    assert server.count("LISTING_STATUS") == 2
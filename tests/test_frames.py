@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from conftest import daily_series
+from alphavantage_api import long_frame, panel_frame
+
+
+def frame(volumes, dtype):
+    index = pd.DatetimeIndex(pd.date_range("2024-01-01", periods=len(volumes)), name="date")
+    return pd.DataFrame({"close": np.ones(len(volumes), dtype=np.float32), "volume": np.array(volumes, dtype=dtype)}, index=index)
+
+
+def test_long_frame_keeps_mixed_compact_dtypes():
+    big = 2**33
+    df = long_frame({"A": frame([1, 2], np.uint32), "B": frame([big, 3], np.uint64)})
+
+    assert df["volume"].dtype == np.uint64
+    assert df["volume"].tolist() == [1, 2, big, 3]
+    assert df["close"].dtype == np.float32
+    assert df["symbol"].tolist() == ["A", "A", "B", "B"]
+
+
+def test_panel_frame_aligns_dates():
+    a = frame([1, 2, 3], np.int64)
+    b = frame([4, 5], np.int64).iloc[1:]
+
+    df = panel_frame({"A": a, "B": b}, "volume")
+
+    assert df.shape == (3, 2)
+    assert df["B"].isna().tolist() == [True, False, True]
+
+
+def test_bulk_time_series_compact_large_volumes(server, client):
+    def answer(query):
+        series = daily_series(100)
+        if query["symbol"] == "BIG":
+            for values in series.values():
+                values["5. volume"] = str(2**33)
+        return {"Meta Data": {}, "Time Series (Daily)": series}
+
+    server.routes["TIME_SERIES_DAILY"] = answer
+    client.compact = True
+
+    df, failures = client.bulk_time_series(["IBM", "BIG"], method="time_series_daily")
+
+    assert not failures
+    assert df["volume"].dtype == np.uint64
+    assert (df.loc[df["symbol"] == "BIG", "volume"] == 2**33).all()
+    assert (df.loc[df["symbol"] == "IBM", "volume"] < 2**32).all()
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from alphavantage_indicators import IndicatorEngine
+
+
+INDICATORS = ["SMA(time_period=10)", "EMA(time_period=5)", "RSI", "MACD", "BBANDS(nbdevup=2.5)", "ATR"]
+
+
+def bars(rows=200, seed=0, start="2020-01-01"):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    spread = rng.uniform(0.1, 1.0, rows)
+    return pd.DataFrame(
+        {"open": close, "high": close + spread, "low": close - spread, "close": close, "volume": rng.integers(1000, 2000, rows)},
+        index=pd.DatetimeIndex(pd.bdate_range(start, periods=rows), name="date").astype("datetime64[ns]"),
+    )
+
+
+def test_incremental_updates_match_a_full_recompute():
+    frames = {"IBM": bars(seed=0), "MSFT": bars(seed=1), "LATE": bars(120, seed=2, start="2020-05-01")}
+    frames["MSFT"].iloc[60:63] = np.nan
+
+    incremental = IndicatorEngine(INDICATORS)
+    for end in (30, 31, 90, 150, 199, 200):
+        # the symbols do not advance together: LATE starts later and lags the others by a few bars
+        incremental.update({symbol: frame.iloc[:end - (7 if symbol == "LATE" else 0)] for symbol, frame in frames.items()})
+    full = IndicatorEngine(INDICATORS).update(frames)
+
+    for symbol, frame in incremental.update(frames).items():
+        assert len(frame) == len(frames[symbol])
+        pd.testing.assert_frame_equal(frame, full[symbol], rtol=1e-10)
+
+
+def test_sma_and_bbands_match_pandas_rolling():
+    frame = bars()
+    df = IndicatorEngine(["SMA(time_period=10)", "BBANDS(time_period=10)"]).update({"IBM": frame})["IBM"]
+
+    mean = frame["close"].rolling(10).mean()
+    deviation = frame["close"].rolling(10).std(ddof=0)
+    np.testing.assert_allclose(df[("SMA(TIME_PERIOD=10)", "SMA")], mean, rtol=1e-10)
+    np.testing.assert_allclose(df[("BBANDS(TIME_PERIOD=10)", "Real Upper Band")], mean + 2 * deviation, rtol=1e-10)
@@ -0,0 +1,40 @@
+from test_errors import INVALID
+from alphavantage_api import AlphaVantageError
+
+
+def test_identical_jobs_are_sent_once(server, client):
+    client.memory_cache = None
+    jobs = [
+        ("company_overview", "IBM"),
+        ("company_overview", {"ticker": "IBM"}),
+        ("company_overview", ("IBM",)),
+        ("company_overview", "AAPL"),
+        ("time_series_daily", "IBM"),
+        ("time_series_daily", {"ticker": "IBM", "outputsize": "compact"}),
+    ]
+
+    results, failures = client.run_jobs(jobs)
+
+    assert not failures
+    assert server.count("OVERVIEW") == 2
+    assert server.count("TIME_SERIES_DAILY") == 1
+    assert len(results) == 3
+    assert results[client.job_key("company_overview", {"ticker": "IBM"})]["Symbol"] == "IBM"
+    assert len(results[client.job_key("time_series_daily", "IBM")]) == 100
+
+
+def test_failing_jobs_do_not_stop_the_batch(server, client):
+    server.routes["OVERVIEW"] = lambda query: INVALID if query["symbol"] == "BAD" else {"Symbol": query["symbol"]}
+    jobs = [
+        ("no_such_method", "IBM"),
+        ("company_overview", {"symbol": "IBM"}),
+        ("company_overview", "BAD"),
+        ("company_overview", "AAPL"),
+    ]
+
+    results, failures = client.run_jobs(jobs)
+
+    assert list(results) == [client.job_key("company_overview", "AAPL")]
+    assert isinstance(failures[("no_such_method", "IBM")], AttributeError)
+    assert isinstance(failures[("company_overview", (("symbol", "IBM"),))], TypeError)
+    assert isinstance(failures[client.job_key("company_overview", "BAD")], AlphaVantageError)
@@ -0,0 +1,95 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from alphavantage_api import MemoryCache
+
+
+def quote_url(symbol):
+    return f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={symbol}&apikey=test"
+
+
+def test_concurrent_callers_share_one_load():
+    cache = MemoryCache()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return {"Global Quote": {"05. price": "1.0"}}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(cache.get_or_load, quote_url("IBM"), load) for _ in range(8)]
+        deadline = time.monotonic() + 5
+        while cache.coalesced < 7 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        answers = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert cache.stats() == {"hits": 0, "misses": 1, "coalesced": 7, "entries": 1}
+    # every caller gets its own copy
+    answers[0]["Global Quote"]["05. price"] = "2.0"
+    assert all(answer == {"Global Quote": {"05. price": "1.0"}} for answer in answers[1:])
+
+
+def test_failed_load_reaches_every_waiter_and_is_not_cached():
+    cache = MemoryCache()
+    release = threading.Event()
+
+    def load():
+        release.wait(5)
+        raise ValueError("down")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(cache.get_or_load, quote_url("IBM"), load) for _ in range(4)]
+        deadline = time.monotonic() + 5
+        while cache.coalesced < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+    assert cache.get_or_load(quote_url("IBM"), lambda: {"ok": True}) == {"ok": True}
+
+
+def test_answers_expire_after_their_ttl():
+    cache = MemoryCache(ttls={"GLOBAL_QUOTE": 0.05})
+    loads = iter([{"price": 1}, {"price": 2}])
+
+    assert cache.get_or_load(quote_url("IBM"), lambda: next(loads)) == {"price": 1}
+    assert cache.get_or_load(quote_url("IBM"), lambda: next(loads)) == {"price": 1}
+    time.sleep(0.1)
+    assert cache.get_or_load(quote_url("IBM"), lambda: next(loads)) == {"price": 2}
+    assert cache.stats()["hits"] == 1
+
+
+def test_least_recently_used_answer_is_dropped():
+    cache = MemoryCache(max_entries=2)
+    cache.get_or_load(quote_url("A"), lambda: "A")
+    cache.get_or_load(quote_url("B"), lambda: "B")
+    cache.get_or_load(quote_url("A"), lambda: "reloaded")
+
+    cache.get_or_load(quote_url("C"), lambda: "C")
+
+    assert cache.get_or_load(quote_url("A"), lambda: "reloaded") == "A"
+    assert cache.get_or_load(quote_url("B"), lambda: "reloaded") == "reloaded"
+    assert cache.stats()["entries"] == 2
+
+
+def test_concurrent_client_calls_send_one_request(server, client):
+    def answer(query):
+        time.sleep(0.2)
+        return {"Global Quote": {"01. symbol": query["symbol"], "05. price": "100.0"}}
+
+    server.routes["GLOBAL_QUOTE"] = answer
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        quotes = list(executor.map(lambda _: client.quote_endpoint("IBM"), range(10)))
+
+    assert server.count("GLOBAL_QUOTE") == 1
+    assert all(quote == quotes[0] for quote in quotes)
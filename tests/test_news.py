@@ -0,0 +1,56 @@
+def articles(minutes):
+    """
+    Feed articles sorted from the earliest, minutes being {YYYYMMDDTHHMM: number of articles published that minute}.
+    """
+    feed = []
+    for minute, count in sorted(minutes.items()):
+        feed += [{"title": f"{minute}-{i}", "url": f"https://news/{minute}/{i}", "time_published": f"{minute}{i:02d}"} for i in range(count)]
+    return feed
+
+
+def feed_answer(feed, requests):
+    """
+    NEWS_SENTIMENT with sort=EARLIEST over feed: the first limit articles published between time_from and time_to, by minute.
+    """
+    def answer(query):
+        requests.append(query.get("time_from"))
+        start, end = query.get("time_from", ""), query.get("time_to", "")
+        matching = [article for article in feed if article["time_published"][:13] >= start and (not end or article["time_published"][:13] <= end)]
+        return {"items": str(len(matching)), "feed": matching[:int(query["limit"])]}
+    return answer
+
+
+def test_walk_goes_past_the_limit_without_duplicates(server, client):
+    feed = articles({"20240101T0900": 4, "20240101T0901": 5, "20240101T0902": 6, "20240101T0903": 3, "20240101T0904": 5})
+    requests = []
+    server.routes["NEWS_SENTIMENT"] = feed_answer(feed, requests)
+
+    pages = list(client.iter_market_sentiment("20240101T0900", limit=10))
+
+    assert [article["url"] for page in pages for article in page] == [article["url"] for article in feed]
+    assert all(len(page) <= 10 for page in pages)
+    # each page starts at the minute of the last article received, the walk stops on the first short page
+    assert requests == ["20240101T0900", "20240101T0902", "20240101T0904"]
+
+
+def test_walk_stops_at_time_to(server, client):
+    feed = articles({"20240101T0900": 8, "20240101T0901": 8, "20240101T0902": 8, "20240101T0903": 8})
+    requests = []
+    server.routes["NEWS_SENTIMENT"] = feed_answer(feed, requests)
+
+    pages = list(client.iter_market_sentiment("20240101T0900", time_to="20240101T0901", limit=10))
+
+    assert [article["title"] for page in pages for article in page] == [f"20240101T090{minute}-{i}" for minute in (0, 1) for i in range(8)]
+    assert requests == ["20240101T0900", "20240101T0901"]
+
+
+def test_full_minute_moves_the_walk_to_the_next_minute(server, client):
+    feed = articles({"20240101T0900": 12, "20240101T0901": 3})
+    requests = []
+    server.routes["NEWS_SENTIMENT"] = feed_answer(feed, requests)
+
+    pages = list(client.iter_market_sentiment("20240101T0900", limit=10))
+
+    assert requests == ["20240101T0900", "20240101T0901"]
+    assert [len(page) for page in pages] == [10, 3]
+    assert pages[1][0]["title"] == "20240101T0901-0"
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from alphavantage_options import OptionsChain, historical_chains
+from alphavantage_storage import PartitionedStore
+
+
+def chain(rows):
+    return OptionsChain.from_frame(pd.DataFrame(rows, columns=["contractID", "expiration", "strike", "type", "delta"]))
+
+
+def test_nearest_atm_per_expiration():
+    rows = [
+        (f"C{i}", expiration, strike, kind, 0.5)
+        for i, (expiration, strike, kind) in enumerate(
+            (expiration, strike, kind)
+            for expiration in ("2024-01-19", "2024-02-16")
+            for strike in (90, 95, 100, 105, 110)
+            for kind in ("call", "put")
+        )
+    ]
+
+    atm = chain(rows).nearest_atm(101, n=2)
+
+    assert len(atm) == 8
+    assert sorted(set(atm["strike"])) == [100, 105]
+    assert len(np.unique(atm["expiration"])) == 2
+
+
+def test_nearest_atm_of_an_empty_chain():
+    empty = chain([])
+
+    assert len(empty.nearest_atm(100)) == 0
+    assert len(empty.calls().nearest_atm(100, n=3)) == 0
+
+
+def options_answer(query):
+    date = query.get("date")
+    if date == "2024-01-04":
+        return {"endpoint": "Historical Options", "message": "success", "data": []}
+    contracts = [
+        {"contractID": f"IBM{strike}{kind[0]}", "symbol": "IBM", "expiration": "2024-01-19", "strike": str(strike), "type": kind, "date": date, "delta": "0.5"}
+        for strike in (100, 105) for kind in ("call", "put")
+    ]
+    return {"endpoint": "Historical Options", "message": "success", "data": contracts}
+
+
+def test_historical_chains_store_only_completed_sessions(server, client, tmp_path):
+    server.routes["HISTORICAL_OPTIONS"] = options_answer
+    store = PartitionedStore(str(tmp_path))
+    future = (pd.Timestamp.today() + pd.offsets.BDay(1)).strftime("%Y-%m-%d")
+
+    for _ in range(2):
+        chains, failures = historical_chains(client, "IBM", "2024-01-02", "2024-01-04", store=store)
+        later, _ = historical_chains(client, "IBM", future, future, store=store)
+
+    assert not failures
+    assert [len(chain) for chain in chains.values()] == [4, 4, 0]
+    assert len(later[future]) == 4
+    assert store.partitions("historical_options", "IBM") == ["2024-01-02", "2024-01-03"]
+    # the two sessions were fetched once, the empty day and the future day on both runs
+    assert server.count("HISTORICAL_OPTIONS") == 2 + 2 * 2
@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from alphavantage_api import AlphaVantage, RateLimiter, RateLimitError
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(RateLimiter, "_shared", {})
+
+
+def test_clients_of_one_key_share_the_limiter():
+    first = AlphaVantage(api_key="K", tier="premium_600")
+    second = AlphaVantage(api_key="K")
+
+    assert second.rate_limiter is first.rate_limiter
+    assert second.rate_limiter.per_minute == 600
+
+
+def test_conflicting_tier_raises():
+    AlphaVantage(api_key="K")
+
+    with pytest.raises(ValueError):
+        AlphaVantage(api_key="K", tier="premium_600")
+    assert AlphaVantage(api_key="K", tier="free").rate_limiter.per_minute == 5
+
+
+def test_tokens_are_spaced_by_the_interval():
+    limiter = RateLimiter(1200)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+
+    assert time.monotonic() - start >= 4 * limiter.interval * 0.9
+
+
+def test_daily_quota_raises():
+    limiter = RateLimiter(60000, per_day=2, burst=10)
+    limiter.acquire()
+    limiter.acquire()
+
+    with pytest.raises(RateLimitError):
+        limiter.acquire()
+    assert limiter.remaining_today == 0
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from alphavantage_resample import resample_bars
+
+
+def bars(n=10, volume=1000, volume_dtype=np.int64, price_dtype=np.float64):
+    index = pd.DatetimeIndex(pd.date_range("2024-01-01 09:30", periods=n, freq="1min"), name="date")
+    close = np.arange(n, dtype=price_dtype) + 100
+    return pd.DataFrame({
+        "open": close - 0.5, "high": close + 1, "low": close - 1, "close": close,
+        "volume": np.full(n, volume, dtype=volume_dtype),
+    }, index=index)
+
+
+def test_five_minute_bars():
+    df = resample_bars(bars(10), "5min")
+
+    assert list(df.index.strftime("%H:%M")) == ["09:30", "09:35"]
+    assert df["open"].tolist() == [99.5, 104.5]
+    assert df["high"].tolist() == [105.0, 110.0]
+    assert df["low"].tolist() == [99.0, 104.0]
+    assert df["close"].tolist() == [104.0, 109.0]
+    assert df["volume"].tolist() == [5000, 5000]
+
+
+def test_compact_volumes_do_not_wrap():
+    df = resample_bars(bars(10, volume=2**31, volume_dtype=np.uint32, price_dtype=np.float32), "5min")
+
+    assert df["volume"].tolist() == [5 * 2**31, 5 * 2**31]
+    assert df["volume"].dtype == np.uint64
+    assert df["close"].dtype == np.float32
+
+
+def test_compact_volumes_keep_their_dtype_when_they_fit():
+    df = resample_bars(bars(10, volume_dtype=np.uint32), "weekly")
+
+    assert df["volume"].dtype == np.uint32
+    assert df["volume"].tolist() == [10000]
@@ -0,0 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_sequential_calls_reuse_one_connection(server, client):
+    client.time_series_daily("IBM")
+    client.company_overview("IBM")
+    client.listening_delisting_status()
+    client.realtime_bulk_quotes(["IBM", "AAPL"])
+    client.quote_endpoint("IBM")
+    client.time_series_daily_adjusted("AAPL", outputsize="full")
+
+    assert len(server.functions) == 6
+    assert server.connections == 1
+
+
+def test_concurrent_calls_stay_within_the_pool(server, client):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(client.company_overview, [f"S{i}" for i in range(40)]))
+
+    assert server.count("OVERVIEW") == 40
+    assert server.connections <= 4
@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from alphavantage_storage import BarStore, DataLake
+
+
+def bars(n, fields=("open", "close", "volume"), start="2024-01-02"):
+    index = pd.DatetimeIndex(pd.date_range(start, periods=n, freq="D"), name="date").astype("datetime64[ns]")
+    return pd.DataFrame({name: np.arange(n, dtype=np.float64) + i for i, name in enumerate(fields)}, index=index)
+
+
+def test_bar_store_rewrite_maps_one_consistent_version(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.write(bars(10), "time_series_daily", "IBM")
+    first = store.open("time_series_daily", "IBM")
+
+    store.write(bars(25, fields=("close", "volume")), "time_series_daily", "IBM")
+    second = store.open("time_series_daily", "IBM")
+
+    assert isinstance(second.dates, np.memmap) and isinstance(second.values, np.memmap)
+    assert second.dates.dtype == "datetime64[ns]"
+    assert second.values.dtype == np.float64
+    assert second.values.shape == (2, 25)
+    assert second.fields == ["close", "volume"]
+    assert second["volume"][24] == 25.0
+    pd.testing.assert_frame_equal(second.to_frame(), bars(25, fields=("close", "volume")), check_freq=False)
+
+    # the bars mapped before the rewrite still read the previous version
+    assert first.values.shape == (3, 10)
+    assert first["close"][9] == 10.0
+
+    versions = [name for name in os.listdir(tmp_path / "time_series_daily") if name.endswith(".bars")]
+    assert len(versions) == 1
+    assert store.symbols("time_series_daily") == ["IBM"]
+
+
+def test_bar_store_window_is_a_view(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.write(bars(30), "time_series_daily", "IBM")
+
+    window = store.open("time_series_daily", "IBM").window("2024-01-05", "2024-01-09")
+
+    assert len(window) == 5
+    assert window["open"].tolist() == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert not window.values.flags.owndata
+
+
+def test_data_lake_reads_only_the_matching_partitions(tmp_path):
+    pytest.importorskip("pyarrow")
+    lake = DataLake(str(tmp_path / "lake"))
+    lake.write(bars(900, start="2019-01-01"), "time_series_daily", "IBM")
+    lake.write(bars(900, start="2019-01-01"), "time_series_daily", "MSFT")
+    # partitions outside the filters are never scanned, so unreadable files there do not matter (the first file gives the schema)
+    for partition in ("symbol=MSFT/year=2019", "symbol=MSFT/year=2020", "symbol=IBM/year=2021"):
+        with open(os.path.join(lake._directory("time_series_daily"), partition, "part-0.parquet"), "wb") as f:
+            f.write(b"not parquet")
+
+    df = lake.read("time_series_daily", "IBM", start="2020-03-01", end="2020-03-10", columns=["close"])
+
+    assert list(df.columns) == ["date", "symbol", "close"]
+    assert list(df["date"]) == list(pd.date_range("2020-03-01", "2020-03-10"))
+    assert set(df["symbol"]) == {"IBM"}
+    np.testing.assert_array_equal(df["close"], bars(900, start="2019-01-01").loc["2020-03-01":"2020-03-10", "close"])
+
+
+def test_data_lake_rewrite_merges_without_duplicates(tmp_path):
+    pytest.importorskip("pyarrow")
+    lake = DataLake(str(tmp_path / "lake"))
+    lake.write(bars(120, start="2020-12-01"), "time_series_daily", "IBM")
+
+    update = bars(60, start="2021-03-01") + 1000
+    lake.write(update, "time_series_daily", "IBM")
+    df = lake.read("time_series_daily", "IBM").set_index("date")
+
+    assert df.index.is_unique and df.index.is_monotonic_increasing
+    assert df.index[0] == pd.Timestamp("2020-12-01") and df.index[-1] == pd.Timestamp("2021-04-29")
+    np.testing.assert_array_equal(df.loc["2021-03-01":, "close"], update["close"])
+    np.testing.assert_array_equal(df.loc[:"2021-02-28", "close"], bars(120, start="2020-12-01").loc[:"2021-02-28", "close"])
+
+    lake.write(update, "time_series_daily", "IBM", merge=False)
+    df = lake.read("time_series_daily", "IBM").set_index("date")
+    assert df.index[0] == pd.Timestamp("2020-12-01") and df.loc["2021"].index[0] == pd.Timestamp("2021-03-01")
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from test_errors import INVALID, PER_DAY
+from alphavantage_api import AlphaVantageError, RateLimitError
+from alphavantage_storage import PartitionedStore
+from alphavantage_stream import BarRing, LiveBars, QuoteStream
+
+
+def test_first_cycle_emits_every_quote_then_only_changes(server, client):
+    stream = QuoteStream(client, ["IBM", "AAPL"], bulk=True)
+
+    assert {record["symbol"] for record in stream.poll()} == {"IBM", "AAPL"}
+    assert stream.poll() == []
+    assert stream.metrics[-1]["errors"] == {}
+
+
+def test_failed_quotes_are_recorded(server, client):
+    client.memory_cache = None
+    server.routes["GLOBAL_QUOTE"] = lambda query: INVALID if query["symbol"] == "BAD" else {"Global Quote": {"01. symbol": query["symbol"], "05. price": "1.0"}}
+    stream = QuoteStream(client, ["IBM", "BAD"], bulk=False)
+
+    records = stream.poll()
+
+    assert [record["symbol"] for record in records] == ["IBM"]
+    metrics = stream.metrics[-1]
+    assert metrics["missing"] == ["BAD"]
+    assert list(metrics["errors"]) == ["BAD"]
+    assert isinstance(metrics["errors"]["BAD"], AlphaVantageError)
+
+
+def test_daily_limit_stops_the_stream(server, client):
+    client.memory_cache = None
+    server.routes["GLOBAL_QUOTE"] = lambda query: PER_DAY
+    stream = QuoteStream(client, ["IBM"], bulk=False)
+
+    with pytest.raises(RateLimitError):
+        stream.poll()
+
+
+def minute_bars(start, n, close=None):
+    times = pd.date_range(start, periods=n, freq="1min").astype("datetime64[ns]")
+    close = np.arange(n, dtype=np.float64) + 100 if close is None else np.asarray(close, dtype=np.float64)
+    df = pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 10.0}, index=pd.DatetimeIndex(times, name="date"))
+    return df.iloc[::-1]
+
+
+def test_ring_keeps_the_last_bars_contiguous():
+    ring = BarRing(["close"], capacity=4)
+    times = pd.date_range("2024-01-02 09:30", periods=6, freq="1min").values.astype("datetime64[ns]")
+
+    ring.append(times, np.arange(6, dtype=np.float64)[:, None])
+    last_times, values = ring.last()
+
+    assert len(ring) == 4
+    np.testing.assert_array_equal(last_times, times[2:])
+    np.testing.assert_array_equal(values[0], [2, 3, 4, 5])
+    assert np.shares_memory(values, ring.values)
+
+
+def test_merge_overwrites_the_forming_bar_and_appends_the_new_ones():
+    bars = LiveBars(None)
+    assert bars.merge("IBM", minute_bars("2024-01-02 09:30", 5)) == 5
+
+    # the 09:34 bar was still forming: its close moved, and two bars followed
+    update = minute_bars("2024-01-02 09:32", 5, close=[102, 103, 150, 151, 152])
+    assert bars.merge("IBM", update) == 2
+
+    closes = bars.last("IBM", field="close")
+    np.testing.assert_array_equal(closes, [100, 101, 102, 103, 150, 151, 152])
+    assert bars.frame("IBM").index[-1] == pd.Timestamp("2024-01-02 09:36")
+    assert bars.gaps == {}
+
+
+def test_missing_bars_are_counted_as_a_gap():
+    bars = LiveBars(None)
+    bars.merge("IBM", minute_bars("2024-01-02 09:30", 5))
+
+    assert bars.merge("IBM", minute_bars("2024-01-02 10:00", 3)) == 3
+
+    assert bars.gaps == {"IBM": 1}
+    times, _ = bars.last("IBM")
+    assert len(times) == 8 and times[4] == np.datetime64("2024-01-02T09:34") and times[5] == np.datetime64("2024-01-02T10:00")
+
+
+def test_closed_bars_are_persisted_across_a_restart(tmp_path):
+    store = PartitionedStore(str(tmp_path / "partitions"))
+    closed = []
+    LiveBars(None, store=store).merge("IBM", minute_bars("2024-01-02 09:30", 5))
+
+    # a new process: an empty ring, fed an answer overlapping what was persisted
+    restarted = LiveBars(None, store=store, on_close=lambda symbol, df: closed.append(df))
+    restarted.merge("IBM", minute_bars("2024-01-02 09:32", 6, close=[102, 103, 104, 105, 106, 107]))
+
+    stored = store.load("time_series_intraday_1min", "IBM")
+    assert list(stored.index) == list(pd.date_range("2024-01-02 09:30", periods=7, freq="1min"))
+    assert not stored.index.duplicated().any()
+    np.testing.assert_array_equal(stored["close"], [100, 101, 102, 103, 104, 105, 106])
+    # the forming 09:37 bar is neither stored nor handed to on_close
+    assert closed[-1].index[-1] == pd.Timestamp("2024-01-02 09:36")
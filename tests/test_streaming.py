@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from test_errors import INVALID, PER_MINUTE
+from alphavantage_api import AlphaVantageError, iter_json_members
+
+
+DOCUMENT = '{"Meta Data": {"1. Information": "x"}, "data": [1.5e3, 12, -0.25, 7, "a,b]", {"b": [1, 2]}, true, null]}'
+
+
+def chunked(text, size):
+    data = text.encode()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 64])
+def test_members_survive_any_chunk_edge(size):
+    assert list(iter_json_members(chunked(DOCUMENT, size), "data")) == json.loads(DOCUMENT)["data"]
+
+
+def test_numbers_split_at_every_position():
+    document = '{"data": [1234.5e-2, 678]}'
+    for cut in range(len(document)):
+        chunks = [document[:cut].encode(), document[cut:].encode()]
+        assert list(iter_json_members(chunks, "data")) == [12.345, 678]
+
+
+def test_object_members():
+    document = '{"Time Series (Daily)": {"2024-01-02": {"1. open": "1.0"}, "2024-01-01": {"1. open": "2.0"}}}'
+    members = list(iter_json_members(chunked(document, 4), "Time Series (Daily)"))
+    assert members == [("2024-01-02", {"1. open": "1.0"}), ("2024-01-01", {"1. open": "2.0"})]
+
+
+@pytest.mark.parametrize("document", ['{"data": [1, 2', '{"data": [1, {"a": ', '{"data": [1, 2.', '{"data": [1, x]}'])
+def test_truncated_or_malformed_documents_raise(document):
+    with pytest.raises(ValueError):
+        list(iter_json_members(chunked(document, 3), "data"))
+
+
+def test_missing_key_carries_the_head():
+    with pytest.raises(KeyError) as e:
+        list(iter_json_members(chunked(json.dumps(INVALID), 5), "data"))
+    assert json.loads(e.value.args[1]) == INVALID
+
+
+def test_streamed_series_matches_the_decoded_one(server, client):
+    server.chunk_size = 7
+    streamed = client.time_series_daily("IBM", outputsize="full")
+    client.streaming = False
+    decoded = client.time_series_daily("IBM", outputsize="full")
+
+    assert len(streamed) == 1000
+    assert streamed.equals(decoded)
+
+
+def test_streamed_error_answer_is_not_downloaded_again(server, client):
+    server.queue("TIME_SERIES_DAILY", INVALID)
+
+    with pytest.raises(AlphaVantageError):
+        client.time_series_daily("IBM", outputsize="full")
+    assert server.count("TIME_SERIES_DAILY") == 1
+
+
+def test_streamed_throttled_answer_is_retried(server, client):
+    server.queue("TIME_SERIES_DAILY", PER_MINUTE)
+
+    df = client.time_series_daily("IBM", outputsize="full")
+
+    assert len(df) == 1000
+    assert server.count("TIME_SERIES_DAILY") == 2
+
+
+def test_iter_records_classifies_error_answers(server, client):
+    server.queue("HISTORICAL_OPTIONS", PER_MINUTE)
+
+    batches = list(client.iter_historical_options("IBM", batch_size=1))
+    assert [len(batch) for batch in batches] == [1, 1]
+
+    server.queue("HISTORICAL_OPTIONS", INVALID)
+    with pytest.raises(AlphaVantageError):
+        list(client.iter_historical_options("IBM"))
+    assert server.count("HISTORICAL_OPTIONS") == 3
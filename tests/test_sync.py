@@ -0,0 +1,58 @@
+import pandas as pd
+
+from conftest import daily_series, intraday_series
+from alphavantage_api import DAILY_ADJUSTED_FIELDS, OHLCV_FIELDS, time_series_frame
+from alphavantage_storage import PartitionedStore, SeriesStore
+
+
+def older_bars(fields, adjusted=False):
+    series = daily_series(20, adjusted=adjusted, start=pd.Timestamp("1999-11-01").date())
+    return time_series_frame(series, fields).sort_index()
+
+
+def test_full_sync_merges_into_stored_history(server, client, tmp_path):
+    store = SeriesStore(str(tmp_path))
+    full = time_series_frame(daily_series(1000), OHLCV_FIELDS).sort_index()
+    old = older_bars(OHLCV_FIELDS)
+    store.save("time_series_daily", "IBM", pd.concat([old, full.iloc[:500]]))
+
+    df = client.sync_time_series("IBM", store, method="time_series_daily")
+
+    assert server.functions == ["TIME_SERIES_DAILY"]
+    assert len(df) == len(old) + 1000
+    assert df.index.is_monotonic_increasing
+    assert df.index[0] == old.index[0]
+    pd.testing.assert_frame_equal(store.load("time_series_daily", "IBM"), df)
+
+
+def test_full_sync_replaces_a_rewritten_history(server, client, tmp_path):
+    store = SeriesStore(str(tmp_path))
+    full = time_series_frame(daily_series(1000, adjusted=True), DAILY_ADJUSTED_FIELDS).sort_index()
+    stale = full.iloc[:500].copy()
+    stale["adjusted_close"] *= 0.5
+    store.save("time_series_daily_adjusted", "IBM", pd.concat([older_bars(DAILY_ADJUSTED_FIELDS, adjusted=True), stale]))
+
+    df = client.sync_time_series("IBM", store)
+
+    assert len(df) == 1000
+    assert df.index[0] == full.index[0]
+
+
+def test_backfill_refetches_the_current_month(server, client, tmp_path):
+    def answer(query):
+        start = pd.Timestamp(query["month"] + "-02 10:00")
+        return {"Meta Data": {}, "Time Series (5min)": intraday_series([start + pd.Timedelta(minutes=5 * i) for i in range(10)])}
+
+    server.routes["TIME_SERIES_INTRADAY"] = answer
+    store = PartitionedStore(str(tmp_path))
+    current = pd.Timestamp.today().to_period("M")
+    previous = current - 1
+    for month in (previous, current):
+        store.save("time_series_intraday_5min", "IBM", str(month), time_series_frame(intraday_series([month.start_time]), OHLCV_FIELDS).sort_index())
+
+    failures = client.backfill_intraday("IBM", str(previous - 1), str(current), 5, store)
+
+    assert not failures
+    assert server.count("TIME_SERIES_INTRADAY") == 2
+    assert len(store.load("time_series_intraday_5min", "IBM", [str(previous)])) == 1
+    assert len(store.load("time_series_intraday_5min", "IBM", [str(current)])) == 10